@@ -0,0 +1,28 @@
+from fastapi import APIRouter
+from typing import Any, Dict
+from app.services.tool_registry import tool_registry
+from app.services.cache_warmer import cache_warmer
+from app.services.intent_cache import intent_cache
+from app.services.intent_parser import intent_parser
+from app.services.llm_service import llm_service
+from app.services.workflow_executor import workflow_executor
+
+router = APIRouter()
+
+@router.get("/")
+def get_metrics() -> Dict[str, Any]:
+    """
+    Métriques internes (caches, etc.).
+    """
+    client = tool_registry.client_provider.all_sports
+    return {
+        "allsports_cache": client.cache.snapshot() if client.cache is not None else None,
+        "allsports_single_flight": client.single_flight.snapshot(),
+        "allsports_rate_limit": client.rate_limiter.snapshot(),
+        "cache_warmer": cache_warmer.snapshot(),
+        "match_store": client.match_store.snapshot() if client.match_store is not None else None,
+        "intent_cache": intent_cache.snapshot(),
+        "intent_parser": intent_parser.snapshot(),
+        "llm": llm_service.snapshot(),
+        "node_cache": workflow_executor.node_cache.snapshot()
+    }
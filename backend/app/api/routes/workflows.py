@@ -1,28 +1,79 @@
+import json
+from typing import Any, AsyncIterator, Dict, List, Literal
 from fastapi import APIRouter, HTTPException
-from app.models.workflow import Workflow, WorkflowCreate, WorkflowExecute
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from app.core.config import settings
+from app.models.workflow import Workflow, WorkflowBatchCreate, WorkflowCreate, WorkflowExecute
 from app.services.workflow_generator import workflow_generator
 from app.services.workflow_executor import workflow_executor
 
 router = APIRouter()
 
 @router.post("/generate", response_model=Workflow)
-def generate_workflow(request: WorkflowCreate):
+async def generate_workflow(request: WorkflowCreate):
     """
     Génère un workflow basé sur une requête en langage naturel.
     """
     try:
-        workflow = workflow_generator.generate(request.sport, request.query)
+        workflow = await workflow_generator.agenerate(request.sport, request.query)
         return workflow
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/generate/batch", response_model=List[Workflow])
+async def generate_workflows_batch(request: WorkflowBatchCreate):
+    """
+    Génère un workflow pour chaque requête (pré-génération en masse).
+    Les requêtes identiques sont dédupliquées et regroupées dans les appels LLM.
+    """
+    if len(request.requests) > settings.WORKFLOW_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Au plus {settings.WORKFLOW_BATCH_MAX_SIZE} requêtes par lot."
+        )
+    try:
+        return await workflow_generator.agenerate_batch([(r.sport, r.query) for r in request.requests])
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/execute")
 async def execute_workflow(request: WorkflowExecute):
     """
     Exécute un workflow donné.
     """
     try:
-        result = await workflow_executor.execute(request.workflow)
+        result = await workflow_executor.execute(request.workflow, use_cache=not request.no_cache)
         return result
+    except ValueError as e:
+        # Workflow invalide (cycle, arête vers un nœud inconnu)
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+async def _encode_events(events: AsyncIterator[Dict[str, Any]], format: str) -> AsyncIterator[str]:
+    async for event in events:
+        payload = json.dumps(jsonable_encoder(event), ensure_ascii=False)
+        if format == "sse":
+            yield f"event: {event['event']}\ndata: {payload}\n\n"
+        else:
+            yield payload + "\n"
+
+@router.post("/execute/stream")
+async def execute_workflow_stream(request: WorkflowExecute, format: Literal["ndjson", "sse"] = "ndjson"):
+    """
+    Exécute un workflow en streamant le résultat de chaque nœud dès qu'il est disponible
+    (NDJSON par défaut, ou Server-Sent Events avec `?format=sse`).
+    """
+    try:
+        events = workflow_executor.execute_stream(request.workflow, use_cache=not request.no_cache)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(
+        _encode_events(events, format),
+        media_type=media_type,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
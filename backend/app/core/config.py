@@ -1,5 +1,9 @@
+from pathlib import Path
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# Racine du backend: les chemins relatifs des fichiers de cache en dépendent (pas du répertoire courant)
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Sports Workflow API"
     API_V1_STR: str = "/api/v1"
@@ -11,6 +15,106 @@ class Settings(BaseSettings):
     ALL_SPORTS_API_KEY: str
     GROQ_API_KEY: str
 
+    # Client HTTP AllSportsAPI (pool de connexions partagé)
+    ALL_SPORTS_BASE_URL: str = "https://apiv2.allsportsapi.com/football/"
+    ALL_SPORTS_TIMEOUT: float = 10.0
+    ALL_SPORTS_MAX_CONNECTIONS: int = 100
+    ALL_SPORTS_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    ALL_SPORTS_KEEPALIVE_EXPIRY: float = 30.0
+    ALL_SPORTS_HTTP2: bool = True  # Utilisé seulement si le paquet `h2` est installé
+
+    # Limitation de débit AllSportsAPI (seau à jetons partagé)
+    ALL_SPORTS_RATE_LIMIT: float = 10.0  # Jetons par seconde (0: pas de limite de débit)
+    ALL_SPORTS_RATE_BURST: float = 20.0
+    ALL_SPORTS_DAILY_QUOTA: int = 0  # 0: pas de quota journalier
+    ALL_SPORTS_MET_COSTS: dict[str, float] = {"Fixtures": 2.0}  # Coût par endpoint (1 par défaut)
+    # Part du seau réservée aux classes plus prioritaires, et attente maximale par classe (secondes)
+    ALL_SPORTS_PRIORITY_RESERVES: dict[str, float] = {"interactive": 0.0, "prefetch": 0.25, "backfill": 0.5}
+    ALL_SPORTS_PRIORITY_DEADLINES: dict[str, float] = {"interactive": 5.0, "prefetch": 30.0, "backfill": 300.0}
+
+    # Catalogue des ligues (résolution nom -> league_key)
+    LEAGUE_CATALOG_TTL: float = 6 * 3600
+    LEAGUE_CATALOG_RETRY_DELAY: float = 60.0
+
+    # Cache de résolution des équipes (nom -> team_key)
+    TEAM_CACHE_MAX_SIZE: int = 2048
+    TEAM_CACHE_TTL: float = 24 * 3600
+    TEAM_CACHE_NEGATIVE_TTL: float = 600.0
+    TEAM_ALIASES: dict[str, str] = {}  # ex: {"les verts": "Saint-Etienne"}
+
+    # Cache des réponses AllSportsAPI (TTL en secondes par endpoint `met`)
+    RESPONSE_CACHE_BACKEND: str = "memory"  # "memory", "disk" ou "none"
+    RESPONSE_CACHE_PATH: str = ".cache/allsports_responses.sqlite3"
+    RESPONSE_CACHE_MAX_SIZE: int = 4096
+    RESPONSE_CACHE_DEFAULT_TTL: float = 300.0
+    RESPONSE_CACHE_TTLS: dict[str, float] = {
+        "Leagues": 6 * 3600,
+        "Teams": 12 * 3600,
+        "Standings": 300,
+        "Topscorers": 600,
+        "Fixtures": 120,
+        "H2H": 3600,
+        "Videos": 6 * 3600,
+        "Odds": 60,
+    }
+    # Périodes de matchs terminées, sans stockage local (avec, elles ne sont pas mises en cache)
+    FINISHED_FIXTURES_TTL: float = 30 * 24 * 3600
+    # Après le TTL, la réponse périmée est encore servie pendant cette durée et rafraîchie en arrière-plan
+    RESPONSE_CACHE_STALE_WINDOW: float = 3600.0
+
+    # Préchauffage périodique du cache (ligues et équipes populaires, noms ou identifiants)
+    CACHE_WARM_LEAGUES: list[str] = []  # ex: ["Premier League", "Ligue 1"]
+    CACHE_WARM_TEAMS: list[str] = []  # ex: ["PSG", "Real Madrid"]
+    CACHE_WARM_INTERVAL: float = 240.0  # Inférieur au TTL de Standings pour ne jamais expirer
+
+    # Stockage local des matchs terminés ("" pour désactiver)
+    MATCH_STORE_PATH: str = ".cache/matches.sqlite3"
+    # Jours (UTC) pendant lesquels un résultat peut encore être corrigé par l'API: jamais considérés définitifs
+    MATCH_STORE_STABLE_MARGIN_DAYS: int = 2
+    # Les jours plus récents que ce seuil ne sont couverts que provisoirement, puis revérifiés après le délai
+    MATCH_STORE_RECHECK_DAYS: int = 7
+    MATCH_STORE_RECHECK_TTL: float = 24 * 3600
+
+    # Téléchargement des longues périodes de matchs par tranches parallèles
+    FIXTURES_CHUNK_DAYS: int = 31
+    FIXTURES_STATS_CHUNK_DAYS: int = 7  # Réponses bien plus lourdes avec withPlayerStats
+    FIXTURES_FETCH_CONCURRENCY: int = 4
+
+    # Exécution des workflows
+    WORKFLOW_MAX_CONCURRENCY: int = 8  # Nœuds exécutés simultanément par workflow
+    TOOL_THREAD_POOL_SIZE: int = 16  # Threads partagés par les outils synchrones
+    NODE_CACHE_MAX_SIZE: int = 1024  # Résultats de nœuds mémorisés (TTL déclaré par chaque outil)
+
+    # Cache des intentions (requête normalisée -> analyse LLM)
+    INTENT_CACHE_MAX_SIZE: int = 4096
+    INTENT_CACHE_TTL: float = 7 * 24 * 3600
+    INTENT_CACHE_PATH: str = ""  # ex: ".cache/intents.sqlite3" pour persister sur disque
+
+    # Analyse locale des requêtes: en dessous de ce score, on interroge le LLM
+    INTENT_PARSER_MIN_CONFIDENCE: float = 0.75
+
+    # Client LLM (API compatible OpenAI)
+    LLM_BASE_URL: str = "https://api.groq.com/openai/v1"
+    LLM_MODEL: str = "llama-3.3-70b-versatile"
+    LLM_TIMEOUT: float = 15.0  # Délai maximal par appel (secondes)
+    LLM_MAX_RETRIES: int = 2  # Nouvelles tentatives sur 429/5xx/délai dépassé
+    LLM_RETRY_BASE_DELAY: float = 0.5
+    LLM_MAX_CONCURRENCY: int = 8  # Appels LLM simultanés pour tout le processus
+    LLM_MAX_CONNECTIONS: int = 20
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 5
+    LLM_BREAKER_RESET_TIMEOUT: float = 30.0
+
+    # Génération en lot: requêtes par appel LLM et appels simultanés
+    LLM_BATCH_SIZE: int = 10
+    LLM_BATCH_CONCURRENCY: int = 4
+    WORKFLOW_BATCH_MAX_SIZE: int = 500
+
     model_config = SettingsConfigDict(env_file=".env")
 
+    def data_path(self, path: str) -> str:
+        """Chemin d'un fichier de cache: relatif au dossier backend, quel que soit le répertoire de lancement."""
+        if path == ":memory:" or Path(path).is_absolute():
+            return path
+        return str(BACKEND_DIR / path)
+
 settings = Settings()
@@ -1,14 +1,34 @@
 from dotenv import load_dotenv
 load_dotenv()
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from app.core.config import settings
 from app.core.cors import setup_cors
-from app.api.routes import workflows, tools
+from app.api.routes import workflows, tools, metrics
+from app.services.tool_registry import tool_registry
+from app.services.workflow_executor import workflow_executor
+from app.services.llm_service import llm_service
+from app.services.cache_warmer import cache_warmer
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Clients partagés par les outils: ouverts au démarrage, fermés à l'arrêt
+    client_provider = tool_registry.client_provider
+    await client_provider.startup()
+    await llm_service.startup()
+    # Préchauffage périodique des ligues/équipes populaires (si configurées)
+    cache_warmer.start()
+    yield
+    await cache_warmer.stop()
+    workflow_executor.shutdown()
+    await llm_service.aclose()
+    await client_provider.shutdown()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
 # Setup CORS
@@ -17,6 +37,7 @@ setup_cors(app)
 # Include Routers
 app.include_router(workflows.router, prefix="/workflows", tags=["Workflows"])
 app.include_router(tools.router, prefix="/tools", tags=["Tools"])
+app.include_router(metrics.router, prefix="/metrics", tags=["Metrics"])
 
 @app.get("/health")
 def health_check():
@@ -1,11 +1,18 @@
+from dataclasses import dataclass
 from datetime import date
 from typing import Optional
-from pydantic import BaseModel
 
-class MatchInfo(BaseModel):
+@dataclass(slots=True)
+class MatchRecord:
+    """
+    Forme compacte d'un match normalisé, utilisée par les outils: pas de
+    dictionnaire par match, et les chaînes répétées (sport, ligue, équipes,
+    statut) sont internées à la création.
+    Convertie en JSON seulement à la réponse HTTP (jsonable_encoder gère les dataclasses).
+    """
     match_id: str
     sport: str
-    league: Optional[str] = None
+    league: Optional[str]
     home_team: str
     away_team: str
     home_score: int
@@ -1,8 +1,9 @@
 from pydantic import BaseModel
-from typing import List
+from typing import Dict, List
 
 class ToolInfo(BaseModel):
     id: str
     name: str
     description: str
     supported_sports: List[str]
+    parameters: Dict[str, str] = {}
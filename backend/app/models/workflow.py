@@ -18,6 +18,8 @@ class WorkflowEdge(BaseModel):
     id: str
     source: str
     target: str
+    # Champs transmis (sortie de source -> entrée de target); None: toute la sortie
+    mapping: Optional[Dict[str, str]] = None
 
 class Workflow(BaseModel):
     id: str
@@ -30,5 +32,9 @@ class WorkflowCreate(BaseModel):
     sport: str
     query: str
 
+class WorkflowBatchCreate(BaseModel):
+    requests: List[WorkflowCreate]
+
 class WorkflowExecute(BaseModel):
     workflow: Workflow
+    no_cache: bool = False  # Recalcule tous les nœuds sans réutiliser les résultats mémorisés
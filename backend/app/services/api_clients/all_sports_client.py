@@ -1,81 +1,525 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Set, Tuple
+import asyncio
+import importlib.util
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
 import httpx
 from datetime import date, timedelta
 from app.core.config import settings
+from app.services.api_clients.json_stream import JSONArrayStream
+from app.services.api_clients.response_cache import ResponseCache, create_response_cache
+from app.services.league_catalog import LeagueCatalog
+from app.services.match_store import MatchStore, create_match_store
+from app.services.node_cache import record_upstream_failure
+from app.services.rate_limiter import Priority, RateLimiter, current_priority, upstream_priority
+from app.services.single_flight import SingleFlight
+from app.services.team_resolver import TeamResolver
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+# Stockage local pas encore ouvert
+_UNSET: Any = object()
+
+# Préchauffage: les réponses en cache sont ignorées et remplacées par un appel upstream
+_force_refresh: ContextVar[bool] = ContextVar("allsports_force_refresh", default=False)
+
+
+@contextmanager
+def force_refresh() -> Iterator[None]:
+    token = _force_refresh.set(True)
+    try:
+        yield
+    finally:
+        _force_refresh.reset(token)
+
 
 class AllSportsClient:
-    def __init__(self):
-        self.api_key = settings.ALL_SPORTS_API_KEY
-        self.base_url = "https://apiv2.allsportsapi.com/football/" 
+    """
+    Client AllSportsAPI.
 
-    def _get_team_id(self, team_name: str) -> Optional[str]:
-        """Récupère l'ID d'une équipe par son nom."""
-        params = {
-            "met": "Teams",
-            "teamName": team_name,
-            "APIkey": self.api_key
+    Les méthodes synchrones (`get_*`) et asynchrones (`aget_*`) partagent la même
+    configuration. Chaque famille s'appuie sur un unique pool de connexions
+    keep-alive (`httpx.Client` / `httpx.AsyncClient`) au lieu d'ouvrir une
+    connexion TCP+TLS par appel.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        http_client: Optional[httpx.Client] = None,
+        async_http_client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[ResponseCache] = None,
+        use_cache: bool = True,
+        match_store: Optional[MatchStore] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        self.api_key = api_key or settings.ALL_SPORTS_API_KEY
+        self.base_url = base_url or settings.ALL_SPORTS_BASE_URL
+        self._http_client = http_client
+        self._async_http_client = async_http_client
+        self._owns_async_client = async_http_client is None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.cache = cache if cache is not None or not use_cache else create_response_cache()
+        # Ouvert à la première utilisation: le client partagé est construit à l'import du module
+        self._match_store: Optional[MatchStore] = match_store if match_store is not None or not use_cache else _UNSET
+        self._match_store_lock = threading.Lock()
+        self.single_flight = SingleFlight()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self._revalidation_lock = threading.Lock()
+        self._revalidating: Set[str] = set()
+        self._background_tasks: Set[asyncio.Task] = set()
+        self.league_catalog = LeagueCatalog(self)
+        self.team_resolver = TeamResolver(self)
+
+    @property
+    def match_store(self) -> Optional[MatchStore]:
+        """Stockage local des matchs terminés (None si désactivé)."""
+        if self._match_store is _UNSET:
+            with self._match_store_lock:
+                if self._match_store is _UNSET:
+                    self._match_store = create_match_store()
+        return self._match_store
+
+    # --- Cycle de vie des pools HTTP ---
+
+    def _client_options(self) -> Dict[str, Any]:
+        return {
+            "timeout": settings.ALL_SPORTS_TIMEOUT,
+            "limits": httpx.Limits(
+                max_connections=settings.ALL_SPORTS_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.ALL_SPORTS_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.ALL_SPORTS_KEEPALIVE_EXPIRY,
+            ),
         }
-        try:
-            response = httpx.get(self.base_url, params=params, timeout=10.0)
-            response.raise_for_status()
-            data = response.json()
-            
-            if data.get("success") == 1 and data.get("result"):
-                # On prend le premier résultat
-                team_key = data["result"][0]["team_key"]
-                print(f"DEBUG: Found team_id for '{team_name}': {team_key}")
-                return team_key
-            print(f"DEBUG: No team found for '{team_name}'. Data: {data}")
+
+    @property
+    def http(self) -> httpx.Client:
+        """Pool synchrone, créé à la première utilisation."""
+        if self._http_client is None:
+            self._http_client = httpx.Client(**self._client_options())
+        return self._http_client
+
+    def _ahttp(self) -> httpx.AsyncClient:
+        """Pool asynchrone lié à la boucle d'événements courante."""
+        loop = asyncio.get_running_loop()
+        if self._async_http_client is not None and self._owns_async_client and self._async_loop not in (None, loop):
+            # Un AsyncClient ne peut pas être réutilisé d'une boucle à l'autre, et le
+            # remplacer sans le fermer laisserait ses connexions ouvertes
+            raise RuntimeError(
+                "Pool AllSportsAPI lié à une autre boucle d'événements: "
+                "appeler arelease() avant la fin de celle-ci (ex: ponts synchrones asyncio.run)"
+            )
+        if self._async_http_client is None:
+            self._owns_async_client = True
+            self._async_http_client = httpx.AsyncClient(
+                http2=settings.ALL_SPORTS_HTTP2 and _http2_available(),
+                **self._client_options()
+            )
+        self._async_loop = loop
+        return self._async_http_client
+
+    async def startup(self):
+        """Ouvre le pool asynchrone et le stockage local, et charge le catalogue des ligues au démarrage de l'application."""
+        self._ahttp()
+        await asyncio.to_thread(lambda: self.match_store)
+        # Non bloquant: l'analyse locale des requêtes reconnaît les ligues dès que le catalogue arrive
+        task = self.league_catalog.preload()
+        if task is not None:
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+
+    async def _cancel_background_tasks(self):
+        for task in list(self._background_tasks):
+            task.cancel()
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        await self.league_catalog.aclose()
+
+    async def aclose(self):
+        """Ferme les pools à l'arrêt de l'application."""
+        await self._cancel_background_tasks()
+        if self._async_http_client is not None:
+            await self._async_http_client.aclose()
+            self._async_http_client = None
+            self._async_loop = None
+        self.close()
+
+    async def arelease(self):
+        """
+        Ferme le pool asynchrone et les tâches de fond liés à la boucle courante,
+        avant qu'elle ne se termine (ponts synchrones asyncio.run). Le pool sera
+        recréé à la prochaine utilisation, dans la boucle suivante.
+        """
+        if self._async_loop is not asyncio.get_running_loop():
+            return
+        await self._cancel_background_tasks()
+        if self._owns_async_client and self._async_http_client is not None:
+            await self._async_http_client.aclose()
+            self._async_http_client = None
+        self._async_loop = None
+
+    def close(self):
+        if self._http_client is not None:
+            self._http_client.close()
+            self._http_client = None
+
+    # --- Transport ---
+
+    def _params(self, met: str, **extra: Any) -> Dict[str, Any]:
+        params = {"met": met, "APIkey": self.api_key}
+        params.update(extra)
+        return params
+
+    def _check_status(self, response: httpx.Response):
+        if response.status_code == 429:
+            self.rate_limiter.drain()
+        if response.status_code == 401:
+            raise ValueError("Clé API invalide ou manquante.")
+        response.raise_for_status()
+
+    def _decode(self, response: httpx.Response) -> Dict[str, Any]:
+        self._check_status(response)
+        return response.json()
+
+    def _cached(self, params: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """(réponse en cache, périmée); ignoré pendant un préchauffage (`force_refresh`)."""
+        if self.cache is None or _force_refresh.get():
+            return None, False
+        return self.cache.lookup(params)
+
+    def _archived(self, params: Dict[str, Any]) -> bool:
+        """Période de matchs entièrement définitive: le stockage local la conserve déjà."""
+        return (
+            self.match_store is not None
+            and params.get("met") == "Fixtures"
+            and params.get("to", "") <= self.match_store.stable_until().isoformat()
+        )
+
+    def _store(self, params: Dict[str, Any], data: Dict[str, Any]) -> Dict[str, Any]:
+        # Seules les réponses valides sont mises en cache, sans doubler le stockage local
+        if self.cache is not None and data.get("success") == 1 and not self._archived(params):
+            self.cache.set(params, data)
+        return data
+
+    def _fetch(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        # Seuls les appels réellement envoyés (hors cache et single-flight) consomment le quota
+        self.rate_limiter.acquire(params["met"])
+        return self._store(params, self._decode(self.http.get(self.base_url, params=params)))
+
+    async def _afetch(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        await self.rate_limiter.aacquire(params["met"])
+        return self._store(params, self._decode(await self._ahttp().get(self.base_url, params=params)))
+
+    @staticmethod
+    def _streamed_finished(stream: JSONArrayStream, finished: List[Dict[str, Any]], scanned: int) -> Dict[str, Any]:
+        # Horodatage du téléchargement: la couverture locale s'arrête aux jours définitifs à cet instant
+        data = {**stream.close(), "result": finished, "fetched_at": time.time()}
+        print(f"DEBUG: Streamed {scanned} fixtures, kept {len(finished)} finished.")
+        return data
+
+    def _fetch_finished(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Variante de `_fetch` pour Fixtures: le tableau `result` est analysé en flux
+        et seuls les matchs terminés sont conservés (et mis en cache). Les matchs
+        à venir et leurs statistiques ne sont jamais matérialisés en entier.
+        """
+        stream = JSONArrayStream("result")
+        finished: List[Dict[str, Any]] = []
+        scanned = 0
+        self.rate_limiter.acquire(params["met"])
+        with self.http.stream("GET", self.base_url, params=params) as response:
+            if response.is_error:
+                response.read()
+            self._check_status(response)
+            for text in response.iter_text():
+                for match in stream.feed(text):
+                    scanned += 1
+                    if self._is_finished(match):
+                        finished.append(match)
+        return self._store(params, self._streamed_finished(stream, finished, scanned))
+
+    async def _afetch_finished(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        stream = JSONArrayStream("result")
+        finished: List[Dict[str, Any]] = []
+        scanned = 0
+        await self.rate_limiter.aacquire(params["met"])
+        async with self._ahttp().stream("GET", self.base_url, params=params) as response:
+            if response.is_error:
+                await response.aread()
+            self._check_status(response)
+            async for text in response.aiter_text():
+                for match in stream.feed(text):
+                    scanned += 1
+                    if self._is_finished(match):
+                        finished.append(match)
+        return self._store(params, self._streamed_finished(stream, finished, scanned))
+
+    def _claim_revalidation(self, key: str) -> bool:
+        with self._revalidation_lock:
+            if key in self._revalidating:
+                return False
+            self._revalidating.add(key)
+            return True
+
+    def _release_revalidation(self, key: str):
+        with self._revalidation_lock:
+            self._revalidating.discard(key)
+
+    def _revalidate(self, key: str, fn: Callable[[], Dict[str, Any]]):
+        """Rafraîchit une réponse périmée dans un thread, sans faire attendre l'appelant."""
+        if not self._claim_revalidation(key):
+            return
+
+        def run():
+            try:
+                with upstream_priority(Priority.PREFETCH):
+                    self.single_flight.do(key, fn)
+            except Exception as e:
+                print(f"DEBUG: Background revalidation failed: {e}")
+            finally:
+                self._release_revalidation(key)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def _arevalidate(self, key: str, fn: Callable[[], Awaitable[Dict[str, Any]]]):
+        if not self._claim_revalidation(key):
+            return
+
+        async def run():
+            try:
+                with upstream_priority(Priority.PREFETCH):
+                    await self.single_flight.ado(key, fn)
+            except Exception as e:
+                print(f"DEBUG: Background revalidation failed: {e}")
+            finally:
+                self._release_revalidation(key)
+
+        task = asyncio.create_task(run())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    def _get(self, params: Dict[str, Any], fetch: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None, allow_stale: bool = True) -> Dict[str, Any]:
+        fetch = fetch or self._fetch
+        key = ResponseCache.key(params)
+        cached, stale = self._cached(params)
+        if cached is not None and (allow_stale or not stale):
+            # Stale-while-revalidate: la réponse périmée est servie immédiatement
+            if stale:
+                self._revalidate(key, lambda: fetch(params))
+            return cached
+        # Les requêtes identiques simultanées partagent un seul appel upstream
+        return self.single_flight.do(key, lambda: fetch(params))
+
+    async def _aget(self, params: Dict[str, Any], fetch: Optional[Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]] = None, allow_stale: bool = True) -> Dict[str, Any]:
+        fetch = fetch or self._afetch
+        key = ResponseCache.key(params)
+        cached, stale = self._cached(params)
+        if cached is not None and (allow_stale or not stale):
+            if stale:
+                self._arevalidate(key, lambda: fetch(params))
+            return cached
+        return await self.single_flight.ado(key, lambda: fetch(params))
+
+    @staticmethod
+    def _result(data: Dict[str, Any], default: Any) -> Any:
+        if data.get("success") == 1:
+            return data.get("result", default)
+        return default
+
+    # --- Helpers partagés sync / async ---
+
+    @staticmethod
+    def _team_key(data: Dict[str, Any], team_name: str) -> Optional[str]:
+        if data.get("success") == 1 and data.get("result"):
+            # On prend le premier résultat
+            team_key = data["result"][0]["team_key"]
+            print(f"DEBUG: Found team_id for '{team_name}': {team_key}")
+            return team_key
+        print(f"DEBUG: No team found for '{team_name}'. Data: {data}")
+        return None
+
+    @staticmethod
+    def _fixtures_range(date_from: Optional[date], date_to: Optional[date]) -> Tuple[date, date]:
+        # Defaults for dates if not provided
+        if not date_from:
+            date_from = date.today() - timedelta(days=30)
+        if not date_to:
+            date_to = date.today()
+        return date_from, date_to
+
+    def _fixtures_params(self, team_id: Optional[str], date_from: date, date_to: date, league_id: Optional[str], with_player_stats: bool) -> Dict[str, Any]:
+        params = self._params("Fixtures", **{"from": date_from.isoformat(), "to": date_to.isoformat()})
+        if team_id:
+            params["teamId"] = team_id
+        if league_id:
+            params["leagueId"] = league_id
+        if with_player_stats:
+            params["withPlayerStats"] = 1
+        return params
+
+    @staticmethod
+    def _is_finished(match: Any) -> bool:
+        return isinstance(match, dict) and match.get("event_status") == "Finished"
+
+    @classmethod
+    def _finished(cls, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        if data.get("success") == 1:
+            matches = data.get("result", [])
+            finished_matches = [m for m in matches if cls._is_finished(m)]
+            print(f"DEBUG: Found {len(matches)} matches, {len(finished_matches)} finished.")
+            return finished_matches
+
+        print(f"DEBUG: API returned success!=1 or no result. Data: {data}")
+        return []
+
+    def _fixtures_ranges(self, team_id: Optional[str], league_id: Optional[str], date_from: date, date_to: date, with_player_stats: bool) -> List[Tuple[date, date]]:
+        """
+        Périodes à demander à l'API: les trous de la couverture locale pour les
+        jours révolus, plus les jours non encore définitifs (aujourd'hui et après).
+        Sans stockage local, toute la période.
+        """
+        if self.match_store is None:
+            return [(date_from, date_to)]
+        stable = self.match_store.stable_until()
+        ranges = self.match_store.missing(team_id, league_id, date_from, min(date_to, stable), with_player_stats)
+        if date_to > stable:
+            if ranges and ranges[-1][1] == stable:
+                # Trou contigu aux jours non définitifs: une seule requête
+                ranges[-1] = (ranges[-1][0], date_to)
+            else:
+                ranges.append((max(date_from, stable + timedelta(days=1)), date_to))
+        print(f"DEBUG: Fixtures {date_from} -> {date_to}: {len(ranges)} range(s) to fetch: {ranges}")
+        return ranges
+
+    @staticmethod
+    def _chunk_ranges(ranges: List[Tuple[date, date]], with_player_stats: bool) -> List[Tuple[date, date]]:
+        """Découpe les longues périodes (ex: une saison) en tranches: réponses plus petites, sans dépassement de délai."""
+        size = settings.FIXTURES_STATS_CHUNK_DAYS if with_player_stats else settings.FIXTURES_CHUNK_DAYS
+        chunks = []
+        for start, end in ranges:
+            while start <= end:
+                chunk_end = min(end, start + timedelta(days=size - 1))
+                chunks.append((start, chunk_end))
+                start = chunk_end + timedelta(days=1)
+        return chunks
+
+    @staticmethod
+    def _chunk_priority(chunks: List[Tuple[date, date]], end: date) -> Priority:
+        """
+        Priorité d'une tranche: les tranches d'archive d'une longue période (ex: une
+        saison) passent en BACKFILL et ne consomment que le débit laissé libre; la
+        tranche des jours récents garde la priorité de l'appelant.
+        """
+        if len(chunks) > 1 and end <= MatchStore.stable_until():
+            return max(current_priority.get(), Priority.BACKFILL)
+        return current_priority.get()
+
+    def _absorb_fixtures(self, team_id: Optional[str], league_id: Optional[str], start: date, end: date, with_player_stats: bool, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Archive une tranche téléchargée dès sa réception (la réponse brute peut
+        ensuite être libérée) et retourne les matchs à servir hors stockage local:
+        jours non définitifs, ou tous les matchs terminés sans stockage.
+        """
+        if self.match_store is None:
+            return self._finished(data)
+        if data.get("success") != 1:
+            print(f"DEBUG: API returned success!=1 for {start} -> {end}. Data: {data}")
+            return []
+        self.match_store.add(data.get("result") or [], with_player_stats)
+        fetched_at = data.get("fetched_at")
+        if fetched_at is not None:
+            self.match_store.record_coverage(team_id, league_id, start, end, with_player_stats, fetched_at)
+        else:
+            # Réponse en cache sans horodatage: rien ne garantit que la période était définitive
+            print(f"DEBUG: Fixtures {start} -> {end} without fetched_at, coverage not recorded.")
+        stable = self.match_store.stable_until()
+        if end <= stable:
+            return []
+        return [m for m in self._finished(data) if m.get("event_date", "") > stable.isoformat()]
+
+    def _assemble_fixtures(self, team_id: Optional[str], league_id: Optional[str], date_from: date, date_to: date, direct: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Résultat final: matchs du stockage local puis matchs servis directement, dans l'ordre des tranches."""
+        stored: List[Dict[str, Any]] = []
+        if self.match_store is not None:
+            stable = self.match_store.stable_until()
+            if date_from <= stable:
+                stored = self.match_store.matches(team_id, league_id, date_from, min(date_to, stable))
+        return stored + [m for matches in direct for m in matches]
+
+    async def _astore_call(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Accès au stockage local (SQLite + (dé)sérialisation JSON) hors de la boucle d'événements."""
+        if self.match_store is None:
+            return fn(*args)
+        return await asyncio.to_thread(fn, *args)
+
+    @staticmethod
+    def _fixtures_error(e: Exception) -> RuntimeError:
+        if isinstance(e, httpx.RequestError):
+            return RuntimeError(f"API indisponible: {str(e)}")
+        if isinstance(e, httpx.HTTPStatusError):
+            return RuntimeError(f"Erreur HTTP {e.response.status_code}: {e.response.text}")
+        return RuntimeError(f"Erreur inattendue: {str(e)}")
+
+    @staticmethod
+    def _league_key(league_name: str, league: Optional[Dict[str, Any]]) -> Optional[str]:
+        if not league:
+            print(f"DEBUG: Could not resolve league '{league_name}'")
             return None
+        league_id = league.get("league_key")
+        print(f"DEBUG: Resolved league '{league_name}' to {league_id} ({league.get('league_name')})")
+        return league_id
+
+    # --- API synchrone ---
+
+    def resolve_league(self, league_name: str) -> Optional[str]:
+        """Résout un nom de ligue en league_key via le catalogue indexé."""
+        return self._league_key(league_name, self.league_catalog.resolve(league_name))
+
+    def _fetch_team_id(self, team_name: str) -> Optional[str]:
+        return self._team_key(self._get(self._params("Teams", teamName=team_name)), team_name)
+
+    def _get_team_id(self, team_name: str) -> Optional[str]:
+        """Récupère l'ID d'une équipe par son nom (via le cache de résolution)."""
+        try:
+            return self.team_resolver.resolve(team_name)
         except Exception as e:
             print(f"DEBUG: Exception in _get_team_id: {e}")
+            record_upstream_failure(e)
             return None
 
     def get_leagues(self, country_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """Récupère les ligues supportées."""
-        params = {
-            "met": "Leagues",
-            "APIkey": self.api_key
-        }
+        params = self._params("Leagues")
         if country_id:
             params["countryId"] = country_id
-            
         try:
-             response = httpx.get(self.base_url, params=params, timeout=10.0)
-             response.raise_for_status()
-             data = response.json()
-             if data.get("success") == 1:
-                 return data.get("result", [])
-             return []
+            return self._result(self._get(params), [])
         except Exception as e:
             print(f"DEBUG: Error fetching leagues: {e}")
+            record_upstream_failure(e)
             return []
 
     def get_h2h(self, first_team_id: str, second_team_id: str) -> Dict[str, Any]:
         """Récupère les données H2H entre deux équipes."""
-        params = {
-            "met": "H2H",
-            "APIkey": self.api_key,
-            "firstTeamId": first_team_id,
-            "secondTeamId": second_team_id
-        }
+        params = self._params("H2H", firstTeamId=first_team_id, secondTeamId=second_team_id)
         try:
             print(f"DEBUG: Calling H2H API with params: {params}")
-            response = httpx.get(self.base_url, params=params, timeout=10.0)
-            response.raise_for_status()
-            data = response.json()
-            
-            if data.get("success") == 1:
-                return data.get("result", {})
-            return {}
+            return self._result(self._get(params), {})
         except Exception as e:
             print(f"DEBUG: Error in H2H: {e}")
+            record_upstream_failure(e)
             return {}
 
     def get_finished_matches(self, sport: str, team_name: Optional[str] = None, team_id: Optional[str] = None, date_from: Optional[date] = None, date_to: Optional[date] = None, league_id: Optional[str] = None, with_player_stats: bool = False) -> List[Dict[str, Any]]:
         # Note: 'sport' argument is currently ignored as we hardcode /football in base_url.
-        
-        # 1. Resolve Team ID if only name is provided
+
+        # Resolve Team ID if only name is provided
         if team_name and not team_id:
             team_id = self._get_team_id(team_name)
             if not team_id and not league_id:
@@ -83,139 +527,185 @@ class AllSportsClient:
                 print(f"DEBUG: Could not resolve team_id for '{team_name}'")
                 return []
 
-        # 2. Defaults for dates if not provided
-        if not date_from:
-            date_from = date.today() - timedelta(days=30)
-        if not date_to:
-            date_to = date.today()
-
-        params = {
-            "met": "Fixtures",
-            "APIkey": self.api_key,
-            "from": date_from.isoformat(),
-            "to": date_to.isoformat()
-        }
-
-        if team_id:
-            params["teamId"] = team_id
-        if league_id:
-            params["leagueId"] = league_id
-        if with_player_stats:
-             params["withPlayerStats"] = 1
-
-        try:
-            print(f"DEBUG: Calling API {self.base_url} with params: {params}")
-            response = httpx.get(self.base_url, params=params, timeout=10.0)
-            
-            if response.status_code == 401:
-                raise ValueError("Clé API invalide ou manquante.")
-            
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            if data.get("success") == 1:
-                matches = data.get("result", [])
-                finished_matches = [m for m in matches if m.get("event_status") == "Finished"]
-                print(f"DEBUG: Found {len(matches)} matches, {len(finished_matches)} finished.")
-                return finished_matches
-            
-            print(f"DEBUG: API returned success!=1 or no result. Data: {data}")
-            return []
-
-        except httpx.RequestError as e:
-            raise RuntimeError(f"API indisponible: {str(e)}")
-        except httpx.HTTPStatusError as e:
-             raise RuntimeError(f"Erreur HTTP {e.response.status_code}: {e.response.text}")
+        date_from, date_to = self._fixtures_range(date_from, date_to)
+        ranges = self._fixtures_ranges(team_id, league_id, date_from, date_to, with_player_stats)
+        direct = []
+        chunks = self._chunk_ranges(ranges, with_player_stats)
+        try:
+            for start, end in chunks:
+                params = self._fixtures_params(team_id, start, end, league_id, with_player_stats)
+                print(f"DEBUG: Calling API {self.base_url} with params: {params}")
+                with upstream_priority(self._chunk_priority(chunks, end)):
+                    data = self._get(params, self._fetch_finished, allow_stale=self.match_store is None)
+                direct.append(self._absorb_fixtures(team_id, league_id, start, end, with_player_stats, data))
         except Exception as e:
-            raise RuntimeError(f"Erreur inattendue: {str(e)}")
+            raise self._fixtures_error(e)
+        return self._assemble_fixtures(team_id, league_id, date_from, date_to, direct)
 
     def get_standings(self, league_id: str) -> Dict[str, Any]:
         """Récupère le classement d'une ligue."""
-        params = {
-            "met": "Standings",
-            "APIkey": self.api_key,
-            "leagueId": league_id
-        }
         try:
-            response = httpx.get(self.base_url, params=params, timeout=10.0)
-            response.raise_for_status()
-            data = response.json()
-            if data.get("success") == 1:
-                return data.get("result", {})
-            return {}
+            return self._result(self._get(self._params("Standings", leagueId=league_id)), {})
         except Exception as e:
             print(f"DEBUG: Error fetching standings: {e}")
+            record_upstream_failure(e)
             return {}
 
     def get_topscorers(self, league_id: str) -> List[Dict[str, Any]]:
         """Récupère les meilleurs buteurs d'une ligue."""
-        params = {
-            "met": "Topscorers",
-            "APIkey": self.api_key,
-            "leagueId": league_id
-        }
         try:
-            response = httpx.get(self.base_url, params=params, timeout=10.0)
-            response.raise_for_status()
-            data = response.json()
-            if data.get("success") == 1:
-                return data.get("result", [])
-            return []
+            return self._result(self._get(self._params("Topscorers", leagueId=league_id)), [])
         except Exception as e:
             print(f"DEBUG: Error fetching topscorers: {e}")
+            record_upstream_failure(e)
             return []
 
     def get_team_details(self, team_id: str) -> Optional[Dict[str, Any]]:
         """Récupère les détails d'une équipe (joueurs, logo, etc.)."""
-        params = {
-            "met": "Teams",
-            "APIkey": self.api_key,
-            "teamId": team_id
-        }
         try:
-            response = httpx.get(self.base_url, params=params, timeout=10.0)
-            response.raise_for_status()
-            data = response.json()
-            if data.get("success") == 1 and data.get("result"):
-                return data["result"][0]
-            return None
+            result = self._result(self._get(self._params("Teams", teamId=team_id)), None)
+            return result[0] if result else None
         except Exception as e:
             print(f"DEBUG: Error fetching team details: {e}")
+            record_upstream_failure(e)
             return None
 
     def get_videos(self, match_id: str) -> List[Dict[str, Any]]:
         """Récupère les vidéos (highlights) d'un match."""
-        params = {
-            "met": "Videos",
-            "APIkey": self.api_key,
-            "eventId": match_id
-        }
         try:
-            response = httpx.get(self.base_url, params=params, timeout=10.0)
-            response.raise_for_status()
-            data = response.json()
-            if data.get("success") == 1:
-                return data.get("result", [])
-            return []
+            return self._result(self._get(self._params("Videos", eventId=match_id)), [])
         except Exception as e:
             print(f"DEBUG: Error fetching videos: {e}")
+            record_upstream_failure(e)
             return []
 
     def get_odds(self, match_id: str) -> Dict[str, Any]:
         """Récupère les cotes d'un match."""
-        params = {
-            "met": "Odds",
-            "APIkey": self.api_key,
-            "matchId": match_id
-        }
         try:
-            response = httpx.get(self.base_url, params=params, timeout=10.0)
-            response.raise_for_status()
-            data = response.json()
-            if data.get("success") == 1:
-                return data.get("result", {})
+            return self._result(self._get(self._params("Odds", matchId=match_id)), {})
+        except Exception as e:
+            print(f"DEBUG: Error fetching odds: {e}")
+            record_upstream_failure(e)
             return {}
+
+    # --- API asynchrone (même contrat, sans bloquer la boucle d'événements) ---
+
+    async def aresolve_league(self, league_name: str) -> Optional[str]:
+        """Résout un nom de ligue en league_key via le catalogue indexé."""
+        return self._league_key(league_name, await self.league_catalog.aresolve(league_name))
+
+    async def _afetch_team_id(self, team_name: str) -> Optional[str]:
+        return self._team_key(await self._aget(self._params("Teams", teamName=team_name)), team_name)
+
+    async def _aget_team_id(self, team_name: str) -> Optional[str]:
+        """Récupère l'ID d'une équipe par son nom (via le cache de résolution)."""
+        try:
+            return await self.team_resolver.aresolve(team_name)
+        except Exception as e:
+            print(f"DEBUG: Exception in _aget_team_id: {e}")
+            record_upstream_failure(e)
+            return None
+
+    async def aget_leagues(self, country_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Récupère les ligues supportées."""
+        params = self._params("Leagues")
+        if country_id:
+            params["countryId"] = country_id
+        try:
+            return self._result(await self._aget(params), [])
+        except Exception as e:
+            print(f"DEBUG: Error fetching leagues: {e}")
+            record_upstream_failure(e)
+            return []
+
+    async def aget_h2h(self, first_team_id: str, second_team_id: str) -> Dict[str, Any]:
+        """Récupère les données H2H entre deux équipes."""
+        params = self._params("H2H", firstTeamId=first_team_id, secondTeamId=second_team_id)
+        try:
+            print(f"DEBUG: Calling H2H API with params: {params}")
+            return self._result(await self._aget(params), {})
+        except Exception as e:
+            print(f"DEBUG: Error in H2H: {e}")
+            record_upstream_failure(e)
+            return {}
+
+    async def aget_finished_matches(self, sport: str, team_name: Optional[str] = None, team_id: Optional[str] = None, date_from: Optional[date] = None, date_to: Optional[date] = None, league_id: Optional[str] = None, with_player_stats: bool = False) -> List[Dict[str, Any]]:
+        if team_name and not team_id:
+            team_id = await self._aget_team_id(team_name)
+            if not team_id and not league_id:
+                print(f"DEBUG: Could not resolve team_id for '{team_name}'")
+                return []
+
+        date_from, date_to = self._fixtures_range(date_from, date_to)
+        ranges = await self._astore_call(self._fixtures_ranges, team_id, league_id, date_from, date_to, with_player_stats)
+        chunks = self._chunk_ranges(ranges, with_player_stats)
+        semaphore = asyncio.Semaphore(settings.FIXTURES_FETCH_CONCURRENCY)
+
+        async def fetch(start: date, end: date) -> List[Dict[str, Any]]:
+            params = self._fixtures_params(team_id, start, end, league_id, with_player_stats)
+            async with semaphore:
+                print(f"DEBUG: Calling API {self.base_url} with params: {params}")
+                # Avec stockage local, une réponse périmée alimenterait la couverture permanente: jamais servie
+                with upstream_priority(self._chunk_priority(chunks, end)):
+                    data = await self._aget(params, self._afetch_finished, allow_stale=self.match_store is None)
+            return await self._astore_call(self._absorb_fixtures, team_id, league_id, start, end, with_player_stats, data)
+
+        # Tranches téléchargées en parallèle (bornées), archivées à mesure qu'elles arrivent
+        tasks = [asyncio.create_task(fetch(start, end)) for start, end in chunks]
+        try:
+            direct = await asyncio.gather(*tasks)
+        except Exception as e:
+            raise self._fixtures_error(e)
+        finally:
+            for task in tasks:
+                task.cancel()
+        return await self._astore_call(self._assemble_fixtures, team_id, league_id, date_from, date_to, direct)
+
+    async def aget_standings(self, league_id: str) -> Dict[str, Any]:
+        """Récupère le classement d'une ligue."""
+        try:
+            return self._result(await self._aget(self._params("Standings", leagueId=league_id)), {})
+        except Exception as e:
+            print(f"DEBUG: Error fetching standings: {e}")
+            record_upstream_failure(e)
+            return {}
+
+    async def aget_topscorers(self, league_id: str) -> List[Dict[str, Any]]:
+        """Récupère les meilleurs buteurs d'une ligue."""
+        try:
+            return self._result(await self._aget(self._params("Topscorers", leagueId=league_id)), [])
+        except Exception as e:
+            print(f"DEBUG: Error fetching topscorers: {e}")
+            record_upstream_failure(e)
+            return []
+
+    async def aget_team_details(self, team_id: str) -> Optional[Dict[str, Any]]:
+        """Récupère les détails d'une équipe (joueurs, logo, etc.)."""
+        try:
+            result = self._result(await self._aget(self._params("Teams", teamId=team_id)), None)
+            return result[0] if result else None
+        except Exception as e:
+            print(f"DEBUG: Error fetching team details: {e}")
+            record_upstream_failure(e)
+            return None
+
+    async def aget_videos(self, match_id: str) -> List[Dict[str, Any]]:
+        """Récupère les vidéos (highlights) d'un match."""
+        try:
+            return self._result(await self._aget(self._params("Videos", eventId=match_id)), [])
+        except Exception as e:
+            print(f"DEBUG: Error fetching videos: {e}")
+            record_upstream_failure(e)
+            return []
+
+    async def aget_odds(self, match_id: str) -> Dict[str, Any]:
+        """Récupère les cotes d'un match."""
+        try:
+            return self._result(await self._aget(self._params("Odds", matchId=match_id)), {})
         except Exception as e:
             print(f"DEBUG: Error fetching odds: {e}")
+            record_upstream_failure(e)
             return {}
+
+
+all_sports_client = AllSportsClient()
@@ -0,0 +1,116 @@
+import json
+from typing import Any, Dict, List
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",:]}"
+
+
+class JSONArrayStream:
+    """
+    Analyse incrémentale d'un objet JSON dont une clé contient un grand tableau
+    (ex: `{"success": 1, "result": [...]}`).
+
+    Le texte est fourni par morceaux (`feed`); chaque élément du tableau est
+    retourné dès qu'il est complet, sans jamais décoder le document entier.
+    Les autres clés de premier niveau (petites) sont conservées dans `fields`.
+    """
+    _START, _KEY, _COLON, _VALUE, _ITEM, _ITEM_SEP, _NEXT, _DONE = range(8)
+
+    def __init__(self, array_key: str = "result"):
+        self.array_key = array_key
+        self.fields: Dict[str, Any] = {}
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._state = self._START
+        self._key = ""
+        self._first_item = True
+
+    def _skip_whitespace(self) -> bool:
+        """Avance jusqu'au prochain caractère significatif; False s'il faut plus de données."""
+        while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+            self._pos += 1
+        return self._pos < len(self._buffer)
+
+    def _decode_value(self) -> Any:
+        """Décode une valeur complète à la position courante, ou lève IndexError s'il faut plus de données."""
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            raise IndexError
+        # Un nombre en fin de tampon peut être tronqué ("12" puis "3", "1.5" puis "e3"):
+        # dans un objet ou un tableau, une valeur complète est suivie d'un séparateur
+        if end >= len(self._buffer) or self._buffer[end] not in _DELIMITERS:
+            raise IndexError
+        self._pos = end
+        return value
+
+    def _expect(self, char: str):
+        if self._buffer[self._pos] != char:
+            raise ValueError(f"JSON invalide: '{char}' attendu à la position {self._pos}")
+        self._pos += 1
+
+    def feed(self, text: str) -> List[Any]:
+        """Ajoute un morceau de texte et retourne les éléments du tableau désormais complets."""
+        self._buffer = self._buffer[self._pos:] + text
+        self._pos = 0
+        items: List[Any] = []
+        try:
+            while self._state != self._DONE and self._skip_whitespace():
+                char = self._buffer[self._pos]
+                if self._state == self._START:
+                    self._expect("{")
+                    self._state = self._KEY
+                elif self._state == self._KEY:
+                    if char == "}":
+                        self._pos += 1
+                        self._state = self._DONE
+                    else:
+                        key = self._decode_value()
+                        if not isinstance(key, str):
+                            raise ValueError(f"JSON invalide: clé attendue à la position {self._pos}")
+                        self._key = key
+                        self._state = self._COLON
+                elif self._state == self._COLON:
+                    self._expect(":")
+                    self._state = self._VALUE
+                elif self._state == self._VALUE:
+                    if self._key == self.array_key and char == "[":
+                        self._pos += 1
+                        self._first_item = True
+                        self._state = self._ITEM
+                    else:
+                        self.fields[self._key] = self._decode_value()
+                        self._state = self._NEXT
+                elif self._state == self._ITEM:
+                    if char == "]" and self._first_item:
+                        self._pos += 1
+                        self._state = self._NEXT
+                    else:
+                        items.append(self._decode_value())
+                        self._first_item = False
+                        self._state = self._ITEM_SEP
+                elif self._state == self._ITEM_SEP:
+                    if char == "]":
+                        self._pos += 1
+                        self._state = self._NEXT
+                    else:
+                        self._expect(",")
+                        self._state = self._ITEM
+                elif self._state == self._NEXT:
+                    if char == "}":
+                        self._pos += 1
+                        self._state = self._DONE
+                    else:
+                        self._expect(",")
+                        self._state = self._KEY
+        except IndexError:
+            # Élément incomplet: on attend le morceau suivant
+            pass
+        return items
+
+    def close(self) -> Dict[str, Any]:
+        """Fin du flux: vérifie que le document est complet et retourne les autres clés."""
+        if self._state != self._DONE:
+            raise ValueError("JSON incomplet: fin de flux inattendue")
+        return self.fields
@@ -0,0 +1,90 @@
+import json
+import time
+from datetime import date
+from typing import Any, Dict, Optional, Tuple
+from app.core.config import settings
+from app.services.cache import CacheStats, SQLiteCache, TTLCache
+
+# Paramètres qui ne font pas partie de la clé de cache
+_IGNORED_PARAMS = {"APIkey"}
+
+
+class ResponseCache:
+    """
+    Cache des réponses AllSportsAPI, indexé par (met, paramètres normalisés).
+    Le TTL dépend de l'endpoint (`met`): les ligues changent rarement, les
+    classements souvent, et les matchs d'une période terminée plus du tout.
+    Au-delà du TTL, l'entrée reste disponible (stale-while-revalidate) le
+    temps que l'appelant la rafraîchisse. Les valeurs retournées sont partagées:
+    ne pas les modifier.
+    """
+    def __init__(self, backend: Any, ttls: Optional[Dict[str, float]] = None, default_ttl: Optional[float] = None, stale_window: Optional[float] = None):
+        self.backend = backend
+        self.ttls = dict(settings.RESPONSE_CACHE_TTLS if ttls is None else ttls)
+        self.default_ttl = settings.RESPONSE_CACHE_DEFAULT_TTL if default_ttl is None else default_ttl
+        self.stale_window = settings.RESPONSE_CACHE_STALE_WINDOW if stale_window is None else stale_window
+        self.stats = CacheStats()
+        self.stale_hits = 0
+
+    @staticmethod
+    def key(params: Dict[str, Any]) -> str:
+        normalized = {k: str(v) for k, v in params.items() if k not in _IGNORED_PARAMS}
+        return json.dumps(normalized, sort_keys=True, separators=(",", ":"))
+
+    def ttl_for(self, params: Dict[str, Any]) -> float:
+        met = params.get("met", "")
+        if met == "Fixtures" and params.get("to", "") < date.today().isoformat():
+            # Période entièrement passée: les résultats ne bougeront plus
+            return settings.FINISHED_FIXTURES_TTL
+        return self.ttls.get(met, self.default_ttl)
+
+    def lookup(self, params: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """
+        Retourne (réponse, périmée). Une réponse dont le TTL est dépassé reste
+        servie pendant `stale_window` secondes: l'appelant la rafraîchit en arrière-plan.
+        """
+        entry = self.backend.get(self.key(params))
+        met = params.get("met", "")
+        if entry is None:
+            self.stats.record(met, hit=False)
+            return None, False
+        self.stats.record(met, hit=True)
+        if not (isinstance(entry, dict) and "fresh_until" in entry and "data" in entry):
+            # Entrée écrite avant l'ajout de stale-while-revalidate
+            return entry, False
+        stale = entry["fresh_until"] <= time.time()
+        if stale:
+            self.stale_hits += 1
+        return entry["data"], stale
+
+    def get(self, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return self.lookup(params)[0]
+
+    def set(self, params: Dict[str, Any], data: Dict[str, Any]):
+        ttl = self.ttl_for(params)
+        if ttl > 0:
+            entry = {"data": data, "fresh_until": time.time() + ttl}
+            self.backend.set(self.key(params), entry, ttl=ttl + self.stale_window)
+
+    def clear(self):
+        self.backend.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": len(self.backend),
+            "stale_hits": self.stale_hits,
+            **self.stats.snapshot()
+        }
+
+
+def create_response_cache() -> Optional[ResponseCache]:
+    """Construit le cache selon RESPONSE_CACHE_BACKEND ("memory", "disk" ou "none")."""
+    backend = settings.RESPONSE_CACHE_BACKEND
+    if backend == "memory":
+        return ResponseCache(TTLCache(max_size=settings.RESPONSE_CACHE_MAX_SIZE))
+    if backend == "disk":
+        return ResponseCache(SQLiteCache(settings.data_path(settings.RESPONSE_CACHE_PATH), max_size=settings.RESPONSE_CACHE_MAX_SIZE))
+    if backend == "none":
+        return None
+    raise ValueError(f"RESPONSE_CACHE_BACKEND inconnu: {backend}")
@@ -0,0 +1,107 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+from app.core.config import settings
+from app.services.api_clients.all_sports_client import AllSportsClient, force_refresh
+from app.services.rate_limiter import Priority, upstream_priority
+from app.services.tool_registry import tool_registry
+
+
+class CacheWarmer:
+    """
+    Tâche de fond qui rafraîchit périodiquement les réponses les plus demandées
+    (classement, buteurs et matchs récents des ligues configurées, matchs récents
+    des équipes configurées) avant leur expiration: les utilisateurs ne paient
+    jamais l'appel upstream. Les appels passent en priorité PREFETCH et ne
+    consomment donc que le débit laissé libre par les requêtes interactives.
+    """
+    def __init__(
+        self,
+        client: Optional[AllSportsClient] = None,
+        leagues: Optional[List[str]] = None,
+        teams: Optional[List[str]] = None,
+        interval: Optional[float] = None,
+    ):
+        self._client = client
+        self.leagues = list(settings.CACHE_WARM_LEAGUES if leagues is None else leagues)
+        self.teams = list(settings.CACHE_WARM_TEAMS if teams is None else teams)
+        self.interval = settings.CACHE_WARM_INTERVAL if interval is None else interval
+        self._task: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.errors = 0
+        self.last_run: Optional[float] = None
+        self.last_duration_ms: Optional[float] = None
+
+    @property
+    def client(self) -> AllSportsClient:
+        return self._client or tool_registry.client_provider.all_sports
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval > 0 and bool(self.leagues or self.teams)
+
+    async def _warm_league(self, league: str):
+        league_id = league if league.isdigit() else await self.client.aresolve_league(league)
+        if not league_id:
+            print(f"DEBUG: Cache warmer could not resolve league '{league}'")
+            return
+        await asyncio.gather(
+            self.client.aget_standings(league_id),
+            self.client.aget_topscorers(league_id),
+            self.client.aget_finished_matches(sport="football", league_id=league_id),
+        )
+
+    async def _warm_team(self, team: str):
+        if team.isdigit():
+            await self.client.aget_finished_matches(sport="football", team_id=team)
+        else:
+            await self.client.aget_finished_matches(sport="football", team_name=team)
+
+    async def warm(self):
+        """Un passage complet sur l'ensemble à préchauffer."""
+        started = time.perf_counter()
+        jobs = [self._warm_league(league) for league in self.leagues] + [self._warm_team(team) for team in self.teams]
+        with upstream_priority(Priority.PREFETCH), force_refresh():
+            results = await asyncio.gather(*jobs, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                self.errors += 1
+                print(f"DEBUG: Cache warmer error: {result}")
+        self.runs += 1
+        self.last_run = time.time()
+        self.last_duration_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    async def _loop(self):
+        while True:
+            await self.warm()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "running": self._task is not None and not self._task.done(),
+            "leagues": self.leagues,
+            "teams": self.teams,
+            "interval_seconds": self.interval,
+            "runs": self.runs,
+            "errors": self.errors,
+            "last_run": self.last_run,
+            "last_duration_ms": self.last_duration_ms,
+        }
+
+
+cache_warmer = CacheWarmer()
@@ -0,0 +1,58 @@
+import copy
+from typing import Any, Dict, Optional
+from app.core.config import settings
+from app.services.cache import CacheStats, SQLiteCache, TTLCache
+from app.services.normalization import normalize_text
+
+
+class IntentCache:
+    """
+    Cache des analyses de requêtes (intention + paramètres) par sport.
+    Les requêtes sont normalisées (casse, accents, ponctuation, espaces) pour que
+    "Classement  Premier League" et "classement premier league" partagent l'entrée.
+    Mémoire LRU/TTL, avec persistance optionnelle sur disque.
+    """
+    def __init__(self, max_size: Optional[int] = None, ttl: Optional[float] = None, path: Optional[str] = None):
+        self.ttl = settings.INTENT_CACHE_TTL if ttl is None else ttl
+        self.memory = TTLCache(max_size=max_size or settings.INTENT_CACHE_MAX_SIZE, ttl=self.ttl)
+        path = settings.INTENT_CACHE_PATH if path is None else path
+        self.disk = SQLiteCache(settings.data_path(path), max_size=settings.INTENT_CACHE_MAX_SIZE) if path else None
+        self.stats = CacheStats()
+
+    @staticmethod
+    def key(sport: str, query: str) -> str:
+        return f"{normalize_text(sport)}|{normalize_text(query)}"
+
+    def get(self, sport: str, query: str) -> Optional[Dict[str, Any]]:
+        key = self.key(sport, query)
+        analysis = self.memory.get(key)
+        source = "memory"
+        if analysis is None and self.disk is not None:
+            analysis = self.disk.get(key)
+            source = "disk"
+            if analysis is not None:
+                self.memory.set(key, analysis)
+        self.stats.record(source if analysis is not None else "llm", hit=analysis is not None)
+        # Copie: l'appelant injecte les paramètres dans le workflow
+        return copy.deepcopy(analysis) if analysis is not None else None
+
+    def set(self, sport: str, query: str, analysis: Dict[str, Any]):
+        # Les échecs (pas d'intention, erreur LLM) ne sont pas mis en cache
+        if not analysis.get("tool"):
+            return
+        key = self.key(sport, query)
+        value = copy.deepcopy(analysis)
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value, ttl=self.ttl)
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"entries": len(self.memory), "persistent": self.disk is not None, **self.stats.snapshot()}
+
+
+intent_cache = IntentCache()
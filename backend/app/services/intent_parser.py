@@ -0,0 +1,200 @@
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from app.core.config import settings
+from app.services.normalization import normalize_text
+from app.services.tool_registry import ToolRegistry, tool_registry
+
+# Mots-clés (normalisés) -> outil
+INTENT_KEYWORDS: Dict[str, List[str]] = {
+    "standings": ["classement", "classements", "standings", "table", "tableau"],
+    "topscorers": ["buteurs", "buteur", "meilleurs buteurs", "meilleur buteur", "top scorers", "topscorers", "scorers"],
+    "team_info": ["effectif", "effectifs", "squad", "roster", "joueurs de", "fiche equipe"],
+    "match_info": ["score", "scores", "resultat", "resultats", "result", "results", "match", "matchs", "h2h", "face a face", "confrontation", "confrontations"],
+    "videos": ["video", "videos", "highlights", "resume video"],
+}
+
+# Mots ignorés autour des entités ("de la Premier League", "Ligue 1 stp").
+# Seulement en bordure: "Serie A" ou "Paris Saint-Germain" restent intacts.
+LEADING_STOPWORDS = {
+    "a", "au", "aux", "d", "de", "des", "du", "en", "et", "l", "la", "le", "les", "pour", "sur",
+    "donne", "donnez", "moi", "montre", "affiche", "quel", "quelle", "quels", "quelles", "est", "sont",
+    "actuel", "actuelle", "dernier", "derniere", "derniers", "the", "of", "in", "for", "show", "me", "what", "is",
+}
+TRAILING_STOPWORDS = {
+    "de", "des", "du", "en", "le", "la", "les", "actuel", "actuelle", "saison", "season",
+    "stp", "svp", "s", "il", "te", "plait", "please",
+}
+
+VERSUS = {"vs", "v", "contre", "versus"}
+
+_DATE = re.compile(r"\b(\d{4}-\d{2}-\d{2})\b")
+_YEAR = re.compile(r"\b((?:19|20)\d{2})\b")
+# Identifiant de match: seulement avec un marqueur explicite ("match 12345", "id: 12345", "#12345"),
+# un nombre isolé pouvant être n'importe quoi (année, score, numéro de maillot...)
+_MATCH_ID = re.compile(
+    r"(?:\b(?:match|game|event|[ée]v[ée]nement|id)\s*(?:n°|no\.?|num[ée]ro)?\s*:?\s*#?|#)\s*(\d{5,})\b",
+    re.IGNORECASE,
+)
+
+# Contributions au score de confiance
+KEYWORD_SCORE = 0.5
+GAZETTEER_SCORE = 0.45
+FREE_TEXT_SCORE = 0.2
+
+
+class ParseResult(NamedTuple):
+    analysis: Optional[Dict[str, Any]]
+    confidence: float
+
+
+class IntentParser:
+    """
+    Analyse locale et déterministe des requêtes simples ("classement Ligue 1",
+    "buteurs Serie A", "PSG vs OM"). Les ligues et équipes déjà connues
+    (catalogue des ligues, surnoms et équipes résolues) servent de dictionnaires:
+    une entité reconnue donne une confiance élevée, un texte libre une confiance faible.
+    Aucun appel réseau n'est effectué.
+    """
+    def __init__(self, registry: ToolRegistry):
+        self.registry = registry
+        self.parsed = 0
+        self.confident = 0
+
+    @property
+    def _client(self):
+        return self.registry.client_provider.all_sports
+
+    @staticmethod
+    def _match_intents(text: str) -> Tuple[List[str], str]:
+        """Retourne les outils détectés et le texte privé de leurs mots-clés."""
+        padded = f" {text} "
+        intents = []
+        for tool, keywords in INTENT_KEYWORDS.items():
+            # Mots-clés les plus longs d'abord ("meilleurs buteurs" avant "buteurs")
+            for keyword in sorted(keywords, key=len, reverse=True):
+                if f" {keyword} " in padded:
+                    if tool not in intents:
+                        intents.append(tool)
+                    padded = padded.replace(f" {keyword} ", " ")
+        return intents, padded.strip()
+
+    @staticmethod
+    def _entity(tokens: List[str]) -> str:
+        start, end = 0, len(tokens)
+        while start < end and tokens[start] in LEADING_STOPWORDS:
+            start += 1
+        while end > start and tokens[end - 1] in TRAILING_STOPWORDS:
+            end -= 1
+        return " ".join(tokens[start:end])
+
+    def _league(self, text: str, fuzzy: bool) -> Optional[Dict[str, Any]]:
+        if not text:
+            return None
+        return self._client.league_catalog.peek(text, fuzzy=fuzzy)
+
+    def _known_team(self, text: str, known: set) -> bool:
+        return bool(text) and text in known
+
+    def parse(self, query: str, sport: str = "football") -> ParseResult:
+        self.parsed += 1
+        result = self._parse(query, sport)
+        if result.analysis is not None and result.confidence >= settings.INTENT_PARSER_MIN_CONFIDENCE:
+            self.confident += 1
+        return result
+
+    def _parse(self, query: str, sport: str) -> ParseResult:
+        parameters: Dict[str, Any] = {"sport": sport}
+
+        raw = query
+        date_match = _DATE.search(raw)
+        if date_match:
+            parameters["date"] = date_match.group(1)
+            raw = raw.replace(date_match.group(1), " ")
+
+        match_id = _MATCH_ID.search(raw)
+        if match_id:
+            # Le marqueur ("match") n'est pas un mot-clé d'intention ici
+            raw = raw.replace(match_id.group(0), " ")
+
+        intents, rest = self._match_intents(normalize_text(raw))
+        if not intents and VERSUS.intersection(rest.split()):
+            # "PSG vs OM": face-à-face implicite
+            intents = ["match_info"]
+        if len(intents) != 1:
+            # Aucune intention, ou plusieurs en concurrence: on laisse le LLM trancher
+            return ParseResult(None, 0.0)
+        tool = intents[0]
+
+        if (tool == "videos") != bool(match_id):
+            # Vidéos sans identifiant explicite, ou match précis demandé à un autre outil: cas laissés au LLM
+            return ParseResult(None, 0.0)
+        if tool == "videos":
+            parameters["match_id"] = match_id.group(1)
+            return ParseResult({"tool": tool, "parameters": parameters}, KEYWORD_SCORE + GAZETTEER_SCORE)
+
+        if tool == "match_info" and "date" not in parameters:
+            year = _YEAR.search(rest)
+            if year:
+                parameters["season"] = int(year.group(1))
+                rest = rest.replace(year.group(1), " ")
+
+        tokens = rest.split()
+        confidence = KEYWORD_SCORE
+
+        if tool in ("standings", "topscorers"):
+            entity = self._entity(tokens)
+            league = self._league(entity, fuzzy=True)
+            if league:
+                parameters["league"] = league.get("league_name")
+                parameters["league_id"] = league.get("league_key")
+                confidence += GAZETTEER_SCORE
+            elif entity:
+                parameters["league"] = entity
+                confidence += FREE_TEXT_SCORE
+            return ParseResult({"tool": tool, "parameters": parameters}, confidence)
+
+        known_teams = self._client.team_resolver.known_names()
+
+        if tool == "team_info":
+            entity = self._entity(tokens)
+            if not entity:
+                return ParseResult(None, 0.0)
+            parameters["team"] = entity
+            confidence += GAZETTEER_SCORE if self._known_team(entity, known_teams) else FREE_TEXT_SCORE
+            return ParseResult({"tool": tool, "parameters": parameters}, confidence)
+
+        # match_info: face-à-face, équipe ou ligue
+        split_at = next((i for i, t in enumerate(tokens) if t in VERSUS), None)
+        if split_at is not None:
+            team = self._entity(tokens[:split_at])
+            opponent = self._entity(tokens[split_at + 1:])
+            if not team or not opponent:
+                return ParseResult(None, 0.0)
+            parameters["team"] = team
+            parameters["opponent"] = opponent
+            both_known = self._known_team(team, known_teams) and self._known_team(opponent, known_teams)
+            confidence += GAZETTEER_SCORE if both_known else FREE_TEXT_SCORE
+            return ParseResult({"tool": tool, "parameters": parameters}, confidence)
+
+        entity = self._entity(tokens)
+        if not entity:
+            return ParseResult(None, 0.0)
+        if self._known_team(entity, known_teams):
+            parameters["team"] = entity
+            confidence += GAZETTEER_SCORE
+        else:
+            # Correspondance stricte: un nom d'équipe ne doit pas être pris pour une ligue
+            league = self._league(entity, fuzzy=False)
+            if league:
+                parameters["league"] = league.get("league_name")
+                confidence += GAZETTEER_SCORE
+            else:
+                parameters["team"] = entity
+                confidence += FREE_TEXT_SCORE
+        return ParseResult({"tool": tool, "parameters": parameters}, confidence)
+
+    def snapshot(self) -> Dict[str, int]:
+        return {"parsed": self.parsed, "confident": self.confident}
+
+
+intent_parser = IntentParser(tool_registry)
@@ -0,0 +1,214 @@
+import asyncio
+import bisect
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set
+from app.core.config import settings
+from app.services.normalization import normalize_text
+from app.services.rate_limiter import Priority, upstream_priority
+
+if TYPE_CHECKING:
+    from app.services.api_clients.all_sports_client import AllSportsClient
+
+# Score minimal (similarité de trigrammes) pour accepter une correspondance approximative
+FUZZY_THRESHOLD = 0.35
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class LeagueIndex:
+    """
+    Index immuable des ligues: nom normalisé -> ligue, index de mots
+    (avec recherche par préfixe) et index de trigrammes pour le flou.
+    """
+    def __init__(self, leagues: List[Dict[str, Any]]):
+        self.leagues = leagues
+        self.names: List[str] = [normalize_text(lg.get("league_name", "")) for lg in leagues]
+        self.by_name: Dict[str, int] = {}
+        self.postings: Dict[str, List[int]] = {}
+        self.trigram_postings: Dict[str, List[int]] = {}
+        self.trigram_counts: List[int] = []
+
+        for i, name in enumerate(self.names):
+            # En cas de doublon, la première ligue de la liste l'emporte
+            self.by_name.setdefault(name, i)
+            for token in set(name.split()):
+                self.postings.setdefault(token, []).append(i)
+            grams = _trigrams(name)
+            self.trigram_counts.append(len(grams))
+            for gram in grams:
+                self.trigram_postings.setdefault(gram, []).append(i)
+
+        self.tokens: List[str] = sorted(self.postings)
+
+    def __len__(self) -> int:
+        return len(self.leagues)
+
+    def _prefix_postings(self, prefix: str) -> Set[int]:
+        found: Set[int] = set()
+        start = bisect.bisect_left(self.tokens, prefix)
+        for token in self.tokens[start:]:
+            if not token.startswith(prefix):
+                break
+            found.update(self.postings[token])
+        return found
+
+    def _token_candidates(self, query: str) -> Set[int]:
+        tokens = query.split()
+        candidates: Optional[Set[int]] = None
+        for i, token in enumerate(tokens):
+            # Le dernier mot peut être incomplet ("premier lea")
+            if i == len(tokens) - 1:
+                matches = self._prefix_postings(token)
+            else:
+                matches = set(self.postings.get(token, ()))
+            candidates = matches if candidates is None else candidates & matches
+            if not candidates:
+                return set()
+        return candidates or set()
+
+    def _fuzzy(self, query: str) -> Optional[int]:
+        grams = _trigrams(query)
+        overlaps: Dict[int, int] = {}
+        for gram in grams:
+            for i in self.trigram_postings.get(gram, ()):
+                overlaps[i] = overlaps.get(i, 0) + 1
+
+        best, best_score = None, FUZZY_THRESHOLD
+        for i, common in overlaps.items():
+            score = common / (len(grams) + self.trigram_counts[i] - common)
+            if score > best_score:
+                best, best_score = i, score
+        return best
+
+    def lookup(self, name: str, fuzzy: bool = True) -> Optional[Dict[str, Any]]:
+        query = normalize_text(name)
+        if not query:
+            return None
+
+        exact = self.by_name.get(query)
+        if exact is not None:
+            return self.leagues[exact]
+
+        candidates = self._token_candidates(query)
+        if candidates:
+            # Comme l'ancien parcours linéaire: la première ligue (ordre de l'API)
+            # contenant la requête, puis à défaut la première qui partage les mots.
+            contained = [i for i in candidates if query in self.names[i]]
+            return self.leagues[min(contained or candidates)]
+
+        if not fuzzy:
+            return None
+        best = self._fuzzy(query)
+        return self.leagues[best] if best is not None else None
+
+
+class LeagueCatalog:
+    """
+    Catalogue des ligues chargé une fois puis rafraîchi en arrière-plan
+    lorsque le TTL est dépassé (la version précédente reste servie entre-temps).
+    """
+    def __init__(self, client: "AllSportsClient", ttl: Optional[float] = None):
+        self.client = client
+        self.ttl = settings.LEAGUE_CATALOG_TTL if ttl is None else ttl
+        self._index: Optional[LeagueIndex] = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._index is not None
+
+    def _is_stale(self) -> bool:
+        return time.monotonic() >= self._expires_at
+
+    def _install(self, leagues: List[Dict[str, Any]]):
+        if leagues:
+            self._index = LeagueIndex(leagues)
+            self._expires_at = time.monotonic() + self.ttl
+            print(f"DEBUG: League catalog loaded ({len(leagues)} leagues)")
+        else:
+            # Échec du chargement: on garde l'index courant et on réessaie plus tard
+            if self._index is None:
+                self._index = LeagueIndex([])
+            self._expires_at = time.monotonic() + settings.LEAGUE_CATALOG_RETRY_DELAY
+
+    # --- Rafraîchissement ---
+
+    def refresh(self):
+        """Recharge le catalogue (bloquant)."""
+        self._install(self.client.get_leagues())
+
+    async def arefresh(self):
+        """Recharge le catalogue sans bloquer la boucle d'événements."""
+        self._install(await self.client.aget_leagues())
+
+    def _refresh_in_background(self):
+        try:
+            # Rafraîchissement anticipé: ne concurrence pas les requêtes des utilisateurs
+            with upstream_priority(Priority.PREFETCH):
+                self.refresh()
+        finally:
+            self._refreshing = False
+
+    async def _arefresh_in_background(self):
+        with upstream_priority(Priority.PREFETCH):
+            await self.arefresh()
+
+    def _ensure(self):
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self.refresh()
+        elif self._is_stale() and not self._refreshing:
+            with self._lock:
+                if self._refreshing:
+                    return
+                self._refreshing = True
+            threading.Thread(target=self._refresh_in_background, daemon=True).start()
+
+    def preload(self) -> Optional[asyncio.Task]:
+        """Lance le premier chargement en arrière-plan (démarrage), sans l'attendre."""
+        if self._index is None and (self._refresh_task is None or self._refresh_task.done()):
+            self._refresh_task = asyncio.create_task(self.arefresh())
+        return self._refresh_task
+
+    async def _aensure(self):
+        if self._index is None:
+            if self._refresh_task is None or self._refresh_task.done():
+                self._refresh_task = asyncio.create_task(self.arefresh())
+            await asyncio.shield(self._refresh_task)
+        elif self._is_stale() and (self._refresh_task is None or self._refresh_task.done()):
+            self._refresh_task = asyncio.create_task(self._arefresh_in_background())
+
+    async def aclose(self):
+        """Annule le chargement en cours lié à la boucle courante (arrêt, fin d'un pont synchrone)."""
+        task = self._refresh_task
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            return
+        self._refresh_task = None
+        if not task.done():
+            task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    # --- Résolution ---
+
+    def resolve(self, league_name: str) -> Optional[Dict[str, Any]]:
+        """Retourne la ligue correspondant au nom donné (exact, mots, puis approximatif)."""
+        self._ensure()
+        return self._index.lookup(league_name)
+
+    async def aresolve(self, league_name: str) -> Optional[Dict[str, Any]]:
+        await self._aensure()
+        return self._index.lookup(league_name)
+
+    def peek(self, league_name: str, fuzzy: bool = True) -> Optional[Dict[str, Any]]:
+        """Résolution sur l'index déjà chargé, sans jamais déclencher d'appel réseau."""
+        if self._index is None:
+            return None
+        return self._index.lookup(league_name, fuzzy=fuzzy)
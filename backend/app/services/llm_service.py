@@ -1,76 +1,269 @@
+import asyncio
 import json
-from typing import Dict, Any
-from openai import OpenAI
+import random
+import time
+from collections import deque
+from typing import Deque, Dict, Any, List, Optional, Tuple
+import httpx
+import openai
+from openai import AsyncOpenAI
 from app.core.config import settings
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.tool_registry import ToolRegistry, tool_registry
+from app.tools.base import BaseTool
+
+# Le prompt système est assemblé à partir des outils enregistrés (nom, description,
+# paramètres): il reste aligné sur le registre et aussi court que possible.
+PROMPT_HEADER = "Analyse une demande sportive: choisis un outil et extrais ses paramètres.\nOutils (paramètres):"
+PROMPT_FOOTER = 'Réponds UNIQUEMENT en JSON: {"tool":"<outil>","parameters":{...}}, ou {"tool":null} si aucun outil ne convient.'
+BATCH_INSTRUCTIONS = 'Entrée: liste JSON [{"index":i,"query":...}]. Analyse chaque requête et réponds {"results":[{"index":i,"tool":...,"parameters":{...}}]}, une entrée par requête.'
+
+# Nombre d'appels conservés pour les percentiles de latence
+LATENCY_WINDOW = 512
+
+def build_system_prompt(tools: List[BaseTool]) -> str:
+    lines = [PROMPT_HEADER]
+    for tool in tools:
+        if not tool.parameters:
+            continue
+        params = "; ".join(f"{name}: {hint}" for name, hint in tool.parameters.items())
+        lines.append(f"- {tool.name}: {tool.description} ({params})")
+    lines.append(PROMPT_FOOTER)
+    return "\n".join(lines)
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+class LLMUnavailableError(RuntimeError):
+    """Le LLM n'a pas pu répondre (circuit ouvert, délai dépassé, erreurs répétées)."""
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, (asyncio.TimeoutError, openai.APITimeoutError, openai.APIConnectionError, openai.RateLimitError)):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code >= 500
 
 class LLMService:
-    def __init__(self):
-        self.client = OpenAI(
-            api_key=settings.GROQ_API_KEY,
-            base_url="https://api.groq.com/openai/v1"
+    """
+    Client LLM asynchrone (API compatible OpenAI) partagé par l'application:
+    pool de connexions unique, délai par appel, nouvelles tentatives avec gigue
+    sur 429/5xx, nombre d'appels simultanés plafonné et disjoncteur.
+    En cas d'échec, les méthodes retournent {"tool": None}: le générateur se
+    rabat alors sur le cache ou l'analyse locale.
+    """
+    def __init__(self, client: Optional[AsyncOpenAI] = None, registry: Optional[ToolRegistry] = None):
+        self.model = settings.LLM_MODEL
+        self.registry = registry or tool_registry
+        self._prompts: Dict[str, Tuple[int, str]] = {}
+        self._client = client
+        self._owns_client = client is None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.breaker = CircuitBreaker(
+            failure_threshold=settings.LLM_BREAKER_FAILURE_THRESHOLD,
+            reset_timeout=settings.LLM_BREAKER_RESET_TIMEOUT
         )
-        self.model = "llama-3.3-70b-versatile" # Using a supported model
+        self.stats = {"calls": 0, "retries": 0, "failures": 0, "rejected": 0}
+        self.usage = {
+            kind: {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+            for kind in ("single", "batch")
+        }
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    # --- Cycle de vie ---
+
+    def _bind(self) -> AsyncOpenAI:
+        """Client et sémaphore liés à la boucle d'événements courante."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            if self._owns_client and self._client is not None and self._loop is not None:
+                # Le client d'une autre boucle ne peut être ni réutilisé ni fermé d'ici
+                raise RuntimeError(
+                    "Client LLM lié à une autre boucle d'événements: "
+                    "appeler arelease() avant la fin de celle-ci (ex: ponts synchrones asyncio.run)"
+                )
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+            if self._owns_client:
+                # Pas de nouvelles tentatives côté SDK: elles sont gérées ici
+                self._client = AsyncOpenAI(
+                    api_key=settings.GROQ_API_KEY,
+                    base_url=settings.LLM_BASE_URL,
+                    max_retries=0,
+                    timeout=settings.LLM_TIMEOUT,
+                    http_client=httpx.AsyncClient(
+                        limits=httpx.Limits(
+                            max_connections=settings.LLM_MAX_CONNECTIONS,
+                            max_keepalive_connections=settings.LLM_MAX_CONNECTIONS
+                        )
+                    )
+                )
+        return self._client
+
+    async def startup(self):
+        self._bind()
+
+    async def aclose(self):
+        if self._owns_client and self._client is not None:
+            await self._client.close()
+            self._client = None
+        self._loop = None
+
+    async def arelease(self):
+        """Ferme le client lié à la boucle courante avant qu'elle ne se termine (ponts synchrones)."""
+        if self._loop is asyncio.get_running_loop():
+            await self.aclose()
+
+    # --- Prompt ---
+
+    def system_prompt(self, batch: bool = False) -> str:
+        """Prompt système construit une fois par version du registre d'outils."""
+        kind = "batch" if batch else "single"
+        cached = self._prompts.get(kind)
+        if cached is None or cached[0] != self.registry.version:
+            prompt = build_system_prompt(self.registry.tools())
+            if batch:
+                prompt = f"{prompt}\n{BATCH_INSTRUCTIONS}"
+            cached = self._prompts[kind] = (self.registry.version, prompt)
+        return cached[1]
+
+    # --- Appel LLM ---
+
+    def _record_usage(self, kind: str, response: Any, latency_ms: float):
+        usage = self.usage[kind]
+        usage["calls"] += 1
+        tokens = getattr(response, "usage", None)
+        if tokens is not None:
+            usage["prompt_tokens"] += tokens.prompt_tokens or 0
+            usage["completion_tokens"] += tokens.completion_tokens or 0
+        self._latencies.append(latency_ms)
+
+    async def _complete(self, user_content: str, batch: bool = False) -> str:
+        system_prompt = self.system_prompt(batch)
+        client = self._bind()
+        if not self.breaker.allow():
+            self.stats["rejected"] += 1
+            raise LLMUnavailableError("Circuit LLM ouvert")
+        trial = self.breaker.state == CircuitBreaker.HALF_OPEN
+        settled = False
 
-    def analyze_query(self, query: str) -> Dict[str, Any]:
+        attempts = settings.LLM_MAX_RETRIES + 1
+        try:
+            for attempt in range(attempts):
+                try:
+                    async with self._semaphore:
+                        self.stats["calls"] += 1
+                        started = time.perf_counter()
+                        response = await asyncio.wait_for(
+                            client.chat.completions.create(
+                                model=self.model,
+                                messages=[
+                                    {"role": "system", "content": system_prompt},
+                                    {"role": "user", "content": user_content}
+                                ],
+                                response_format={"type": "json_object"},
+                                temperature=0.1
+                            ),
+                            timeout=settings.LLM_TIMEOUT
+                        )
+                    self._record_usage("batch" if batch else "single", response, (time.perf_counter() - started) * 1000)
+                    settled = True
+                    self.breaker.record_success()
+                    return response.choices[0].message.content
+                except Exception as e:
+                    if not _is_retryable(e):
+                        # Erreur de requête (4xx hors 429): le service répond, inutile d'ouvrir le circuit
+                        settled = True
+                        self.breaker.record_success()
+                        raise
+                    if attempt == attempts - 1:
+                        self.stats["failures"] += 1
+                        settled = True
+                        self.breaker.record_failure()
+                        raise LLMUnavailableError(f"LLM indisponible ({type(e).__name__}): {e}") from e
+                    self.stats["retries"] += 1
+                    # Backoff exponentiel avec gigue complète
+                    await asyncio.sleep(random.uniform(0, settings.LLM_RETRY_BASE_DELAY * 2 ** attempt))
+        finally:
+            # Essai annulé (client déconnecté, délai externe): CancelledError n'est pas
+            # une Exception, le créneau d'essai doit quand même être libéré
+            if trial and not settled:
+                self.breaker.release_trial()
+
+    async def aanalyze_query(self, query: str) -> Dict[str, Any]:
         """
         Analyse une requête utilisateur pour extraire l'intention et les paramètres.
         Retourne un dictionnaire JSON.
         """
-        system_prompt = """
-        Tu es un assistant expert en sports. Ta tâche est d'analyser la demande de l'utilisateur pour extraire l'intention et les entités structurées pour une API de sports.
-        
-        Les outils disponibles sont :
-        - match_info: pour les scores, résultats, détails d'un match terminé. 
-        - standings: pour obtenir le classement d'une ligue (nécessite league ou league_id).
-        - topscorers: pour obtenir les meilleurs buteurs d'une ligue (nécessite league ou league_id).
-        - team_info: pour obtenir l'effectif et les détails d'une équipe (nécessite team ou team_id).
-        - videos: pour obtenir les highlights d'un match (nécessite match_id).
-        
-        Paramètres possibles pour match_info:
-        - sport (str): ex: "football".
-        - team (str): Nom de l'équipe principale.
-        - opponent (str): Nom de l'équipe adverse (pour les face-à-face).
-        - league (str): Nom de la ligue/compétition (ex: "Premier League").
-        - date (str YYYY-MM-DD): Date précise.
-        - season (int): Année de la saison (ex: 2019).
-        - details (list[str]): Liste de détails demandés (ex: ["stats", "lineups"]).
-        
-        Paramètres pour standings / topscorers:
-        - league (str): Nom de la ligue.
-        - league_id (str, optionnel).
-        
-        Paramètres pour team_info:
-        - team (str): Nom de l'équipe.
-        - team_id (str, optionnel).
-        
-        Paramètres pour videos:
-        - match_id (str, obligatoire).
-        
-        Structure du JSON de réponse :
-        {
-            "tool": "name_of_tool",
-            "parameters": { ... }
-        }
-        
-        Si aucune intention claire ne correspond, retourne {"tool": null}.
-        Réponds UNIQUEMENT le JSON.
-        """
-
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": query}
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.1
-            )
-            
-            content = response.choices[0].message.content
+            content = await self._complete(query)
             return json.loads(content)
         except Exception as e:
             print(f"Erreur LLM: {e}")
             return {"tool": None}
 
+    async def aanalyze_queries(self, queries: List[str]) -> List[Dict[str, Any]]:
+        """
+        Analyse plusieurs requêtes en regroupant jusqu'à LLM_BATCH_SIZE requêtes par appel.
+        Les appels s'exécutent en parallèle (au plus LLM_BATCH_CONCURRENCY à la fois pour un lot).
+        Retourne une analyse par requête, dans l'ordre.
+        """
+        if not queries:
+            return []
+        size = settings.LLM_BATCH_SIZE
+        chunks = [queries[i:i + size] for i in range(0, len(queries), size)]
+        batch_semaphore = asyncio.Semaphore(settings.LLM_BATCH_CONCURRENCY)
+
+        async def run(chunk: List[str]) -> List[Dict[str, Any]]:
+            async with batch_semaphore:
+                return await self._analyze_chunk(chunk)
+
+        results = await asyncio.gather(*(run(chunk) for chunk in chunks))
+        return [analysis for chunk in results for analysis in chunk]
+
+    async def _analyze_chunk(self, queries: List[str]) -> List[Dict[str, Any]]:
+        if len(queries) == 1:
+            return [await self.aanalyze_query(queries[0])]
+
+        analyses: List[Dict[str, Any]] = [{"tool": None} for _ in queries]
+        payload = json.dumps([{"index": i, "query": q} for i, q in enumerate(queries)], ensure_ascii=False)
+        try:
+            content = await self._complete(payload, batch=True)
+            items = json.loads(content).get("results", [])
+        except Exception as e:
+            print(f"Erreur LLM (lot de {len(queries)}): {e}")
+            return analyses
+
+        for item in items:
+            index = item.get("index") if isinstance(item, dict) else None
+            if isinstance(index, int) and 0 <= index < len(queries):
+                analyses[index] = {"tool": item.get("tool"), "parameters": item.get("parameters") or {}}
+        return analyses
+
+    def snapshot(self) -> Dict[str, Any]:
+        latencies = list(self._latencies)
+        latency = {}
+        if latencies:
+            latency = {
+                "avg": round(sum(latencies) / len(latencies), 1),
+                "p50": round(_percentile(latencies, 0.5), 1),
+                "p95": round(_percentile(latencies, 0.95), 1),
+                "max": round(max(latencies), 1),
+            }
+        usage = {}
+        for kind, counters in self.usage.items():
+            calls = counters["calls"]
+            usage[kind] = {
+                **counters,
+                "avg_prompt_tokens": round(counters["prompt_tokens"] / calls, 1) if calls else 0,
+                "avg_completion_tokens": round(counters["completion_tokens"] / calls, 1) if calls else 0,
+            }
+        return {
+            **self.stats,
+            "usage": usage,
+            "latency_ms": latency,
+            "system_prompt_chars": len(self.system_prompt()),
+            "breaker": self.breaker.snapshot()
+        }
+
 llm_service = LLMService()
@@ -0,0 +1,250 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from app.core.config import settings
+from app.services.normalization import parse_score
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    event_key TEXT PRIMARY KEY,
+    event_date TEXT NOT NULL,
+    league_key TEXT,
+    league_name TEXT,
+    home_team_key TEXT,
+    away_team_key TEXT,
+    home_team TEXT,
+    away_team TEXT,
+    home_score INTEGER,
+    away_score INTEGER,
+    status TEXT,
+    with_stats INTEGER NOT NULL DEFAULT 0,
+    raw TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_matches_date ON matches (event_date);
+CREATE INDEX IF NOT EXISTS idx_matches_home ON matches (home_team_key, event_date);
+CREATE INDEX IF NOT EXISTS idx_matches_away ON matches (away_team_key, event_date);
+CREATE INDEX IF NOT EXISTS idx_matches_league ON matches (league_key, event_date);
+CREATE TABLE IF NOT EXISTS coverage (
+    scope TEXT NOT NULL,
+    date_from TEXT NOT NULL,
+    date_to TEXT NOT NULL,
+    with_stats INTEGER NOT NULL DEFAULT 0,
+    expires_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_coverage_scope ON coverage (scope, date_from);
+"""
+
+
+class MatchStore:
+    """
+    Stockage local (SQLite) des matchs terminés, qui ne changent plus.
+    Chaque match est indexé par event_key, équipe, ligue et date; la table
+    `coverage` mémorise les périodes déjà téléchargées par périmètre
+    (équipe, ligue, équipe+ligue ou tout): seules les sous-périodes manquantes
+    sont ensuite demandées à l'API, le reste est lu sur le disque.
+    La couverture des jours récents est provisoire (`expires_at`): l'API peut
+    encore corriger un résultat, la période est donc revérifiée après
+    MATCH_STORE_RECHECK_TTL. Au-delà de MATCH_STORE_RECHECK_DAYS, elle est définitive.
+    La réponse brute de l'API est conservée pour rester compatible avec les outils.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        if path != ":memory:":
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(coverage)")}
+            if "expires_at" not in columns:
+                # Ancien schéma: couverture enregistrée sans marge ni revérification, elle est reconstruite
+                self._conn.execute("ALTER TABLE coverage ADD COLUMN expires_at REAL")
+                self._conn.execute("DELETE FROM coverage")
+        self.hits = 0
+        self.partial = 0
+        self.misses = 0
+
+    @staticmethod
+    def scope(team_id: Optional[str] = None, league_id: Optional[str] = None) -> str:
+        parts = []
+        if team_id:
+            parts.append(f"team:{team_id}")
+        if league_id:
+            parts.append(f"league:{league_id}")
+        return "|".join(parts) or "all"
+
+    @classmethod
+    def _covering_scopes(cls, team_id: Optional[str], league_id: Optional[str]) -> List[str]:
+        """Périmètres dont la couverture inclut la requête (ex: tous les matchs d'une équipe couvrent ceux de cette équipe dans une ligue)."""
+        scopes = [cls.scope(team_id, league_id)]
+        if team_id and league_id:
+            scopes += [cls.scope(team_id=team_id), cls.scope(league_id=league_id)]
+        if team_id or league_id:
+            scopes.append("all")
+        return scopes
+
+    @staticmethod
+    def stable_until(at: Optional[float] = None) -> date:
+        """Dernier jour (UTC) dont les résultats sont considérés définitifs à l'instant `at` (maintenant par défaut)."""
+        now = datetime.fromtimestamp(time.time() if at is None else at, timezone.utc)
+        return now.date() - timedelta(days=settings.MATCH_STORE_STABLE_MARGIN_DAYS)
+
+    def _intervals(self, scopes: List[str], date_from: date, date_to: date, with_stats: bool) -> List[Tuple[date, date]]:
+        query = (
+            f"SELECT date_from, date_to FROM coverage WHERE scope IN ({','.join('?' * len(scopes))}) "
+            "AND date_from <= ? AND date_to >= ? AND with_stats >= ? AND (expires_at IS NULL OR expires_at > ?) ORDER BY date_from"
+        )
+        with self._lock:
+            rows = self._conn.execute(
+                query, (*scopes, date_to.isoformat(), date_from.isoformat(), int(with_stats), time.time())
+            ).fetchall()
+        return [(date.fromisoformat(start), date.fromisoformat(end)) for start, end in rows]
+
+    def missing(self, team_id: Optional[str], league_id: Optional[str], date_from: date, date_to: date, with_stats: bool = False) -> List[Tuple[date, date]]:
+        """Sous-périodes de [date_from, date_to] qui ne sont pas encore couvertes."""
+        if date_from > date_to:
+            return []
+        gaps: List[Tuple[date, date]] = []
+        cursor = date_from
+        for start, end in self._intervals(self._covering_scopes(team_id, league_id), date_from, date_to, with_stats):
+            if start > cursor:
+                gaps.append((cursor, start - timedelta(days=1)))
+            cursor = max(cursor, end + timedelta(days=1))
+            if cursor > date_to:
+                break
+        if cursor <= date_to:
+            gaps.append((cursor, date_to))
+
+        if not gaps:
+            self.hits += 1
+        elif gaps == [(date_from, date_to)]:
+            self.misses += 1
+        else:
+            self.partial += 1
+        return gaps
+
+    def record_coverage(
+        self,
+        team_id: Optional[str],
+        league_id: Optional[str],
+        date_from: date,
+        date_to: date,
+        with_stats: bool = False,
+        fetched_at: Optional[float] = None,
+    ):
+        """
+        Ajoute une période téléchargée à l'instant `fetched_at` (maintenant par défaut),
+        fusionnée avec les périodes contiguës ou chevauchantes de même nature.
+        """
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        # Seuls les jours déjà définitifs au moment du téléchargement sont couverts
+        stable = self.stable_until(fetched_at)
+        date_to = min(date_to, stable)
+        if date_from > date_to:
+            return
+        scope = self.scope(team_id, league_id)
+        settled = stable - timedelta(days=settings.MATCH_STORE_RECHECK_DAYS)
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM coverage WHERE expires_at <= ?", (time.time(),))
+            if date_from <= settled:
+                self._merge(scope, date_from, min(date_to, settled), with_stats, None)
+            if date_to > settled:
+                expires_at = fetched_at + settings.MATCH_STORE_RECHECK_TTL
+                self._merge(scope, max(date_from, settled + timedelta(days=1)), date_to, with_stats, expires_at)
+
+    def _merge(self, scope: str, date_from: date, date_to: date, with_stats: bool, expires_at: Optional[float]):
+        """Fusionne un intervalle définitif (expires_at None) ou provisoire avec ceux de même nature."""
+        provisional = "IS NOT NULL" if expires_at is not None else "IS NULL"
+        rows = self._conn.execute(
+            "SELECT rowid, date_from, date_to, expires_at FROM coverage "
+            f"WHERE scope = ? AND with_stats = ? AND date_from <= ? AND date_to >= ? AND expires_at {provisional}",
+            (scope, int(with_stats), (date_to + timedelta(days=1)).isoformat(), (date_from - timedelta(days=1)).isoformat()),
+        ).fetchall()
+        for _, start, end, expires in rows:
+            date_from = min(date_from, date.fromisoformat(start))
+            date_to = max(date_to, date.fromisoformat(end))
+            if expires_at is not None:
+                # L'intervalle fusionné est revérifié dès que sa partie la plus ancienne doit l'être
+                expires_at = min(expires_at, expires)
+        self._conn.executemany("DELETE FROM coverage WHERE rowid = ?", [(row[0],) for row in rows])
+        self._conn.execute(
+            "INSERT INTO coverage (scope, date_from, date_to, with_stats, expires_at) VALUES (?, ?, ?, ?, ?)",
+            (scope, date_from.isoformat(), date_to.isoformat(), int(with_stats), expires_at),
+        )
+
+    def add(self, fixtures: Iterable[Dict[str, Any]], with_stats: bool = False) -> int:
+        """Enregistre les matchs terminés. Un match avec statistiques n'est pas écrasé par une version sans."""
+        rows = []
+        for m in fixtures:
+            if m.get("event_status") != "Finished" or not m.get("event_key") or not m.get("event_date"):
+                continue
+            home_score, away_score = parse_score(m.get("event_final_result")) or (None, None)
+            rows.append((
+                str(m["event_key"]), m["event_date"], str(m.get("league_key") or ""), m.get("league_name"),
+                str(m.get("home_team_key") or ""), str(m.get("away_team_key") or ""),
+                m.get("event_home_team"), m.get("event_away_team"), home_score, away_score,
+                m.get("event_status"), int(with_stats), json.dumps(m),
+            ))
+        if not rows:
+            return 0
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO matches (event_key, event_date, league_key, league_name, home_team_key, away_team_key,
+                                     home_team, away_team, home_score, away_score, status, with_stats, raw)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(event_key) DO UPDATE SET
+                    event_date = excluded.event_date, league_key = excluded.league_key, league_name = excluded.league_name,
+                    home_team_key = excluded.home_team_key, away_team_key = excluded.away_team_key,
+                    home_team = excluded.home_team, away_team = excluded.away_team,
+                    home_score = excluded.home_score, away_score = excluded.away_score,
+                    status = excluded.status, with_stats = excluded.with_stats, raw = excluded.raw
+                WHERE excluded.with_stats >= matches.with_stats
+                """,
+                rows,
+            )
+        return len(rows)
+
+    def matches(self, team_id: Optional[str], league_id: Optional[str], date_from: date, date_to: date) -> List[Dict[str, Any]]:
+        """Matchs terminés du périmètre, par date croissante (format brut de l'API)."""
+        query = "SELECT raw FROM matches WHERE event_date BETWEEN ? AND ?"
+        args: List[Any] = [date_from.isoformat(), date_to.isoformat()]
+        if team_id:
+            query += " AND (home_team_key = ? OR away_team_key = ?)"
+            args += [str(team_id), str(team_id)]
+        if league_id:
+            query += " AND league_key = ?"
+            args.append(str(league_id))
+        query += " ORDER BY event_date, event_key"
+        with self._lock:
+            rows = self._conn.execute(query, args).fetchall()
+        return [json.loads(raw) for (raw,) in rows]
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM matches")
+            self._conn.execute("DELETE FROM coverage")
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            matches = self._conn.execute("SELECT COUNT(*) FROM matches").fetchone()[0]
+            intervals = self._conn.execute("SELECT COUNT(*) FROM coverage").fetchone()[0]
+        total = self.hits + self.partial + self.misses
+        return {
+            "matches": matches,
+            "coverage_intervals": intervals,
+            "hits": self.hits,
+            "partial": self.partial,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+def create_match_store() -> Optional[MatchStore]:
+    return MatchStore(settings.data_path(settings.MATCH_STORE_PATH)) if settings.MATCH_STORE_PATH else None
@@ -0,0 +1,91 @@
+import hashlib
+import json
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+from app.core.config import settings
+from app.services.cache import CacheStats, TTLCache
+from app.tools.base import BaseTool
+
+_MISSING = object()
+
+# Erreurs upstream absorbées par les clients (valeur vide de repli) pendant le nœud en cours
+_upstream_failures: ContextVar[Optional[List[str]]] = ContextVar("node_upstream_failures", default=None)
+
+
+def record_upstream_failure(error: Exception):
+    """
+    Signale qu'un appel upstream a échoué et qu'une valeur vide a été retournée
+    à la place: le résultat du nœud en cours ne doit pas être mémorisé.
+    """
+    failures = _upstream_failures.get()
+    if failures is not None:
+        failures.append(f"{type(error).__name__}: {error}")
+
+
+@contextmanager
+def track_upstream_failures() -> Iterator[List[str]]:
+    """Collecte les échecs signalés dans le bloc (y compris sous-tâches et threads lancés avec le contexte)."""
+    failures: List[str] = []
+    token = _upstream_failures.set(failures)
+    try:
+        yield failures
+    finally:
+        _upstream_failures.reset(token)
+
+
+class NodeCache:
+    """
+    Mémorisation des résultats de nœuds: clé = hachage stable de
+    (outil, paramètres du nœud, versions des sorties amont). Chaque résultat
+    mémorisé reçoit une version unique: un nœud amont recalculé (TTL expiré,
+    rafraîchissement) change la clé de ses nœuds aval, qui ne peuvent donc pas
+    resservir un résultat construit sur une ancienne sortie. La durée de vie est déclarée par l'outil
+    (`cache_ttl`); les outils sans TTL, les résultats en erreur et ceux
+    construits sur un échec upstream absorbé ne sont pas mémorisés. Les résultats retournés sont partagés: ne pas les modifier.
+    """
+    def __init__(self, max_size: Optional[int] = None):
+        self.memory = TTLCache(max_size=max_size or settings.NODE_CACHE_MAX_SIZE)
+        self.stats = CacheStats()
+
+    @staticmethod
+    def key(tool: BaseTool, params: Mapping[str, Any], upstream: List[Tuple[Optional[str], Optional[Dict[str, str]]]]) -> Optional[str]:
+        """
+        Clé stable: outil, paramètres propres du nœud et identité de chaque entrée
+        amont (version de la sortie du prédécesseur, mapping de l'arête), dans l'ordre
+        des arêtes. Les sorties amont ne sont ni copiées ni sérialisées. None si un
+        prédécesseur n'a pas de version (résultat non mémorisable) ou si les paramètres
+        ne sont pas du JSON.
+        """
+        if any(version is None for version, _ in upstream):
+            return None
+        try:
+            canonical = json.dumps(
+                {"tool": tool.name, "params": dict(params), "upstream": [[version, mapping] for version, mapping in upstream]},
+                sort_keys=True, separators=(",", ":"), ensure_ascii=False
+            )
+        except (TypeError, ValueError):
+            return None
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def get(self, tool: BaseTool, key: str) -> Optional[Tuple[Any, str]]:
+        """(résultat, version) mémorisé, ou None."""
+        entry = self.memory.get(key, _MISSING)
+        hit = entry is not _MISSING
+        self.stats.record(tool.name, hit=hit)
+        return entry if hit else None
+
+    def set(self, tool: BaseTool, key: str, output: Dict[str, Any]) -> Optional[str]:
+        """Mémorise le résultat et retourne sa version; None s'il est en erreur (non mémorisé)."""
+        if isinstance(output, dict) and "error" in output:
+            return None
+        version = uuid.uuid4().hex
+        self.memory.set(key, (output, version), ttl=tool.cache_ttl)
+        return version
+
+    def clear(self):
+        self.memory.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"size": len(self.memory), **self.stats.snapshot()}
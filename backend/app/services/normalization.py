@@ -0,0 +1,44 @@
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalise un libellé pour les recherches: minuscules, sans accents,
+    ponctuation remplacée par des espaces, espaces fusionnés.
+    ex: "  Ligue 1 - Uber Eats " -> "ligue 1 uber eats"
+    """
+    if not text:
+        return ""
+    folded = unicodedata.normalize("NFKD", text)
+    folded = "".join(c for c in folded if not unicodedata.combining(c))
+    return _NON_ALNUM.sub(" ", folded.lower()).strip()
+
+
+def tokenize(text: str) -> List[str]:
+    """Découpe un texte normalisé en mots."""
+    return normalize_text(text).split()
+
+
+@lru_cache(maxsize=1024)
+def _parse_score_str(final_result: str) -> Optional[Tuple[int, int]]:
+    parts = final_result.split(" - ")
+    if len(parts) != 2:
+        return None
+    try:
+        return int(parts[0]), int(parts[1])
+    except ValueError:
+        return None
+
+
+def parse_score(final_result: Any) -> Optional[Tuple[int, int]]:
+    """
+    Score final AllSportsAPI: "2 - 1" -> (2, 1); None si absent ou illisible.
+    Mis en cache par valeur (un même score revient sur des centaines de matchs);
+    seules les chaînes y entrent.
+    """
+    return _parse_score_str(final_result) if isinstance(final_result, str) else None
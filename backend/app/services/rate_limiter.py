@@ -0,0 +1,259 @@
+import asyncio
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date
+from enum import IntEnum
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+from app.core.config import settings
+
+
+class Priority(IntEnum):
+    """Classes de priorité des appels upstream (la plus petite valeur passe en premier)."""
+    INTERACTIVE = 0
+    PREFETCH = 1
+    BACKFILL = 2
+
+
+# Priorité des appels effectués dans le contexte courant (tâche asyncio ou thread)
+current_priority: ContextVar[Priority] = ContextVar("upstream_priority", default=Priority.INTERACTIVE)
+
+
+@contextmanager
+def upstream_priority(priority: Priority) -> Iterator[None]:
+    """Exécute les appels upstream du bloc avec la priorité donnée (ex: tâches de fond)."""
+    token = current_priority.set(priority)
+    try:
+        yield
+    finally:
+        current_priority.reset(token)
+
+
+class SharedPriority:
+    """
+    Priorité d'un appel partagé (single-flight): celle du demandeur le plus
+    prioritaire parmi ceux qui l'attendent. Un appel interactif qui rejoint un
+    préchauffage en attente de jetons le fait passer en classe interactive.
+    """
+    __slots__ = ("value",)
+
+    def __init__(self, priority: Priority):
+        self.value = priority
+
+    def raise_to(self, priority: Priority):
+        if priority < self.value:
+            self.value = priority
+
+
+# Appel partagé en cours d'exécution dans le contexte courant (None hors single-flight)
+_shared_priority: ContextVar[Optional[SharedPriority]] = ContextVar("shared_upstream_priority", default=None)
+
+
+@contextmanager
+def shared_priority(shared: SharedPriority) -> Iterator[None]:
+    token = _shared_priority.set(shared)
+    try:
+        yield
+    finally:
+        _shared_priority.reset(token)
+
+
+def effective_priority() -> Priority:
+    """Priorité des appels du contexte courant, rehaussée par les demandeurs d'un appel partagé."""
+    priority = current_priority.get()
+    shared = _shared_priority.get()
+    return min(priority, shared.value) if shared is not None else priority
+
+
+class RateLimitExceeded(RuntimeError):
+    """Pas de jeton disponible avant l'échéance, ou quota journalier épuisé."""
+
+
+class RateLimiter:
+    """
+    Seau à jetons partagé devant l'API upstream.
+    Chaque appel consomme un coût (selon l'endpoint `met`). Les classes moins
+    prioritaires ne puisent que dans la part du seau au-delà de leur réserve
+    et cèdent la place dès qu'un appel plus prioritaire attend: le travail de
+    fond n'utilise que le quota disponible. Un appel qui ne peut être servi
+    avant son échéance lève RateLimitExceeded. Un quota journalier optionnel
+    s'ajoute au débit. Sans priorité explicite, celle d'un appel en attente
+    suit `effective_priority()`: il est reclassé si un demandeur plus
+    prioritaire le rejoint, avec l'échéance de sa nouvelle classe.
+    """
+    # Pause maximale entre deux tentatives (un appel prioritaire peut libérer la place)
+    _MAX_WAIT = 0.25
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        daily_quota: Optional[int] = None,
+        costs: Optional[Dict[str, float]] = None,
+        reserves: Optional[Dict[str, float]] = None,
+        deadlines: Optional[Dict[str, float]] = None,
+    ):
+        self.rate = settings.ALL_SPORTS_RATE_LIMIT if rate is None else rate
+        self.burst = settings.ALL_SPORTS_RATE_BURST if burst is None else burst
+        self.daily_quota = settings.ALL_SPORTS_DAILY_QUOTA if daily_quota is None else daily_quota
+        self.costs = dict(settings.ALL_SPORTS_MET_COSTS if costs is None else costs)
+        self.reserves = dict(settings.ALL_SPORTS_PRIORITY_RESERVES if reserves is None else reserves)
+        self.deadlines = dict(settings.ALL_SPORTS_PRIORITY_DEADLINES if deadlines is None else deadlines)
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._day = date.today()
+        self.daily_used = 0.0
+        # Appels en attente: (priorité, ordre d'arrivée). Seul le premier peut prendre des jetons.
+        self._queue: Set[Tuple[Priority, int]] = set()
+        self._sequence = itertools.count()
+        self.stats = {
+            priority: {"granted": 0, "rejected": 0, "waited": 0, "wait_ms": 0.0}
+            for priority in Priority
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def cost(self, met: str) -> float:
+        return self.costs.get(met, 1.0)
+
+    def deadline(self, priority: Priority) -> float:
+        return self.deadlines.get(priority.name.lower(), 30.0)
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        today = date.today()
+        if today != self._day:
+            self._day = today
+            self.daily_used = 0.0
+
+    def _try_take(self, cost: float, ticket: Tuple[Priority, int]) -> float:
+        """Prend les jetons si possible (retourne 0), sinon le délai d'attente estimé."""
+        priority = ticket[0]
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self.daily_quota and self.daily_used + cost > self.daily_quota:
+                raise RateLimitExceeded("Quota journalier AllSportsAPI épuisé")
+            if not self.enabled:
+                self.daily_used += cost
+                return 0.0
+            if min(self._queue) != ticket:
+                # Un appel plus prioritaire, ou arrivé avant dans la même classe, passe d'abord
+                return min(self._MAX_WAIT, cost / self.rate)
+            needed = min(self.burst, cost + self.burst * self.reserves.get(priority.name.lower(), 0.0))
+            if self._tokens >= needed:
+                self._tokens -= cost
+                self.daily_used += cost
+                return 0.0
+            return min(self._MAX_WAIT, (needed - self._tokens) / self.rate)
+
+    def _start(self, priority: Priority) -> Tuple[Priority, int]:
+        with self._lock:
+            ticket = (priority, next(self._sequence))
+            self._queue.add(ticket)
+            return ticket
+
+    def _finish(self, ticket: Tuple[Priority, int], started: float, granted: bool):
+        with self._lock:
+            self._queue.discard(ticket)
+            stats = self.stats[ticket[0]]
+            stats["granted" if granted else "rejected"] += 1
+            waited = (time.monotonic() - started) * 1000
+            if waited >= 1:
+                stats["waited"] += 1
+                stats["wait_ms"] += waited
+
+    def _promote(self, ticket: Tuple[Priority, int], since: float, deadline: float, fixed_deadline: Optional[float]) -> Tuple[Tuple[Priority, int], float, float]:
+        """Reclasse un appel en attente rehaussé entre-temps: (ticket, début de l'échéance, échéance)."""
+        priority = effective_priority()
+        if priority >= ticket[0]:
+            return ticket, since, deadline
+        with self._lock:
+            self._queue.discard(ticket)
+            # Même ordre d'arrivée: il passe devant les appels arrivés après lui dans sa nouvelle classe
+            ticket = (priority, ticket[1])
+            self._queue.add(ticket)
+        # L'échéance de la nouvelle classe court depuis le rehaussement
+        return ticket, time.monotonic(), self.deadline(priority) if fixed_deadline is None else fixed_deadline
+
+    def _timeout(self, priority: Priority, started: float, deadline: float) -> float:
+        remaining = deadline - (time.monotonic() - started)
+        if remaining <= 0:
+            raise RateLimitExceeded(f"Limite de débit AllSportsAPI: aucun jeton disponible ({priority.name.lower()})")
+        return remaining
+
+    def acquire(self, met: str, priority: Optional[Priority] = None, deadline: Optional[float] = None):
+        """Version bloquante (threads)."""
+        dynamic = priority is None
+        priority = effective_priority() if dynamic else priority
+        fixed_deadline = deadline
+        deadline = self.deadline(priority) if deadline is None else deadline
+        cost = self.cost(met)
+        started = since = time.monotonic()
+        ticket = self._start(priority)
+        granted = False
+        try:
+            while True:
+                if dynamic:
+                    ticket, since, deadline = self._promote(ticket, since, deadline, fixed_deadline)
+                wait = self._try_take(cost, ticket)
+                if not wait:
+                    granted = True
+                    return
+                time.sleep(min(wait, self._timeout(ticket[0], since, deadline)))
+        finally:
+            self._finish(ticket, started, granted)
+
+    async def aacquire(self, met: str, priority: Optional[Priority] = None, deadline: Optional[float] = None):
+        dynamic = priority is None
+        priority = effective_priority() if dynamic else priority
+        fixed_deadline = deadline
+        deadline = self.deadline(priority) if deadline is None else deadline
+        cost = self.cost(met)
+        started = since = time.monotonic()
+        ticket = self._start(priority)
+        granted = False
+        try:
+            while True:
+                if dynamic:
+                    ticket, since, deadline = self._promote(ticket, since, deadline, fixed_deadline)
+                wait = self._try_take(cost, ticket)
+                if not wait:
+                    granted = True
+                    return
+                await asyncio.sleep(min(wait, self._timeout(ticket[0], since, deadline)))
+        finally:
+            self._finish(ticket, started, granted)
+
+    def drain(self):
+        """L'upstream a répondu 429: on vide le seau pour ralentir tout le monde."""
+        with self._lock:
+            self._tokens = 0.0
+            self._updated = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refill(time.monotonic())
+            classes = {
+                priority.name.lower(): {
+                    **{k: v for k, v in stats.items() if k != "wait_ms"},
+                    "waiting": sum(1 for p, _ in self._queue if p == priority),
+                    "avg_wait_ms": round(stats["wait_ms"] / stats["waited"], 1) if stats["waited"] else 0.0,
+                }
+                for priority, stats in self.stats.items()
+            }
+            return {
+                "rate_per_second": self.rate,
+                "burst": self.burst,
+                "tokens_available": round(self._tokens, 2),
+                "daily_quota": self.daily_quota or None,
+                "daily_used": self.daily_used,
+                "daily_remaining": max(0.0, self.daily_quota - self.daily_used) if self.daily_quota else None,
+                "by_priority": classes,
+            }
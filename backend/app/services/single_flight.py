@@ -0,0 +1,96 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+from app.services.rate_limiter import SharedPriority, effective_priority, shared_priority
+
+T = TypeVar("T")
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.priority = SharedPriority(effective_priority())
+
+
+class SingleFlight:
+    """
+    Déduplication des appels concurrents identiques ("single-flight").
+    Pendant qu'un appel pour une clé est en cours, les demandes suivantes
+    pour la même clé attendent son résultat au lieu d'en lancer un nouveau.
+    L'appel partagé s'exécute avec la priorité upstream du demandeur le plus
+    prioritaire (un appel interactif n'attend pas derrière un préchauffage).
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._tasks: Dict[Hashable, Tuple[asyncio.Task, SharedPriority]] = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Version bloquante (threads)."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+            else:
+                call.priority.raise_to(effective_priority())
+                self.followers += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            with shared_priority(call.priority):
+                call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Version asynchrone: les appelants partagent une même tâche."""
+        loop = asyncio.get_running_loop()
+        task, priority = self._tasks.get(key, (None, None))
+        if task is None or task.done() or task.get_loop() is not loop:
+            priority = SharedPriority(effective_priority())
+            task = loop.create_task(self._run_shared(fn, priority))
+            self._tasks[key] = (task, priority)
+            self.leaders += 1
+            task.add_done_callback(lambda t: self._forget(key, t))
+        else:
+            priority.raise_to(effective_priority())
+            self.followers += 1
+        # shield: l'annulation d'un appelant n'annule pas l'appel partagé
+        return await asyncio.shield(task)
+
+    @staticmethod
+    async def _run_shared(fn: Callable[[], Awaitable[T]], priority: SharedPriority) -> T:
+        # Défini dans le contexte propre à la tâche: visible du limiteur, pas des appelants
+        with shared_priority(priority):
+            return await fn()
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._tasks.get(key, (None,))[0] is task:
+            del self._tasks[key]
+        if not task.cancelled():
+            # Évite l'avertissement "exception never retrieved" si tous les appelants sont partis
+            task.exception()
+
+    def snapshot(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self._calls) + len(self._tasks),
+            "leaders": self.leaders,
+            "deduplicated": self.followers,
+        }
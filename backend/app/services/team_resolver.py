@@ -0,0 +1,76 @@
+from typing import TYPE_CHECKING, Dict, Optional, Set
+from app.core.config import settings
+from app.services.cache import TTLCache
+from app.services.normalization import normalize_text
+
+if TYPE_CHECKING:
+    from app.services.api_clients.all_sports_client import AllSportsClient
+
+# Surnoms courants -> nom attendu par l'endpoint Teams
+DEFAULT_TEAM_ALIASES: Dict[str, str] = {
+    "psg": "Paris Saint-Germain",
+    "paris sg": "Paris Saint-Germain",
+    "om": "Marseille",
+    "ol": "Lyon",
+    "man utd": "Manchester United",
+    "man united": "Manchester United",
+    "man city": "Manchester City",
+    "spurs": "Tottenham",
+    "barca": "Barcelona",
+    "atletico": "Atletico Madrid",
+    "bayern": "Bayern Munich",
+    "bvb": "Borussia Dortmund",
+    "juve": "Juventus",
+}
+
+_MISSING = object()
+
+
+class TeamResolver:
+    """
+    Résolution nom d'équipe -> team_key avec cache LRU/TTL partagé.
+    Les échecs de résolution sont aussi mis en cache (TTL plus court) pour
+    ne pas réinterroger l'API à chaque requête sur une équipe inconnue.
+    """
+    def __init__(self, client: "AllSportsClient", aliases: Optional[Dict[str, str]] = None):
+        self.client = client
+        self.cache = TTLCache(max_size=settings.TEAM_CACHE_MAX_SIZE, ttl=settings.TEAM_CACHE_TTL)
+        self.negative_ttl = settings.TEAM_CACHE_NEGATIVE_TTL
+        self.aliases: Dict[str, str] = {}
+        for alias, name in {**DEFAULT_TEAM_ALIASES, **settings.TEAM_ALIASES, **(aliases or {})}.items():
+            self.add_alias(alias, name)
+
+    def add_alias(self, alias: str, team_name: str):
+        self.aliases[normalize_text(alias)] = team_name
+
+    def known_names(self) -> Set[str]:
+        """Noms normalisés connus sans appel réseau (surnoms, noms complets, équipes déjà résolues)."""
+        names = set(self.aliases)
+        names.update(normalize_text(name) for name in self.aliases.values())
+        names.update(key for key, team_id in self.cache.items() if team_id)
+        return names
+
+    def canonical_name(self, team_name: str) -> str:
+        """Remplace un surnom connu par le nom complet de l'équipe."""
+        return self.aliases.get(normalize_text(team_name), team_name)
+
+    def _store(self, key: str, team_id: Optional[str]) -> Optional[str]:
+        self.cache.set(key, team_id, ttl=None if team_id else self.negative_ttl)
+        return team_id
+
+    def resolve(self, team_name: str) -> Optional[str]:
+        name = self.canonical_name(team_name)
+        key = normalize_text(name)
+        cached = self.cache.get(key, _MISSING)
+        if cached is not _MISSING:
+            return cached
+        # Les erreurs réseau remontent et ne sont pas mises en cache
+        return self._store(key, self.client._fetch_team_id(name))
+
+    async def aresolve(self, team_name: str) -> Optional[str]:
+        name = self.canonical_name(team_name)
+        key = normalize_text(name)
+        cached = self.cache.get(key, _MISSING)
+        if cached is not _MISSING:
+            return cached
+        return self._store(key, await self.client._afetch_team_id(name))
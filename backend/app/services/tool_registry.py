@@ -9,35 +9,65 @@ from app.tools.topscorers_tool import TopScorersTool
 from app.tools.team_info_tool import TeamInfoTool
 from app.tools.videos_tool import VideosTool
 from app.models.tool import ToolInfo
+from app.services.api_clients.all_sports_client import AllSportsClient, all_sports_client
+
+class ClientProvider:
+    """
+    Fournit les clients d'API partagés par les outils.
+    Un seul AllSportsClient (pool de connexions, caches, quotas) est remis à
+    chaque outil. Les tests peuvent injecter un client pointant vers un faux upstream.
+    """
+    def __init__(self, all_sports: Optional[AllSportsClient] = None):
+        self.all_sports = all_sports or all_sports_client
+
+    async def startup(self):
+        await self.all_sports.startup()
+
+    async def shutdown(self):
+        await self.all_sports.aclose()
 
 class ToolRegistry:
-    def __init__(self):
+    def __init__(self, client_provider: Optional[ClientProvider] = None):
         self._tools: Dict[str, BaseTool] = {}
+        # Incrémenté à chaque enregistrement: invalide les prompts construits à partir du registre
+        self.version = 0
+        self.client_provider = client_provider or ClientProvider()
         self._register_default_tools()
 
     def _register_default_tools(self):
+        client = self.client_provider.all_sports
         self.register_tool(NewsTool())
         self.register_tool(TransfersTool())
         self.register_tool(PerformanceTool())
-        self.register_tool(MatchInfoTool())
-        self.register_tool(StandingsTool())
-        self.register_tool(TopScorersTool())
-        self.register_tool(TeamInfoTool())
-        self.register_tool(VideosTool())
+        self.register_tool(MatchInfoTool(client))
+        self.register_tool(StandingsTool(client))
+        self.register_tool(TopScorersTool(client))
+        self.register_tool(TeamInfoTool(client))
+        self.register_tool(VideosTool(client))
+
+    def use_client_provider(self, client_provider: ClientProvider):
+        """Remplace le fournisseur de clients et ré-enregistre les outils par défaut."""
+        self.client_provider = client_provider
+        self._register_default_tools()
 
     def register_tool(self, tool: BaseTool):
         self._tools[tool.name] = tool
+        self.version += 1
 
     def get_tool(self, tool_name: str) -> Optional[BaseTool]:
         return self._tools.get(tool_name)
 
+    def tools(self) -> List[BaseTool]:
+        return list(self._tools.values())
+
     def list_tools(self) -> List[ToolInfo]:
         return [
             ToolInfo(
                 id=tool.name,
                 name=tool.name,
                 description=tool.description,
-                supported_sports=tool.supported_sports
+                supported_sports=tool.supported_sports,
+                parameters=tool.parameters
             )
             for tool in self._tools.values()
         ]
@@ -1,49 +1,190 @@
-from typing import Dict, Any, List
-from app.models.workflow import Workflow
+import asyncio
+import contextvars
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from collections import ChainMap
+from types import MappingProxyType
+from typing import AsyncIterator, Dict, Any, List, Mapping, Optional, Tuple
+from app.core.config import settings
+from app.models.workflow import Workflow, WorkflowEdge, WorkflowNode
+from app.services.node_cache import NodeCache, track_upstream_failures
 from app.services.tool_registry import tool_registry
+from app.tools.base import BaseTool
 
 class WorkflowExecutor:
-    async def execute(self, workflow: Workflow) -> Dict[str, Any]:
+    def __init__(self, max_concurrency: Optional[int] = None, thread_pool_size: Optional[int] = None):
+        self.max_concurrency = max_concurrency or settings.WORKFLOW_MAX_CONCURRENCY
+        self.thread_pool_size = thread_pool_size or settings.TOOL_THREAD_POOL_SIZE
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self.node_cache = NodeCache()
+
+    def _get_thread_pool(self) -> ThreadPoolExecutor:
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(max_workers=self.thread_pool_size, thread_name_prefix="tool")
+        return self._thread_pool
+
+    def shutdown(self):
+        """Libère le pool de threads des outils synchrones (arrêt de l'application)."""
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=False, cancel_futures=True)
+            self._thread_pool = None
+
+    async def _call_tool(self, tool: BaseTool, tool_input: Mapping[str, Any]) -> Dict[str, Any]:
+        # Outils async: attendus directement; outils sync: déportés dans un pool borné
+        if tool.is_async:
+            return await tool.arun(tool_input)
+        loop = asyncio.get_running_loop()
+        # Le contexte suit l'appel dans le thread (suivi des échecs upstream, priorité)
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(self._get_thread_pool(), functools.partial(context.run, tool.run, tool_input))
+
+    @staticmethod
+    def _build_dag(workflow: Workflow) -> Tuple[Dict[str, List[WorkflowEdge]], List[str]]:
         """
-        Exécute le workflow et retourne les résultats.
+        Construit le graphe à partir des arêtes et retourne (arêtes entrantes, ordre topologique).
+        Lève ValueError si une arête référence un nœud inconnu ou si le graphe contient un cycle.
+        """
+        upstream: Dict[str, List[WorkflowEdge]] = {node.id: [] for node in workflow.nodes}
+        downstream: Dict[str, List[str]] = {node.id: [] for node in workflow.nodes}
+        for edge in workflow.edges:
+            if edge.source not in upstream or edge.target not in upstream:
+                raise ValueError(f"Arête {edge.id}: nœud inconnu ({edge.source} -> {edge.target})")
+            upstream[edge.target].append(edge)
+            downstream[edge.source].append(edge.target)
+
+        # Tri topologique (Kahn), stable par rapport à l'ordre des nodes
+        in_degree = {node_id: len(edges) for node_id, edges in upstream.items()}
+        ready = [node.id for node in workflow.nodes if in_degree[node.id] == 0]
+        order: List[str] = []
+        while ready:
+            node_id = ready.pop(0)
+            order.append(node_id)
+            for target in downstream[node_id]:
+                in_degree[target] -= 1
+                if in_degree[target] == 0:
+                    ready.append(target)
+
+        if len(order) < len(upstream):
+            cyclic = [node_id for node_id, degree in in_degree.items() if degree > 0]
+            raise ValueError(f"Le workflow contient un cycle entre les nœuds: {', '.join(cyclic)}")
+        return upstream, order
+
+    @staticmethod
+    def _edge_view(output: Any, edge: WorkflowEdge) -> Mapping[str, Any]:
         """
-        results = {}
-        context = {} # Pour passer des données entre les étapes si besoin
-        
-        # Ordonnancement simple: on suit la liste des nodes (supposée ordonnée pour l'instant)
-        # Idéalement, on ferait un tri topologique
-        
-        execution_log = []
-
-        for node in workflow.nodes:
-            tool = tool_registry.get_tool(node.tool_id)
-            if tool:
-                # Exécution de l'outil
-                # On pourrait passer le contexte ou le résultat du node précédent ici
-                # Fusionner les paramètres du nœud avec le contexte
-                # Les paramètres du nœud (extraits par LLM) sont prioritaires pour ce nœud
-                tool_input = context.copy()
-                tool_input.update(node.data)
-                
-                tool_output = tool.run(tool_input)
-                
-                results[node.id] = tool_output
-                execution_log.append({
+        Ce qu'une arête transmet au nœud cible: toute la sortie du prédécesseur,
+        ou seulement les champs listés dans `edge.mapping` (sortie -> entrée).
+        """
+        if not isinstance(output, Mapping):
+            return {}
+        if edge.mapping is None:
+            return output
+        return {target: output[source] for source, target in edge.mapping.items() if source in output}
+
+    async def _run_node(self, node: WorkflowNode, dependencies: List["asyncio.Task"], edges: List[WorkflowEdge], semaphore: asyncio.Semaphore, use_cache: bool, versions: Dict[str, Optional[str]]) -> Dict[str, Any]:
+        upstream_entries = await asyncio.gather(*dependencies)
+
+        tool = tool_registry.get_tool(node.tool_id)
+        if not tool:
+            return {
+                "node_id": node.id,
+                "tool": node.tool_id,
+                "status": "error",
+                "message": "Tool not found"
+            }
+
+        failed = [entry["node_id"] for entry in upstream_entries if entry["status"] != "success"]
+        if failed:
+            return {
+                "node_id": node.id,
+                "tool": tool.name,
+                "status": "skipped",
+                "message": f"Dépendance en échec: {', '.join(failed)}"
+            }
+
+        # Seules les sorties des nœuds reliés par une arête sont transmises, via des
+        # vues en lecture seule (aucune copie). Les paramètres du nœud (extraits par
+        # LLM) sont prioritaires, puis les prédécesseurs du dernier au premier.
+        views = [self._edge_view(entry["output"], edge) for entry, edge in zip(upstream_entries, edges)]
+        tool_input: Mapping[str, Any] = MappingProxyType(ChainMap(node.data, *reversed(views)))
+
+        # Mémorisation: même outil, mêmes paramètres et mêmes sorties amont (identifiées par
+        # leur version mémorisée) qu'une exécution récente -> résultat réutilisé.
+        # Sans use_cache, le nœud est recalculé et le résultat mémorisé est rafraîchi.
+        cache_key = None
+        if tool.cache_ttl is not None:
+            cache_key = self.node_cache.key(tool, node.data, [(versions.get(edge.source), edge.mapping) for edge in edges])
+        if cache_key is not None and use_cache:
+            entry = self.node_cache.get(tool, cache_key)
+            if entry is not None:
+                cached, versions[node.id] = entry
+                return {
                     "node_id": node.id,
                     "tool": tool.name,
                     "status": "success",
-                    "output": tool_output
-                })
-                
-                # Mise à jour du contexte global avec la sortie
-                context.update(tool_output)
-            else:
-                execution_log.append({
+                    "output": cached,
+                    "duration_ms": 0.0,
+                    "cached": True
+                }
+
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                with track_upstream_failures() as failures:
+                    tool_output = await self._call_tool(tool, tool_input)
+            except Exception as e:
+                return {
                     "node_id": node.id,
-                    "tool": node.tool_id,
+                    "tool": tool.name,
                     "status": "error",
-                    "message": "Tool not found"
-                })
+                    "message": str(e)
+                }
+            duration_ms = round((time.perf_counter() - started) * 1000, 1)
+
+        # Résultat construit sur une réponse de repli (upstream en échec): non mémorisé
+        if cache_key is not None and not failures:
+            # Identité de cette sortie pour les nœuds en aval (None si non mémorisée)
+            versions[node.id] = self.node_cache.set(tool, cache_key, tool_output)
+        return {
+            "node_id": node.id,
+            "tool": tool.name,
+            "status": "success",
+            "output": tool_output,
+            "duration_ms": duration_ms,
+            "cached": False
+        }
+
+    def _schedule(self, workflow: Workflow, use_cache: bool) -> Dict[str, "asyncio.Task"]:
+        nodes = {node.id: node for node in workflow.nodes}
+        upstream, order = self._build_dag(workflow)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        # Version mémorisée de la sortie de chaque nœud terminé (absente si elle n'est pas mémorisée)
+        versions: Dict[str, Optional[str]] = {}
+
+        # Créées dans l'ordre topologique: les tâches des prédécesseurs existent déjà
+        tasks: Dict[str, asyncio.Task] = {}
+        for node_id in order:
+            edges = upstream[node_id]
+            dependencies = [tasks[edge.source] for edge in edges]
+            tasks[node_id] = asyncio.create_task(self._run_node(nodes[node_id], dependencies, edges, semaphore, use_cache, versions))
+        return tasks
+
+    async def execute(self, workflow: Workflow, use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Exécute le workflow et retourne les résultats.
+        Les nœuds indépendants s'exécutent en parallèle (dans la limite de
+        max_concurrency); un nœud démarre dès que ses prédécesseurs ont terminé.
+        Les nœuds dont l'entrée n'a pas changé réutilisent leur résultat mémorisé
+        (sauf use_cache=False).
+        """
+        tasks = self._schedule(workflow, use_cache)
+        execution_log = await asyncio.gather(*tasks.values())
+        results = {
+            entry["node_id"]: entry["output"]
+            for entry in execution_log
+            if entry["status"] == "success"
+        }
 
         return {
             "workflow_id": workflow.id,
@@ -51,4 +192,30 @@ class WorkflowExecutor:
             "execution_log": execution_log
         }
 
+    def execute_stream(self, workflow: Workflow, use_cache: bool = True) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Exécute le workflow en émettant un événement par nœud dès qu'il se termine.
+        Le graphe est validé immédiatement (ValueError avant le premier événement).
+        """
+        self._build_dag(workflow)
+        return self._stream(workflow, use_cache)
+
+    async def _stream(self, workflow: Workflow, use_cache: bool) -> AsyncIterator[Dict[str, Any]]:
+        started = time.perf_counter()
+        tasks = self._schedule(workflow, use_cache)
+        yield {"event": "start", "workflow_id": workflow.id, "nodes": list(tasks)}
+        try:
+            for next_done in asyncio.as_completed(tasks.values()):
+                entry = await next_done
+                yield {"event": "node", **entry}
+        finally:
+            # Client déconnecté: on n'exécute pas les nœuds restants pour rien
+            for task in tasks.values():
+                task.cancel()
+        yield {
+            "event": "end",
+            "workflow_id": workflow.id,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1)
+        }
+
 workflow_executor = WorkflowExecutor()
@@ -1,21 +1,97 @@
+import asyncio
+import copy
 import uuid
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
+from app.core.config import settings
 from app.models.workflow import Workflow, WorkflowNode, WorkflowEdge
 from app.services.tool_registry import tool_registry
 from app.services.llm_service import llm_service
+from app.services.intent_cache import intent_cache
+from app.services.intent_parser import ParseResult, intent_parser
 
 class WorkflowGenerator:
-    def generate(self, sport: str, query: str) -> Workflow:
+    def _resolve_locally(self, sport: str, query: str) -> Tuple[Optional[Dict[str, Any]], Optional[ParseResult]]:
+        """Analyse sans LLM: cache, puis règles locales si elles sont assez sûres."""
+        analysis = intent_cache.get(sport, query)
+        if analysis is not None:
+            return analysis, None
+
+        parsed = intent_parser.parse(query, sport)
+        if parsed.confidence >= settings.INTENT_PARSER_MIN_CONFIDENCE:
+            intent_cache.set(sport, query, parsed.analysis)
+            return parsed.analysis, parsed
+        return None, parsed
+
+    def _merge_llm(self, sport: str, query: str, parsed: Optional[ParseResult], analysis: Dict[str, Any]) -> Dict[str, Any]:
+        if not analysis.get("tool") and parsed and parsed.analysis:
+            # LLM indisponible ou sans réponse: meilleure supposition locale (non mise en cache)
+            return parsed.analysis
+        intent_cache.set(sport, query, analysis)
+        return analysis
+
+    async def _analyze(self, sport: str, query: str) -> Dict[str, Any]:
+        """
+        Intention + paramètres de la requête: cache, puis analyse locale,
+        puis LLM uniquement si l'analyse locale n'est pas assez sûre.
+        """
+        analysis, parsed = self._resolve_locally(sport, query)
+        if analysis is not None:
+            return analysis
+        return self._merge_llm(sport, query, parsed, await llm_service.aanalyze_query(query))
+
+    async def agenerate(self, sport: str, query: str) -> Workflow:
         """
         Génère un workflow basé sur la requête utilisateur.
-        Ceci est une version simplifiée/mockée qui sélectionne des outils via des mots-clés.
         """
+        # Analyse de la requête (cache, règles locales, puis LLM)
+        return self._build_workflow(sport, query, await self._analyze(sport, query))
+
+    def generate(self, sport: str, query: str) -> Workflow:
+        """Pont synchrone (scripts). Ne pas appeler depuis une boucle d'événements en cours."""
+        return asyncio.run(self._agenerate_and_release(sport, query))
+
+    async def _agenerate_and_release(self, sport: str, query: str) -> Workflow:
+        try:
+            return await self.agenerate(sport, query)
+        finally:
+            # Clients ouverts dans la boucle du pont: fermés avant qu'elle ne se termine
+            await llm_service.arelease()
+            await tool_registry.client_provider.all_sports.arelease()
+
+    async def agenerate_batch(self, requests: List[Tuple[str, str]]) -> List[Workflow]:
+        """
+        Génère un workflow par couple (sport, requête), dans l'ordre.
+        Les doublons sont analysés une seule fois et les requêtes non résolues
+        localement sont envoyées au LLM par lots.
+        """
+        analyses: Dict[str, Dict[str, Any]] = {}
+        pending: Dict[str, Tuple[str, str, Optional[ParseResult]]] = {}
+        for sport, query in requests:
+            key = intent_cache.key(sport, query)
+            if key in analyses or key in pending:
+                continue
+            analysis, parsed = self._resolve_locally(sport, query)
+            if analysis is not None:
+                analyses[key] = analysis
+            else:
+                pending[key] = (sport, query, parsed)
+
+        if pending:
+            keys = list(pending)
+            llm_analyses = await llm_service.aanalyze_queries([pending[key][1] for key in keys])
+            for key, llm_analysis in zip(keys, llm_analyses):
+                sport, query, parsed = pending[key]
+                analyses[key] = self._merge_llm(sport, query, parsed, llm_analysis)
+
+        return [
+            self._build_workflow(sport, query, copy.deepcopy(analyses[intent_cache.key(sport, query)]))
+            for sport, query in requests
+        ]
+
+    def _build_workflow(self, sport: str, query: str, analysis: Dict[str, Any]) -> Workflow:
         nodes: List[WorkflowNode] = []
         edges: List[WorkflowEdge] = []
-        
-        # Logique de génération mockée basée sur des mots-clés
-        # Analyse de la requête par LLM
-        analysis = llm_service.analyze_query(query)
+
         tool_name = analysis.get("tool")
         parameters = analysis.get("parameters", {})
         
@@ -1,13 +1,61 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, List, Dict
+from typing import Any, List, Dict, Optional
 
 class BaseTool(ABC):
-    def __init__(self, name: str, description: str, supported_sports: List[str]):
+    # Durée (secondes) pendant laquelle l'exécuteur peut réutiliser un résultat
+    # pour une entrée identique. None: jamais mémorisé; math.inf: sans expiration.
+    cache_ttl: Optional[float] = None
+
+    def __init__(self, name: str, description: str, supported_sports: List[str], parameters: Optional[Dict[str, str]] = None):
         self.name = name
         self.description = description
         self.supported_sports = supported_sports
+        # Paramètres acceptés (nom -> type/indication). Seuls les outils qui les
+        # déclarent sont proposés au LLM lors de l'analyse des requêtes.
+        self.parameters = parameters or {}
 
     @abstractmethod
     def run(self, input_data: Any) -> Dict[str, Any]:
         """Exécute la logique de l'outil."""
         pass
+
+    async def arun(self, input_data: Any) -> Dict[str, Any]:
+        """
+        Exécution asynchrone. Par défaut, `run` dans un thread: appelable sur
+        tout outil. Les outils nativement asynchrones la redéfinissent.
+        """
+        return await asyncio.to_thread(self.run, input_data)
+
+    @property
+    def is_async(self) -> bool:
+        """
+        Outil nativement asynchrone (arun redéfinie). Sert seulement au routage:
+        l'exécuteur envoie les autres dans son pool de threads borné.
+        """
+        return type(self).arun is not BaseTool.arun
+
+class AsyncBaseTool(BaseTool):
+    """Outil nativement asynchrone (appels réseau sans bloquer la boucle d'événements)."""
+
+    @abstractmethod
+    async def arun(self, input_data: Any) -> Dict[str, Any]:
+        """Exécute la logique de l'outil."""
+        pass
+
+    def run(self, input_data: Any) -> Dict[str, Any]:
+        """Pont synchrone (scripts, CLI). Ne pas appeler depuis une boucle d'événements en cours."""
+        return asyncio.run(self._arun_and_release(input_data))
+
+    async def _arun_and_release(self, input_data: Any) -> Dict[str, Any]:
+        try:
+            return await self.arun(input_data)
+        finally:
+            # Les pools ouverts dans cette boucle sont fermés avant qu'elle ne se termine
+            await self.arelease()
+
+    async def arelease(self):
+        """Libère les ressources liées à la boucle courante (pool HTTP du client de l'outil)."""
+        client = getattr(self, "client", None)
+        if client is not None and hasattr(client, "arelease"):
+            await client.arelease()
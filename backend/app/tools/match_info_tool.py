@@ -1,22 +1,49 @@
-from typing import Any, Dict, List
-from app.tools.base import BaseTool
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+from app.tools.base import AsyncBaseTool
 from app.services.api_clients.all_sports_client import AllSportsClient
-from app.models.match import MatchInfo
-from datetime import datetime
+from app.models.match import MatchRecord
+from app.services.normalization import parse_score
+import asyncio
+from datetime import date, datetime
+from functools import lru_cache
+from sys import intern
 from dotenv import load_dotenv
 
 load_dotenv()
 
-class MatchInfoTool(BaseTool):
-    def __init__(self):
+# Cache indexé par la valeur brute: seules les chaînes y entrent (une liste ou un
+# dict reçu de l'API n'est pas hachable et ferait échouer tout le lot)
+@lru_cache(maxsize=8192)
+def _parse_date_str(value: str) -> Optional[date]:
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+def _parse_date(value: Any) -> Optional[date]:
+    return _parse_date_str(value) if isinstance(value, str) else None
+
+class MatchInfoTool(AsyncBaseTool):
+    cache_ttl = 120.0  # La période par défaut inclut les matchs du jour
+
+    def __init__(self, client: Optional[AllSportsClient] = None):
          super().__init__(
             name="match_info",
             description="Informations sur des matchs joués",
-            supported_sports=["football", "basketball", "tennis"] # Example sports
+            supported_sports=["football", "basketball", "tennis"], # Example sports
+            parameters={
+                "sport": "str",
+                "team": "str",
+                "opponent": "str, face-à-face",
+                "league": "str",
+                "date": "AAAA-MM-JJ",
+                "season": "int, ex: 2019",
+                "details": "list[str], ex: [\"stats\", \"lineups\"]"
+            }
         )
-         self.client = AllSportsClient()
+         self.client = client or AllSportsClient()
 
-    def run(self, input_data: Any) -> Dict[str, Any]:
+    async def arun(self, input_data: Any) -> Dict[str, Any]:
         sport = input_data.get("sport")
         team = input_data.get("team")
         opponent = input_data.get("opponent")
@@ -24,6 +51,7 @@ class MatchInfoTool(BaseTool):
         date_str = input_data.get("date")
         league_name = input_data.get("league")
         details = input_data.get("details") 
+        include_raw = bool(input_data.get("include_raw", False))
         
         if not sport:
             return {"error": "Le sport est obligatoire."}
@@ -31,27 +59,33 @@ class MatchInfoTool(BaseTool):
         # Handle H2H
         if team and opponent:
             try:
-                team_id = self.client._get_team_id(team)
-                opponent_id = self.client._get_team_id(opponent)
+                team_id, opponent_id = await asyncio.gather(
+                    self.client._aget_team_id(team),
+                    self.client._aget_team_id(opponent)
+                )
                 if not team_id or not opponent_id:
                     return {"error": f"Impossible de trouver l'ID pour {team} ou {opponent}"}
                 
-                h2h_data = self.client.get_h2h(team_id, opponent_id)
+                h2h_data = await self.client.aget_h2h(team_id, opponent_id)
                 # H2H returns a complex object with "H2H" (past matches), "firstTeamResults", etc.
                 # We prioritize "H2H" list.
                 matches = h2h_data.get("H2H", [])
                 
                 # Normalize matches
-                normalized_matches = self._normalize_matches(matches, sport)
+                normalized_matches, rejected = self._normalize_matches(matches, sport)
                 
-                return {
+                output = {
                     "type": "h2h",
                     "sport": sport,
                     "team": team,
                     "opponent": opponent,
                     "matches": normalized_matches,
-                    "raw_data": h2h_data # Optionally return more data
+                    "rejected": rejected
                 }
+                if include_raw:
+                    # Réponse H2H complète (volumineuse): uniquement sur demande
+                    output["raw_data"] = h2h_data
+                return output
 
             except Exception as e:
                 return {"error": f"Erreur H2H: {str(e)}"}
@@ -78,20 +112,15 @@ class MatchInfoTool(BaseTool):
         
         league_id = None
         if league_name:
-             # Basic resolution: Fetch all leagues and fuzzy match
-             leagues = self.client.get_leagues()
-             for lg in leagues:
-                 if league_name.lower() in lg.get("league_name", "").lower():
-                     league_id = lg.get("league_key")
-                     print(f"DEBUG: Resolved league '{league_name}' to {league_id} ({lg.get('league_name')})")
-                     break
+             # Résolution via le catalogue indexé (chargé une fois, rafraîchi en arrière-plan)
+             league_id = await self.client.aresolve_league(league_name)
         
         with_player_stats = False
         if details and ("stats" in details or "player_stats" in details):
             with_player_stats = True
 
         try:
-            raw_matches = self.client.get_finished_matches(
+            raw_matches = await self.client.aget_finished_matches(
                 sport=sport,
                 team_name=team, 
                 league_id=league_id,
@@ -100,14 +129,15 @@ class MatchInfoTool(BaseTool):
                 with_player_stats=with_player_stats
             )
             
-            normalized_matches = self._normalize_matches(raw_matches, sport)
+            normalized_matches, rejected = self._normalize_matches(raw_matches, sport)
 
             return {
                 "type": "match_info",
                 "sport": sport,
                 "team": team,
                 "league": league_name,
-                "matches": normalized_matches
+                "matches": normalized_matches,
+                "rejected": rejected
             }
 
         except ValueError as e:
@@ -117,35 +147,46 @@ class MatchInfoTool(BaseTool):
         except Exception as e:
             return {"error": f"Erreur interne: {str(e)}"}
 
-    def _normalize_matches(self, matches: List[Dict[str, Any]], sport: str) -> List[Dict[str, Any]]:
+    def _normalize_matches(self, matches: List[Dict[str, Any]], sport: str) -> Tuple[List[MatchRecord], List[Dict[str, Any]]]:
+        """
+        Normalise un lot de matchs bruts en une passe: dates et scores sont
+        analysés via des caches (un même jour ou score revient sur des centaines
+        de lignes), et chaque match devient un MatchRecord compact.
+        Retourne (matchs normalisés, lignes rejetées avec motif).
+        """
         normalized = []
+        rejected = []
         for m in matches:
-            try:
-                home_score = 0
-                away_score = 0
-                final_result = m.get("event_final_result", "")
-                if " - " in final_result:
-                    parts = final_result.split(" - ")
-                    if len(parts) == 2:
-                        try:
-                            home_score = int(parts[0])
-                            away_score = int(parts[1])
-                        except ValueError:
-                            pass
-                
-                match_info = MatchInfo(
-                    match_id=str(m.get("event_key")),
-                    sport=sport,
-                    league=m.get("league_name"),
-                    home_team=m.get("event_home_team"),
-                    away_team=m.get("event_away_team"),
-                    home_score=home_score,
-                    away_score=away_score,
-                    match_date=datetime.strptime(m.get("event_date"), "%Y-%m-%d").date(),
-                    status=m.get("event_status")
-                )
-                
-                normalized.append(match_info.model_dump())
-            except Exception:
+            if not isinstance(m, Mapping):
+                rejected.append({"match_id": None, "reason": f"ligne invalide: {type(m).__name__}"})
+                continue
+            match_id = str(m.get("event_key"))
+            home_team = m.get("event_home_team")
+            away_team = m.get("event_away_team")
+            status = m.get("event_status")
+            if not isinstance(home_team, str) or not isinstance(away_team, str):
+                rejected.append({"match_id": match_id, "reason": "équipes manquantes"})
+                continue
+            if not isinstance(status, str):
+                rejected.append({"match_id": match_id, "reason": "statut manquant"})
+                continue
+            match_date = _parse_date(m.get("event_date"))
+            if match_date is None:
+                rejected.append({"match_id": match_id, "reason": f"date invalide: {m.get('event_date')!r}"})
                 continue
-        return normalized
+            home_score, away_score = parse_score(m.get("event_final_result")) or (0, 0)
+            league = m.get("league_name")
+            normalized.append(MatchRecord(
+                match_id=match_id,
+                sport=intern(str(sport)),
+                league=intern(league) if isinstance(league, str) else None,
+                home_team=intern(home_team),
+                away_team=intern(away_team),
+                home_score=home_score,
+                away_score=away_score,
+                match_date=match_date,
+                status=intern(status)
+            ))
+        if rejected:
+            print(f"DEBUG: {len(rejected)} match(s) rejected during normalization: {rejected[:5]}")
+        return normalized, rejected
@@ -1,7 +1,10 @@
+import math
 from typing import Any, Dict
 from app.tools.base import BaseTool
 
 class PerformanceTool(BaseTool):
+    cache_ttl = math.inf  # Données statiques (mock)
+
     def __init__(self):
         super().__init__(
             name="PerformanceTool",
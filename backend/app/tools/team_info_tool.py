@@ -1,29 +1,32 @@
-from typing import Any, Dict
-from app.tools.base import BaseTool
+from typing import Any, Dict, Optional
+from app.tools.base import AsyncBaseTool
 from app.services.api_clients.all_sports_client import AllSportsClient
 
-class TeamInfoTool(BaseTool):
-    def __init__(self):
+class TeamInfoTool(AsyncBaseTool):
+    cache_ttl = 3600.0
+
+    def __init__(self, client: Optional[AllSportsClient] = None):
         super().__init__(
             name="team_info",
             description="Récupère les informations et l'effectif d'une équipe",
-            supported_sports=["football"]
+            supported_sports=["football"],
+            parameters={"team": "str", "team_id": "str, optionnel"}
         )
-        self.client = AllSportsClient()
+        self.client = client or AllSportsClient()
 
-    def run(self, input_data: Any) -> Dict[str, Any]:
+    async def arun(self, input_data: Any) -> Dict[str, Any]:
         team_name = input_data.get("team")
         team_id = input_data.get("team_id")
         sport = input_data.get("sport", "football")
 
         if not team_id and team_name:
-            team_id = self.client._get_team_id(team_name)
+            team_id = await self.client._aget_team_id(team_name)
         
         if not team_id:
             return {"error": f"Équipe '{team_name or team_id}' non trouvée."}
 
         try:
-            team_details = self.client.get_team_details(team_id)
+            team_details = await self.client.aget_team_details(team_id)
             return {
                 "type": "team_info",
                 "sport": sport,
@@ -1,33 +1,32 @@
-from typing import Any, Dict
-from app.tools.base import BaseTool
+from typing import Any, Dict, Optional
+from app.tools.base import AsyncBaseTool
 from app.services.api_clients.all_sports_client import AllSportsClient
 
-class TopScorersTool(BaseTool):
-    def __init__(self):
+class TopScorersTool(AsyncBaseTool):
+    cache_ttl = 600.0
+
+    def __init__(self, client: Optional[AllSportsClient] = None):
         super().__init__(
             name="topscorers",
             description="Récupère les meilleurs buteurs d'une ligue",
-            supported_sports=["football"]
+            supported_sports=["football"],
+            parameters={"league": "str", "league_id": "str, optionnel"}
         )
-        self.client = AllSportsClient()
+        self.client = client or AllSportsClient()
 
-    def run(self, input_data: Any) -> Dict[str, Any]:
+    async def arun(self, input_data: Any) -> Dict[str, Any]:
         league_name = input_data.get("league")
         league_id = input_data.get("league_id")
         sport = input_data.get("sport", "football")
 
         if not league_id and league_name:
-            leagues = self.client.get_leagues()
-            for lg in leagues:
-                if league_name.lower() in lg.get("league_name", "").lower():
-                    league_id = lg.get("league_key")
-                    break
+            league_id = await self.client.aresolve_league(league_name)
         
         if not league_id:
             return {"error": "L'ID ou le nom de la ligue est obligatoire."}
 
         try:
-            scorers = self.client.get_topscorers(league_id)
+            scorers = await self.client.aget_topscorers(league_id)
             return {
                 "type": "topscorers",
                 "sport": sport,
@@ -1,7 +1,10 @@
+import math
 from typing import Any, Dict
 from app.tools.base import BaseTool
 
 class TransfersTool(BaseTool):
+    cache_ttl = math.inf  # Données statiques (mock)
+
     def __init__(self):
         super().__init__(
             name="TransfersTool",
@@ -1,17 +1,20 @@
-from typing import Any, Dict
-from app.tools.base import BaseTool
+from typing import Any, Dict, Optional
+from app.tools.base import AsyncBaseTool
 from app.services.api_clients.all_sports_client import AllSportsClient
 
-class VideosTool(BaseTool):
-    def __init__(self):
+class VideosTool(AsyncBaseTool):
+    cache_ttl = 6 * 3600.0
+
+    def __init__(self, client: Optional[AllSportsClient] = None):
         super().__init__(
             name="videos",
             description="Récupère les vidéos/highlights d'un match",
-            supported_sports=["football"]
+            supported_sports=["football"],
+            parameters={"match_id": "str, obligatoire"}
         )
-        self.client = AllSportsClient()
+        self.client = client or AllSportsClient()
 
-    def run(self, input_data: Any) -> Dict[str, Any]:
+    async def arun(self, input_data: Any) -> Dict[str, Any]:
         match_id = input_data.get("match_id")
         sport = input_data.get("sport", "football")
 
@@ -19,7 +22,7 @@ class VideosTool(BaseTool):
             return {"error": "L'ID du match est obligatoire."}
 
         try:
-            videos = self.client.get_videos(match_id)
+            videos = await self.client.aget_videos(match_id)
             return {
                 "type": "videos",
                 "sport": sport,
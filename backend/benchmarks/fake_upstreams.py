@@ -0,0 +1,362 @@
+"""
+Serveur local remplaçant AllSportsAPI et le LLM (API compatible OpenAI) pour les benchmarks.
+
+    python -m benchmarks.fake_upstreams --port 9100 --latency-ms 80 --fixtures 200
+
+- AllSportsAPI: GET /football/?met=Fixtures|Standings|Topscorers|Teams|Leagues|H2H|Videos|Odds
+- LLM: POST /v1/chat/completions (réponse JSON d'analyse, unitaire ou par lot)
+- Compteurs d'appels: GET /stats, remise à zéro: POST /stats/reset
+
+Les réponses sont déterministes (mêmes paramètres -> même contenu): deux
+exécutions du benchmark voient exactement les mêmes données.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+from fastapi import FastAPI, Request
+
+LEAGUES = ["Premier League", "Ligue 1", "La Liga", "Serie A", "Bundesliga"]
+TEAMS = {
+    "Premier League": ["Arsenal", "Chelsea", "Liverpool", "Manchester City", "Manchester United", "Tottenham"],
+    "Ligue 1": ["PSG", "Marseille", "Lyon", "Monaco", "Lille", "Nice"],
+    "La Liga": ["Real Madrid", "Barcelona", "Atletico Madrid", "Sevilla", "Valencia", "Villarreal"],
+    "Serie A": ["Juventus", "Inter", "AC Milan", "Napoli", "Roma", "Lazio"],
+    "Bundesliga": ["Bayern Munich", "Borussia Dortmund", "RB Leipzig", "Bayer Leverkusen", "Stuttgart", "Wolfsburg"],
+}
+
+# Mots-clés -> outil, pour l'analyse simulée du LLM
+LLM_INTENTS = [
+    ("standings", ["classement", "standings", "table"]),
+    ("topscorers", ["buteur", "scorer"]),
+    ("team_info", ["effectif", "squad", "joueurs"]),
+    ("videos", ["video", "highlights"]),
+]
+
+
+@dataclass
+class UpstreamConfig:
+    latency_ms: float = 50.0  # Latence AllSportsAPI par appel
+    jitter_ms: float = 20.0  # Gigue aléatoire ajoutée (uniforme)
+    fixtures: int = 100  # Matchs par réponse Fixtures (taille des réponses)
+    players: int = 25  # Joueurs par équipe (Teams teamId, statistiques)
+    extra_leagues: int = 500  # Ligues fictives ajoutées au catalogue Leagues
+    llm_latency_ms: float = 300.0  # Latence fixe par appel LLM
+    llm_ms_per_token: float = 2.0  # Latence par jeton généré
+    llm_padding: int = 0  # Caractères ajoutés à chaque réponse LLM
+    seed: int = 42
+
+
+def _rng(config: UpstreamConfig, *parts: Any) -> random.Random:
+    """Générateur déterministe pour un jeu de paramètres."""
+    return random.Random(zlib.crc32(repr((config.seed, parts)).encode()))
+
+
+def _team_key(name: str) -> int:
+    return 1000 + zlib.crc32(name.lower().encode()) % 9000
+
+
+def _league_key(name: str) -> int:
+    return 100 + LEAGUES.index(name) if name in LEAGUES else 1000 + zlib.crc32(name.encode()) % 9000
+
+
+ALL_TEAMS = {_team_key(team): (team, league) for league, teams in TEAMS.items() for team in teams}
+
+
+class FakeAllSports:
+    def __init__(self, config: UpstreamConfig):
+        self.config = config
+        self.leagues = [
+            {"league_key": _league_key(name), "league_name": name, "country_key": 44, "country_name": "Europe"}
+            for name in LEAGUES
+        ] + [
+            {"league_key": 20000 + i, "league_name": f"Bench League {i}", "country_key": 1 + i % 50, "country_name": f"Country {i % 50}"}
+            for i in range(config.extra_leagues)
+        ]
+
+    def _players(self, rng: random.Random, team: str) -> List[Dict[str, Any]]:
+        return [
+            {
+                "player_key": rng.randint(10_000, 99_999),
+                "player_name": f"{team} Player {i + 1}",
+                "player_number": str(i + 1),
+                "player_type": rng.choice(["Goalkeepers", "Defenders", "Midfielders", "Forwards"]),
+                "player_age": str(rng.randint(18, 36)),
+                "player_match_played": str(rng.randint(0, 38)),
+                "player_goals": str(rng.randint(0, 20)),
+            }
+            for i in range(self.config.players)
+        ]
+
+    def _fixture(self, rng: random.Random, day: date, home: int, away: int, league: str, with_stats: bool) -> Dict[str, Any]:
+        home_name = ALL_TEAMS.get(home, (f"Team {home}", league))[0]
+        away_name = ALL_TEAMS.get(away, (f"Team {away}", league))[0]
+        finished = day < date.today()
+        home_goals, away_goals = rng.randint(0, 4), rng.randint(0, 3)
+        fixture = {
+            "event_key": rng.randint(1_000_000, 9_999_999),
+            "event_date": day.isoformat(),
+            "event_time": "20:45",
+            "event_home_team": home_name,
+            "home_team_key": home,
+            "event_away_team": away_name,
+            "away_team_key": away,
+            "event_halftime_result": f"{home_goals // 2} - {away_goals // 2}",
+            "event_final_result": f"{home_goals} - {away_goals}" if finished else "-",
+            "event_status": "Finished" if finished else "",
+            "country_name": "Europe",
+            "league_name": league,
+            "league_key": _league_key(league) if league in LEAGUES else 20000,
+            "league_round": f"Round {rng.randint(1, 38)}",
+            "event_stadium": f"{home_name} Stadium",
+            "goalscorers": [
+                {"time": str(rng.randint(1, 90)), "home_scorer": f"{home_name} Player {rng.randint(1, 11)}", "score": "-"}
+                for _ in range(home_goals + away_goals)
+            ],
+        }
+        if with_stats:
+            fixture["player_stats"] = self._players(rng, home_name) + self._players(rng, away_name)
+        return fixture
+
+    def _fixtures(self, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        date_from = date.fromisoformat(params.get("from", date.today().isoformat()))
+        date_to = date.fromisoformat(params.get("to", date.today().isoformat()))
+        days = max(1, (date_to - date_from).days + 1)
+        team_id = int(params["teamId"]) if params.get("teamId", "").isdigit() else None
+        league_id = int(params["leagueId"]) if params.get("leagueId", "").isdigit() else None
+        league = next((name for name in LEAGUES if _league_key(name) == league_id), None)
+        if league is None and team_id in ALL_TEAMS:
+            league = ALL_TEAMS[team_id][1]
+        league = league or LEAGUES[0]
+        rng = _rng(self.config, "Fixtures", sorted(params.items()))
+        keys = [_team_key(team) for team in TEAMS[league]]
+        fixtures = []
+        for i in range(self.config.fixtures):
+            day = date_from + timedelta(days=i * days // self.config.fixtures)
+            if team_id is not None:
+                opponent = rng.choice([key for key in keys if key != team_id])
+                home, away = (team_id, opponent) if i % 2 else (opponent, team_id)
+            else:
+                home, away = rng.sample(keys, 2)
+            fixtures.append(self._fixture(rng, day, home, away, league, params.get("withPlayerStats") == "1"))
+        return fixtures
+
+    def _standings(self, params: Dict[str, str]) -> Dict[str, Any]:
+        league_id = int(params.get("leagueId", "0") or 0)
+        league = next((name for name in LEAGUES if _league_key(name) == league_id), LEAGUES[0])
+        rng = _rng(self.config, "Standings", league_id)
+        rows = []
+        for place, team in enumerate(sorted(TEAMS[league], key=lambda _: rng.random()), start=1):
+            won, drawn, lost = rng.randint(5, 20), rng.randint(2, 10), rng.randint(2, 15)
+            rows.append({
+                "standing_place": place, "standing_team": team, "team_key": _team_key(team),
+                "standing_P": won + drawn + lost, "standing_W": won, "standing_D": drawn, "standing_L": lost,
+                "standing_F": rng.randint(20, 80), "standing_A": rng.randint(15, 60), "standing_PTS": 3 * won + drawn,
+                "league_key": league_id, "league_season": "2025/2026",
+            })
+        return {"total": rows, "home": rows, "away": rows}
+
+    def _topscorers(self, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        rng = _rng(self.config, "Topscorers", params.get("leagueId"))
+        return [
+            {"player_place": i + 1, "player_name": f"Scorer {i + 1}", "player_key": rng.randint(10_000, 99_999),
+             "team_name": rng.choice(list(ALL_TEAMS.values()))[0], "goals": 30 - i, "assists": rng.randint(0, 15)}
+            for i in range(20)
+        ]
+
+    def _teams(self, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        if params.get("teamId"):
+            key = int(params["teamId"]) if params["teamId"].isdigit() else 0
+            name = ALL_TEAMS.get(key, (f"Team {key}", None))[0]
+        else:
+            name = params.get("teamName", "")
+            name = next((team for team, _ in ALL_TEAMS.values() if team.lower() == name.lower()), name)
+            key = _team_key(name)
+        rng = _rng(self.config, "Teams", key)
+        return [{
+            "team_key": key,
+            "team_name": name,
+            "team_logo": f"https://example.invalid/logo/{key}.png",
+            "players": self._players(rng, name),
+            "coaches": [{"coach_name": f"{name} Coach", "coach_country": None, "coach_age": None}],
+        }]
+
+    def _h2h(self, params: Dict[str, str]) -> Dict[str, Any]:
+        first = int(params.get("firstTeamId", "0") or 0)
+        second = int(params.get("secondTeamId", "0") or 0)
+        league = ALL_TEAMS.get(first, ("", LEAGUES[0]))[1]
+        rng = _rng(self.config, "H2H", first, second)
+        today = date.today()
+
+        def history(home: int, away: int, count: int) -> List[Dict[str, Any]]:
+            return [self._fixture(rng, today - timedelta(days=30 * (i + 1)), home, away, league, False) for i in range(count)]
+
+        count = max(1, self.config.fixtures // 10)
+        return {
+            "H2H": history(first, second, count),
+            "firstTeamResults": history(first, second, count),
+            "secondTeamResults": history(second, first, count),
+        }
+
+    def _videos(self, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        event = params.get("eventId", "")
+        return [
+            {"event_key": event, "video_title_full": f"Highlights {event} #{i + 1}", "video_title": f"Highlights #{i + 1}",
+             "video_url": f"https://example.invalid/videos/{event}/{i + 1}"}
+            for i in range(3)
+        ]
+
+    def _odds(self, params: Dict[str, str]) -> Dict[str, Any]:
+        event = params.get("matchId", "")
+        return {event: [{"odd_bookmakers": f"Book {i}", "odd_1": 2.1, "odd_x": 3.3, "odd_2": 3.6} for i in range(10)]}
+
+    def respond(self, params: Dict[str, str]) -> Dict[str, Any]:
+        handlers = {
+            "Fixtures": self._fixtures,
+            "Standings": self._standings,
+            "Topscorers": self._topscorers,
+            "Teams": self._teams,
+            "Leagues": lambda _: self.leagues,
+            "H2H": self._h2h,
+            "Videos": self._videos,
+            "Odds": self._odds,
+        }
+        handler = handlers.get(params.get("met", ""))
+        if handler is None:
+            return {"success": 0, "error": f"Unknown met: {params.get('met')}"}
+        return {"success": 1, "result": handler(params)}
+
+
+def _analyze(query: str) -> Dict[str, Any]:
+    """Analyse simulée: outil par mots-clés, entités parmi les ligues et équipes connues."""
+    text = query.lower()
+    league = next((name for name in LEAGUES if name.lower() in text), None)
+    teams = [team for team, _ in ALL_TEAMS.values() if team.lower() in text]
+    tool = next((tool for tool, words in LLM_INTENTS if any(word in text for word in words)), "match_info")
+    parameters: Dict[str, Any] = {"sport": "football"}
+    if tool in ("standings", "topscorers"):
+        parameters["league"] = league or LEAGUES[0]
+    elif tool == "team_info":
+        parameters["team"] = teams[0] if teams else "Arsenal"
+    elif tool == "videos":
+        parameters["match_id"] = "1234567"
+    else:
+        if teams:
+            parameters["team"] = teams[0]
+        if len(teams) > 1:
+            parameters["opponent"] = teams[1]
+        if league and not teams:
+            parameters["league"] = league
+    return {"tool": tool, "parameters": parameters}
+
+
+class FakeLLM:
+    def __init__(self, config: UpstreamConfig):
+        self.config = config
+
+    def respond(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        messages = body.get("messages") or []
+        user = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+        try:
+            items = json.loads(user)
+        except ValueError:
+            items = None
+        if isinstance(items, list):
+            content: Dict[str, Any] = {"results": [{"index": item.get("index"), **_analyze(item.get("query", ""))} for item in items]}
+        else:
+            content = _analyze(user)
+        if self.config.llm_padding:
+            content["notes"] = "x" * self.config.llm_padding
+        text = json.dumps(content, ensure_ascii=False)
+        prompt_tokens = sum(len(m.get("content", "")) for m in messages) // 4
+        completion_tokens = max(1, len(text) // 4)
+        return {
+            "id": f"chatcmpl-bench-{zlib.crc32(user.encode())}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "bench"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens},
+        }
+
+
+def create_app(config: Optional[UpstreamConfig] = None) -> FastAPI:
+    config = config or UpstreamConfig()
+    allsports = FakeAllSports(config)
+    llm = FakeLLM(config)
+    calls: Counter = Counter()
+    app = FastAPI(title="Fake upstreams")
+
+    @app.get("/football/")
+    async def football(request: Request):
+        params = dict(request.query_params)
+        calls[f"allsports:{params.get('met', '')}"] += 1
+        await asyncio.sleep((config.latency_ms + random.uniform(0, config.jitter_ms)) / 1000)
+        return allsports.respond(params)
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        response = llm.respond(await request.json())
+        calls["llm:chat.completions"] += 1
+        tokens = response["usage"]["completion_tokens"]
+        await asyncio.sleep((config.llm_latency_ms + tokens * config.llm_ms_per_token) / 1000)
+        return response
+
+    @app.get("/stats")
+    async def stats():
+        return dict(calls)
+
+    @app.post("/stats/reset")
+    async def reset_stats():
+        calls.clear()
+        return {}
+
+    return app
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    defaults = UpstreamConfig()
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms, help="latence AllSportsAPI par appel")
+    parser.add_argument("--jitter-ms", type=float, default=defaults.jitter_ms, help="gigue AllSportsAPI (uniforme)")
+    parser.add_argument("--fixtures", type=int, default=defaults.fixtures, help="matchs par réponse Fixtures")
+    parser.add_argument("--players", type=int, default=defaults.players, help="joueurs par équipe")
+    parser.add_argument("--extra-leagues", type=int, default=defaults.extra_leagues, help="ligues fictives du catalogue")
+    parser.add_argument("--llm-latency-ms", type=float, default=defaults.llm_latency_ms, help="latence fixe par appel LLM")
+    parser.add_argument("--llm-ms-per-token", type=float, default=defaults.llm_ms_per_token, help="latence LLM par jeton généré")
+    parser.add_argument("--llm-padding", type=int, default=defaults.llm_padding, help="caractères ajoutés aux réponses LLM")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def config_from_args(args: argparse.Namespace) -> UpstreamConfig:
+    return UpstreamConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        fixtures=args.fixtures,
+        players=args.players,
+        extra_leagues=args.extra_leagues,
+        llm_latency_ms=args.llm_latency_ms,
+        llm_ms_per_token=args.llm_ms_per_token,
+        llm_padding=args.llm_padding,
+        seed=args.seed,
+    )
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    add_arguments(parser)
+    args = parser.parse_args()
+    uvicorn.run(create_app(config_from_args(args)), host=args.host, port=args.port, log_level="warning", access_log=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""
+Benchmark de bout en bout: démarre les faux upstreams (benchmarks.fake_upstreams)
+puis l'application (uvicorn app.main:app) configurée pour les utiliser, et charge
+/workflows/generate et /workflows/execute à concurrence croissante.
+
+    cd backend
+    python -m benchmarks.load --concurrency 1,4,16,64 --duration 10
+    python -m benchmarks.load --cold --json results/cold.json
+
+Pour chaque palier: requêtes/s, erreurs, latences p50/p95/p99/max (ms) et
+appels upstream par requête. Sans --cold, les requêtes populaires se répètent
+(caches chauds); avec --cold, les caches de l'application sont désactivés et
+chaque requête est unique: chaque appel paie les upstreams.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import socket
+import string
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+import httpx
+from benchmarks.fake_upstreams import add_arguments
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Requêtes résolues localement (analyse par règles) et requêtes libres (LLM)
+QUERIES = [
+    "classement Premier League",
+    "meilleurs buteurs Serie A",
+    "PSG vs Marseille",
+    "effectif Real Madrid",
+    "résultats Ligue 1",
+    "Comment a joué Liverpool ces dernières semaines ?",
+    "Qui domine la Bundesliga en ce moment ?",
+    "Raconte-moi la rivalité entre Juventus et Inter",
+]
+
+
+@dataclass
+class LevelResult:
+    scenario: str
+    concurrency: int
+    duration: float
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    upstream_calls: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies)
+
+    def percentile(self, fraction: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "scenario": self.scenario,
+            "concurrency": self.concurrency,
+            "requests": self.requests,
+            "errors": self.errors,
+            "rps": round(self.requests / self.duration, 1) if self.duration else 0.0,
+            "p50_ms": round(self.percentile(0.50), 1),
+            "p95_ms": round(self.percentile(0.95), 1),
+            "p99_ms": round(self.percentile(0.99), 1),
+            "max_ms": round(max(self.latencies, default=0.0), 1),
+            "upstream_calls_per_request": {
+                name: round(count / self.requests, 2) for name, count in sorted(self.upstream_calls.items())
+            } if self.requests else {},
+        }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _tag(n: int) -> str:
+    """Suffixe unique sans chiffres (un nombre serait lu comme une saison ou un match)."""
+    letters = ""
+    while True:
+        n, rest = divmod(n, 26)
+        letters = string.ascii_lowercase[rest] + letters
+        if not n:
+            return letters
+
+
+def _wait_ready(url: str, process: subprocess.Popen, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Le processus s'est arrêté (code {process.returncode}) avant d'être prêt: {url}")
+        try:
+            if httpx.get(url, timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"Pas de réponse de {url} après {timeout:.0f}s")
+
+
+def _stop(process: Optional[subprocess.Popen]):
+    if process is None or process.poll() is not None:
+        return
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def _upstream_args(args: argparse.Namespace) -> List[str]:
+    return [
+        "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms),
+        "--fixtures", str(args.fixtures), "--players", str(args.players),
+        "--extra-leagues", str(args.extra_leagues), "--llm-latency-ms", str(args.llm_latency_ms),
+        "--llm-ms-per-token", str(args.llm_ms_per_token), "--llm-padding", str(args.llm_padding),
+        "--seed", str(args.seed),
+    ]
+
+
+def _app_env(args: argparse.Namespace, upstream_url: str, cache_dir: str) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update({
+        "ALL_SPORTS_API_KEY": "bench",
+        "GROQ_API_KEY": "bench",
+        "ALL_SPORTS_BASE_URL": f"{upstream_url}/football/",
+        "LLM_BASE_URL": f"{upstream_url}/v1",
+        "INTENT_CACHE_PATH": "",
+        "CACHE_WARM_LEAGUES": "[]",
+        "CACHE_WARM_TEAMS": "[]",
+        "MATCH_STORE_PATH": "" if args.cold else os.path.join(cache_dir, "matches.sqlite3"),
+        "RESPONSE_CACHE_BACKEND": "none" if args.cold else "memory",
+        "PYTHONPATH": str(BACKEND_DIR),
+    })
+    if not args.rate_limit:
+        # Le faux upstream n'a pas de quota: le limiteur fausserait la mesure
+        env["ALL_SPORTS_RATE_LIMIT"] = "0"
+    return env
+
+
+async def _run_level(
+    client: httpx.AsyncClient,
+    scenario: str,
+    path: str,
+    bodies: Callable[[], Dict[str, Any]],
+    check: Callable[[Dict[str, Any]], bool],
+    concurrency: int,
+    duration: float,
+) -> LevelResult:
+    """Charge en boucle fermée: `concurrency` clients enchaînent les requêtes pendant `duration` secondes."""
+    result = LevelResult(scenario, concurrency, duration)
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                response = await client.post(path, json=bodies())
+                ok = response.status_code == 200 and check(response.json())
+            except (httpx.HTTPError, ValueError):
+                ok = False
+            result.latencies.append((time.perf_counter() - started) * 1000)
+            if not ok:
+                result.errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.duration = time.perf_counter() - started
+    return result
+
+
+def _generated_ok(workflow: Dict[str, Any]) -> bool:
+    return bool(workflow.get("nodes"))
+
+
+def _executed_ok(result: Dict[str, Any]) -> bool:
+    log = result.get("execution_log") or []
+    return bool(log) and all(
+        entry.get("status") == "success" and "error" not in (entry.get("output") or {})
+        for entry in log
+    )
+
+
+async def _benchmark(args: argparse.Namespace, app_url: str, upstream_url: str) -> Dict[str, Any]:
+    levels = [int(level) for level in args.concurrency.split(",")]
+    limits = httpx.Limits(max_connections=max(levels), max_keepalive_connections=max(levels))
+    counter = itertools.count()
+
+    def query(base: str) -> str:
+        return f"{base} {_tag(next(counter))}" if args.cold else base
+
+    queries = itertools.cycle(QUERIES)
+    results: List[LevelResult] = []
+    async with httpx.AsyncClient(base_url=app_url, timeout=args.timeout, limits=limits) as client:
+        workflows: List[Dict[str, Any]] = []
+        if "execute" in args.scenarios:
+            # Workflows à exécuter: ceux que l'application génère pour les requêtes de référence
+            for base in QUERIES:
+                response = await client.post("/workflows/generate", json={"sport": "football", "query": base})
+                response.raise_for_status()
+                workflows.append(response.json())
+        executions = itertools.cycle(workflows)
+
+        scenarios = {
+            "generate": ("/workflows/generate", lambda: {"sport": "football", "query": query(next(queries))}, _generated_ok),
+            "execute": ("/workflows/execute", lambda: {"workflow": next(executions), "no_cache": args.cold}, _executed_ok),
+        }
+        for scenario in args.scenarios:
+            path, bodies, check = scenarios[scenario]
+            for concurrency in levels:
+                if args.warmup > 0:
+                    await _run_level(client, scenario, path, bodies, check, concurrency, args.warmup)
+                await client.post(f"{upstream_url}/stats/reset")
+                result = await _run_level(client, scenario, path, bodies, check, concurrency, args.duration)
+                result.upstream_calls = (await client.get(f"{upstream_url}/stats")).json()
+                results.append(result)
+                _print_row(result.summary())
+        metrics = (await client.get("/metrics/")).json()
+
+    return {
+        "config": {key: value for key, value in vars(args).items() if key != "json"},
+        "results": [result.summary() for result in results],
+        "app_metrics": metrics,
+    }
+
+
+def _print_header():
+    print(f"{'scenario':<10} {'conc':>5} {'requests':>9} {'errors':>7} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}  upstream/req")
+
+
+def _print_row(row: Dict[str, Any]):
+    upstream = ", ".join(f"{name.split(':', 1)[1]}={count}" for name, count in row["upstream_calls_per_request"].items())
+    print(
+        f"{row['scenario']:<10} {row['concurrency']:>5} {row['requests']:>9} {row['errors']:>7} {row['rps']:>8.1f} "
+        f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['max_ms']:>8.1f}  {upstream or '-'}",
+        flush=True,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", type=lambda value: value.split(","), default=["generate", "execute"], help="generate,execute")
+    parser.add_argument("--concurrency", default="1,4,16,64", help="paliers de concurrence, ex: 1,4,16,64")
+    parser.add_argument("--duration", type=float, default=10.0, help="durée de mesure par palier (secondes)")
+    parser.add_argument("--warmup", type=float, default=1.0, help="chauffe non mesurée avant chaque palier (secondes)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="délai maximal par requête (secondes)")
+    parser.add_argument("--cold", action="store_true", help="caches de l'application désactivés, requêtes uniques")
+    parser.add_argument("--rate-limit", action="store_true", help="conserve le limiteur de débit AllSportsAPI configuré")
+    parser.add_argument("--json", help="écrit les résultats (et /metrics de l'application) dans ce fichier")
+    parser.add_argument("--verbose", action="store_true", help="affiche la sortie de l'application et des faux upstreams")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    output = None if args.verbose else subprocess.DEVNULL
+    upstream_port, app_port = _free_port(), _free_port()
+    upstream_url = f"http://127.0.0.1:{upstream_port}"
+    app_url = f"http://127.0.0.1:{app_port}"
+    upstream = app = None
+    with tempfile.TemporaryDirectory(prefix="bench-") as cache_dir:
+        try:
+            upstream = subprocess.Popen(
+                [sys.executable, "-m", "benchmarks.fake_upstreams", "--port", str(upstream_port), *_upstream_args(args)],
+                cwd=BACKEND_DIR, stdout=output, stderr=output,
+            )
+            _wait_ready(f"{upstream_url}/stats", upstream)
+            app = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(app_port),
+                 "--log-level", "warning", "--no-access-log"],
+                cwd=BACKEND_DIR, env=_app_env(args, upstream_url, cache_dir), stdout=output, stderr=output,
+            )
+            _wait_ready(f"{app_url}/health", app)
+
+            _print_header()
+            report = asyncio.run(_benchmark(args, app_url, upstream_url))
+        finally:
+            _stop(app)
+            _stop(upstream)
+
+    if args.json:
+        path = Path(args.json)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+        print(f"Résultats écrits dans {path}")
+
+
+if __name__ == "__main__":
+    main()
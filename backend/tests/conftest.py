@@ -0,0 +1,5 @@
+import os
+
+# Settings exige les clés API: valeurs factices, les tests n'appellent aucun service réel
+os.environ.setdefault("ALL_SPORTS_API_KEY", "test")
+os.environ.setdefault("GROQ_API_KEY", "test")
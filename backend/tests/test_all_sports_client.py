@@ -0,0 +1,115 @@
+import asyncio
+import json
+import time
+from datetime import date, timedelta
+import httpx
+import pytest
+from app.core.config import settings
+from app.services.api_clients.all_sports_client import AllSportsClient
+from app.services.api_clients.response_cache import ResponseCache
+from app.services.cache import TTLCache
+from app.services.match_store import MatchStore
+from app.services.rate_limiter import RateLimiter
+
+FROM, TO = date(2024, 1, 1), date(2024, 1, 20)
+
+
+def fixture(key, day, score="2 - 1"):
+    return {
+        "event_key": key, "event_date": day.isoformat(), "event_status": "Finished", "event_final_result": score,
+        "league_key": "152", "home_team_key": "10", "away_team_key": "20",
+    }
+
+
+class Upstream:
+    def __init__(self):
+        self.calls = 0
+        self.score = "2 - 1"
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        return httpx.Response(200, text=json.dumps({"success": 1, "result": [fixture("1", FROM + timedelta(days=3), self.score)]}))
+
+
+@pytest.fixture
+def upstream():
+    return Upstream()
+
+
+@pytest.fixture
+def client(upstream):
+    return AllSportsClient(
+        api_key="test",
+        base_url="http://upstream/football/",
+        http_client=httpx.Client(transport=httpx.MockTransport(upstream)),
+        cache=ResponseCache(TTLCache(), stale_window=3600),
+        match_store=MatchStore(":memory:"),
+        rate_limiter=RateLimiter(rate=0),
+    )
+
+
+def fixtures_params(client):
+    return client._fixtures_params("10", FROM, TO, None, False)
+
+
+def test_downloaded_fixtures_are_archived_and_covered(client, upstream):
+    assert [m["event_key"] for m in client.get_finished_matches("football", team_id="10", date_from=FROM, date_to=TO)] == ["1"]
+    assert client.match_store.missing("10", None, FROM, TO) == []
+    # Période définitive: conservée par le stockage local, pas en double dans le cache de réponses
+    assert client.cache.get(fixtures_params(client)) is None
+    client.get_finished_matches("football", team_id="10", date_from=FROM, date_to=TO)
+    assert upstream.calls == 1
+
+
+def test_stale_fixtures_response_is_not_absorbed(client, upstream):
+    # Réponse périmée en cache (ancien score): elle ne doit pas alimenter le stockage permanent
+    stale = {"success": 1, "result": [fixture("1", FROM + timedelta(days=3), "0 - 0")], "fetched_at": time.time()}
+    client.cache.backend.set(ResponseCache.key(fixtures_params(client)), {"data": stale, "fresh_until": time.time() - 1}, ttl=3600)
+    matches = client.get_finished_matches("football", team_id="10", date_from=FROM, date_to=TO)
+    assert upstream.calls == 1
+    assert matches[0]["event_final_result"] == "2 - 1"
+
+
+def test_cached_fixtures_without_fetch_time_do_not_record_coverage(client, upstream):
+    legacy = {"success": 1, "result": [fixture("1", FROM + timedelta(days=3))]}
+    client.cache.set(fixtures_params(client), legacy)
+    assert len(client.get_finished_matches("football", team_id="10", date_from=FROM, date_to=TO)) == 1
+    assert upstream.calls == 0
+    assert client.match_store.missing("10", None, FROM, TO) == [(FROM, TO)]
+
+
+def test_match_store_is_opened_on_first_use(tmp_path, monkeypatch):
+    path = tmp_path / "matches.sqlite3"
+    monkeypatch.setattr(settings, "MATCH_STORE_PATH", str(path))
+    client = AllSportsClient(api_key="test")
+    assert not path.exists()
+    assert client.match_store is client.match_store
+    assert path.exists()
+    assert AllSportsClient(api_key="test", use_cache=False).match_store is None
+
+
+def test_shutdown_cancels_the_league_catalog_refresh():
+    started = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        started.append(1)
+        await asyncio.sleep(10)
+        return httpx.Response(200, text="{}")
+
+    async def main():
+        client = AllSportsClient(
+            api_key="test", base_url="http://upstream/football/", use_cache=False, rate_limiter=RateLimiter(rate=0),
+            async_http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        # Catalogue chargé mais expiré: le rafraîchissement part en arrière-plan
+        client.league_catalog._install([{"league_key": "152", "league_name": "Premier League"}])
+        client.league_catalog._expires_at = 0.0
+        assert (await client.aresolve_league("Premier League")) == "152"
+        task = client.league_catalog._refresh_task
+        await asyncio.sleep(0.01)
+        await client.aclose()
+        # Encore dans la boucle: la tâche ne doit pas survivre à l'arrêt du client
+        return task.cancelled()
+
+    assert asyncio.run(main())
+    assert started
@@ -0,0 +1,81 @@
+from types import SimpleNamespace
+from typing import Any, Dict, Optional
+import pytest
+from app.core.config import settings
+from app.services.intent_parser import IntentParser
+from app.services.normalization import normalize_text
+
+LEAGUES = {"premier league": {"league_key": "152", "league_name": "Premier League"}}
+TEAMS = {"psg", "marseille"}
+
+
+class FakeCatalog:
+    def peek(self, text: str, fuzzy: bool = False) -> Optional[Dict[str, Any]]:
+        return LEAGUES.get(normalize_text(text))
+
+
+class FakeResolver:
+    def known_names(self) -> set:
+        return TEAMS
+
+
+@pytest.fixture
+def parser():
+    client = SimpleNamespace(league_catalog=FakeCatalog(), team_resolver=FakeResolver())
+    return IntentParser(SimpleNamespace(client_provider=SimpleNamespace(all_sports=client)))
+
+
+def confident(result) -> bool:
+    return result.analysis is not None and result.confidence >= settings.INTENT_PARSER_MIN_CONFIDENCE
+
+
+def test_known_league_is_confident(parser):
+    result = parser.parse("classement de la Premier League")
+    assert confident(result)
+    assert result.analysis == {"tool": "standings", "parameters": {"sport": "football", "league": "Premier League", "league_id": "152"}}
+
+
+def test_known_teams_face_to_face(parser):
+    result = parser.parse("PSG vs Marseille")
+    assert confident(result)
+    assert result.analysis["parameters"] == {"sport": "football", "team": "psg", "opponent": "marseille"}
+
+
+def test_unknown_entity_is_left_to_the_llm(parser):
+    assert not confident(parser.parse("classement du championnat des Fidji"))
+
+
+def test_competing_intents_are_left_to_the_llm(parser):
+    assert parser.parse("classement et buteurs Premier League").analysis is None
+
+
+@pytest.mark.parametrize("query", [
+    "highlights match 1234567",
+    "vidéos du match n° 1234567",
+    "videos id: 1234567",
+    "résumé vidéo #1234567",
+    "highlights event 1234567",
+])
+def test_match_id_with_marker(parser, query):
+    result = parser.parse(query)
+    assert confident(result)
+    assert result.analysis == {"tool": "videos", "parameters": {"sport": "football", "match_id": "1234567"}}
+
+
+@pytest.mark.parametrize("query", [
+    "highlights 1234567",
+    "vidéos PSG 2024",
+    "videos 75001 Paris",
+    "highlights match 2024",
+])
+def test_bare_number_is_not_a_match_id(parser, query):
+    assert parser.parse(query).analysis is None
+
+
+def test_match_id_for_another_tool_is_left_to_the_llm(parser):
+    assert parser.parse("score match 1234567").analysis is None
+
+
+def test_year_is_a_season(parser):
+    result = parser.parse("résultats PSG 2023")
+    assert result.analysis["parameters"] == {"sport": "football", "season": 2023, "team": "psg"}
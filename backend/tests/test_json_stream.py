@@ -0,0 +1,103 @@
+import json
+from datetime import date, timedelta
+import pytest
+from app.services.api_clients.json_stream import JSONArrayStream
+
+
+def stream_in_chunks(text, size, array_key="result"):
+    stream = JSONArrayStream(array_key)
+    items = []
+    for i in range(0, len(text), size):
+        items.extend(stream.feed(text[i:i + size]))
+    return items, stream.close()
+
+
+def stream_split_at(text, position):
+    stream = JSONArrayStream()
+    items = stream.feed(text[:position]) + stream.feed(text[position:])
+    return items, stream.close()
+
+
+def fixtures_payload(count=30):
+    """Réponse Fixtures réaliste: chaînes accentuées et échappées, nombres, null, statistiques imbriquées."""
+    start = date(2024, 1, 1)
+    result = []
+    for n in range(count):
+        result.append({
+            "event_key": 1_000_000 + n,
+            "event_date": (start + timedelta(days=n)).isoformat(),
+            "event_time": "20:45",
+            "event_home_team": "Saint-Étienne" if n % 2 else "Olympique \"Lyonnais\"",
+            "event_away_team": "Nîmes\\Olympique",
+            "event_final_result": f"{n % 4} - {n % 3}" if n % 5 else "",
+            "event_status": "Finished" if n % 5 else None,
+            "league_key": 168,
+            "league_name": "Ligue 1 – Uber Eats",
+            "event_stadium": None,
+            "home_odds": 1.85 + n / 100,
+            "player_stats": [{"player_name": "Kylian Mbappé", "player_goals": n % 2, "player_rating": "7.4"}] if n % 3 == 0 else [],
+            "goalscorers": [],
+        })
+    return {"success": 1, "result": result}
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 100_000])
+def test_fixtures_payload_any_chunk_size(size):
+    payload = fixtures_payload()
+    items, fields = stream_in_chunks(json.dumps(payload, ensure_ascii=False), size)
+    assert items == payload["result"]
+    assert fields == {"success": 1}
+
+
+def test_pretty_printed_document():
+    payload = {"success": 1, "result": [{"a": [1, {"b": None}]}, "x", True], "extra": {"k": "v"}}
+    items, fields = stream_in_chunks(json.dumps(payload, indent=2), 5)
+    assert items == payload["result"]
+    assert fields == {"success": 1, "extra": {"k": "v"}}
+
+
+def test_numbers_split_at_every_position():
+    text = '{"result": [12345, -1.5e3, 0.25, 7], "success": 1}'
+    for position in range(len(text) + 1):
+        items, fields = stream_split_at(text, position)
+        assert items == [12345, -1500.0, 0.25, 7], position
+        assert fields == {"success": 1}
+
+
+def test_escapes_split_at_every_position():
+    values = ['quote " inside', "back\\slash", "accent é é", "delims ] } , :", "\n\t"]
+    text = json.dumps({"result": values})
+    for position in range(len(text) + 1):
+        items, _ = stream_split_at(text, position)
+        assert items == values, position
+
+
+def test_empty_array():
+    items, fields = stream_in_chunks('{"success": 1, "result": []}', 1)
+    assert items == []
+    assert fields == {"success": 1}
+
+
+def test_non_list_result_is_kept_as_field():
+    items, fields = stream_in_chunks('{"success": 0, "result": {"error": "quota"}}', 4)
+    assert items == []
+    assert fields == {"success": 0, "result": {"error": "quota"}}
+
+
+def test_truncated_stream():
+    stream = JSONArrayStream()
+    assert stream.feed('{"success": 1, "result": [{"a": 1}, {"b"') == [{"a": 1}]
+    with pytest.raises(ValueError):
+        stream.close()
+
+
+def test_trailing_number_without_delimiter_is_not_emitted():
+    stream = JSONArrayStream()
+    assert stream.feed('{"result": [1, 23') == [1]
+    assert stream.feed("4]}") == [234]
+    assert stream.close() == {}
+
+
+def test_invalid_document():
+    with pytest.raises(ValueError):
+        JSONArrayStream().feed("[1, 2]")
@@ -0,0 +1,33 @@
+from datetime import date
+import pytest
+from app.services.api_clients.all_sports_client import AllSportsClient
+from app.services.normalization import parse_score
+from app.tools.match_info_tool import MatchInfoTool
+
+
+@pytest.fixture
+def tool():
+    return MatchInfoTool(AllSportsClient(api_key="test", use_cache=False))
+
+
+def row(key, **fields):
+    return {
+        "event_key": key, "event_date": "2024-01-05", "event_status": "Finished", "event_final_result": "2 - 1",
+        "event_home_team": "PSG", "event_away_team": "OM", "league_name": "Ligue 1", **fields,
+    }
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2 - 1", (2, 1)), ("0 - 0", (0, 0)), ("", None), ("-", None), ("2-1", None), ("a - b", None), (None, None), (["2 - 1"], None),
+])
+def test_parse_score(value, expected):
+    assert parse_score(value) == expected
+
+
+def test_invalid_rows_are_rejected_without_aborting_the_batch(tool):
+    matches = [row("1"), "oops", None, row("2", event_date="05/01/2024"), row("3", event_home_team=None), row("4", event_final_result="")]
+    normalized, rejected = tool._normalize_matches(matches, "football")
+    assert [m.match_id for m in normalized] == ["1", "4"]
+    assert (normalized[0].home_score, normalized[0].away_score, normalized[0].match_date) == (2, 1, date(2024, 1, 5))
+    assert (normalized[1].home_score, normalized[1].away_score) == (0, 0)
+    assert [r["reason"] for r in rejected] == ["ligne invalide: str", "ligne invalide: NoneType", "date invalide: '05/01/2024'", "équipes manquantes"]
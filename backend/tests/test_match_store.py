@@ -0,0 +1,182 @@
+import sqlite3
+import time
+from datetime import date, datetime, timedelta, timezone
+import pytest
+from app.core.config import settings
+from app.services.match_store import MatchStore
+
+D = date(2024, 1, 1)
+
+
+def day(n):
+    return D + timedelta(days=n - 1)
+
+
+@pytest.fixture
+def store():
+    return MatchStore(":memory:")
+
+
+def test_empty_store_misses_whole_range(store):
+    assert store.missing("1", None, day(1), day(10)) == [(day(1), day(10))]
+    assert store.snapshot()["misses"] == 1
+
+
+def test_covered_range_is_a_hit(store):
+    store.record_coverage("1", None, day(1), day(10))
+    assert store.missing("1", None, day(3), day(7)) == []
+    assert store.snapshot()["hits"] == 1
+
+
+def test_gaps_between_intervals(store):
+    store.record_coverage("1", None, day(1), day(10))
+    store.record_coverage("1", None, day(21), day(30))
+    assert store.missing("1", None, day(1), day(35)) == [(day(11), day(20)), (day(31), day(35))]
+    assert store.snapshot()["partial"] == 1
+
+
+def test_gap_before_first_interval(store):
+    store.record_coverage("1", None, day(5), day(10))
+    assert store.missing("1", None, day(1), day(10)) == [(day(1), day(4))]
+
+
+def test_contiguous_and_overlapping_intervals_merge(store):
+    store.record_coverage("1", None, day(1), day(10))
+    store.record_coverage("1", None, day(11), day(20))
+    store.record_coverage("1", None, day(15), day(25))
+    assert store.snapshot()["coverage_intervals"] == 1
+    assert store.missing("1", None, day(1), day(25)) == []
+
+
+def test_separate_intervals_do_not_merge(store):
+    store.record_coverage("1", None, day(1), day(10))
+    store.record_coverage("1", None, day(12), day(20))
+    assert store.snapshot()["coverage_intervals"] == 2
+    assert store.missing("1", None, day(1), day(20)) == [(day(11), day(11))]
+
+
+def utc_today():
+    return datetime.now(timezone.utc).date()
+
+
+def test_stable_until_keeps_a_utc_margin():
+    at = datetime(2024, 3, 10, 23, 30, tzinfo=timezone.utc).timestamp()
+    assert MatchStore.stable_until(at) == date(2024, 3, 10) - timedelta(days=settings.MATCH_STORE_STABLE_MARGIN_DAYS)
+
+
+def test_coverage_stops_at_last_stable_day(store):
+    today = utc_today()
+    store.record_coverage("1", None, today - timedelta(days=20), today + timedelta(days=3))
+    stable = store.stable_until()
+    assert stable < today
+    assert store.missing("1", None, today - timedelta(days=20), stable) == []
+    assert store.missing("1", None, today - timedelta(days=20), today) == [(stable + timedelta(days=1), today)]
+
+
+def test_coverage_is_clamped_to_fetch_time(store):
+    # Une réponse téléchargée il y a 20 jours ne couvre que les jours définitifs à ce moment-là
+    fetched_at = time.time() - 20 * 86400
+    today = utc_today()
+    store.record_coverage("1", None, today - timedelta(days=60), today, fetched_at=fetched_at)
+    settled = store.stable_until(fetched_at) - timedelta(days=settings.MATCH_STORE_RECHECK_DAYS)
+    assert store.missing("1", None, today - timedelta(days=60), store.stable_until()) == [
+        (settled + timedelta(days=1), store.stable_until())
+    ]
+
+
+def test_future_only_coverage_is_ignored(store):
+    store.record_coverage("1", None, utc_today(), utc_today() + timedelta(days=3))
+    assert store.snapshot()["coverage_intervals"] == 0
+
+
+def test_recent_coverage_expires_and_old_coverage_is_permanent(store):
+    fetched_at = time.time() - settings.MATCH_STORE_RECHECK_TTL - 1
+    stable = store.stable_until(fetched_at)
+    settled = stable - timedelta(days=settings.MATCH_STORE_RECHECK_DAYS)
+    store.record_coverage("1", None, settled - timedelta(days=10), stable, fetched_at=fetched_at)
+    # La partie récente, provisoire, a expiré: elle est de nouveau demandée
+    assert store.missing("1", None, settled - timedelta(days=10), stable) == [(settled + timedelta(days=1), stable)]
+    store.record_coverage("1", None, settled + timedelta(days=1), stable)
+    assert store.missing("1", None, settled - timedelta(days=10), stable) == []
+
+
+def test_provisional_intervals_merge_with_earliest_expiry(store):
+    stable = store.stable_until()
+    store.record_coverage("1", None, stable - timedelta(days=2), stable, fetched_at=time.time() - 60)
+    store.record_coverage("1", None, stable - timedelta(days=4), stable - timedelta(days=3))
+    with store._lock:
+        rows = store._conn.execute("SELECT expires_at FROM coverage").fetchall()
+    assert len(rows) == 1
+    assert rows[0][0] == pytest.approx(time.time() - 60 + settings.MATCH_STORE_RECHECK_TTL, abs=5)
+
+
+def test_legacy_coverage_is_dropped_on_open(tmp_path):
+    path = str(tmp_path / "matches.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        "CREATE TABLE coverage (scope TEXT NOT NULL, date_from TEXT NOT NULL, date_to TEXT NOT NULL, with_stats INTEGER NOT NULL DEFAULT 0);"
+        "INSERT INTO coverage VALUES ('team:1', '2024-01-01', '2024-01-10', 0);"
+    )
+    conn.commit()
+    conn.close()
+    store = MatchStore(path)
+    assert store.missing("1", None, day(1), day(10)) == [(day(1), day(10))]
+    store.record_coverage("1", None, day(1), day(10))
+    assert store.missing("1", None, day(1), day(10)) == []
+
+
+def test_broader_scopes_cover_narrower_queries(store):
+    store.record_coverage(None, None, day(1), day(10))
+    assert store.missing("1", "152", day(1), day(10)) == []
+    store.record_coverage("2", None, day(20), day(30))
+    assert store.missing("2", "152", day(20), day(30)) == []
+    assert store.missing(None, "152", day(20), day(30)) == [(day(20), day(30))]
+
+
+def test_coverage_without_stats_does_not_satisfy_stats_queries(store):
+    store.record_coverage("1", None, day(1), day(10))
+    assert store.missing("1", None, day(1), day(10), with_stats=True) == [(day(1), day(10))]
+    store.record_coverage("1", None, day(1), day(10), with_stats=True)
+    assert store.missing("1", None, day(1), day(10), with_stats=True) == []
+
+
+def fixture(key, n, home="10", away="20", league="152", with_stats=False):
+    m = {
+        "event_key": key, "event_date": day(n).isoformat(), "event_status": "Finished",
+        "event_final_result": "2 - 1", "league_key": league, "league_name": "Premier League",
+        "home_team_key": home, "away_team_key": away, "event_home_team": f"Team {home}", "event_away_team": f"Team {away}",
+    }
+    if with_stats:
+        m["player_stats"] = [{"player_name": "A", "player_goals": "1"}]
+    return m
+
+
+def fixtures(with_stats=False):
+    teams = ["10", "20", "30", "40"]
+    return [
+        fixture(str(1000 + n), n, teams[n % 4], teams[(n + 1) % 4], "152" if n % 2 else "175", with_stats)
+        for n in range(1, 21)
+    ]
+
+
+def test_add_and_read_back_finished_matches(store):
+    matches = fixtures() + [{"event_key": "x", "event_date": day(2).isoformat(), "event_status": ""}]
+    assert store.add(matches) == 20
+    stored = store.matches(None, None, day(1), day(30))
+    assert sorted(m["event_key"] for m in stored) == sorted(m["event_key"] for m in matches[:20])
+    assert [m["event_date"] for m in stored] == sorted(m["event_date"] for m in stored)
+
+
+def test_team_and_league_filters(store):
+    store.add(fixtures())
+    team = str(fixtures()[0]["home_team_key"])
+    for m in store.matches(team, None, day(1), day(30)):
+        assert team in (str(m["home_team_key"]), str(m["away_team_key"]))
+    assert store.matches(None, "999999", day(1), day(30)) == []
+
+
+def test_version_with_stats_is_not_overwritten(store):
+    with_stats = fixtures(with_stats=True)
+    store.add(with_stats, with_stats=True)
+    store.add([{k: v for k, v in m.items() if k != "player_stats"} for m in with_stats])
+    assert all("player_stats" in m for m in store.matches(None, None, day(1), day(30)))
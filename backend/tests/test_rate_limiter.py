@@ -0,0 +1,125 @@
+import asyncio
+import threading
+import time
+from datetime import date, timedelta
+import pytest
+from app.services.api_clients.all_sports_client import AllSportsClient
+from app.services.match_store import MatchStore
+from app.services.rate_limiter import Priority, RateLimitExceeded, RateLimiter, upstream_priority
+from app.services.single_flight import SingleFlight
+
+
+def limiter(**options) -> RateLimiter:
+    options = {
+        "rate": 20.0, "burst": 10.0, "daily_quota": 0, "costs": {},
+        "reserves": {"interactive": 0.0, "prefetch": 0.9, "backfill": 0.9},
+        "deadlines": {"interactive": 5.0, "prefetch": 5.0, "backfill": 5.0},
+        **options,
+    }
+    limiter = RateLimiter(**options)
+    limiter.drain()
+    return limiter
+
+
+def test_interactive_call_passes_before_waiting_background_call():
+    rl = limiter()
+    order = []
+
+    async def call(priority: Priority, name: str):
+        with upstream_priority(priority):
+            await rl.aacquire("Fixtures")
+        order.append(name)
+
+    async def main():
+        background = asyncio.create_task(call(Priority.BACKFILL, "backfill"))
+        await asyncio.sleep(0.01)
+        await asyncio.gather(background, call(Priority.INTERACTIVE, "interactive"))
+
+    asyncio.run(main())
+    assert order == ["interactive", "backfill"]
+
+
+def test_call_past_its_deadline_is_rejected():
+    rl = limiter(rate=1.0, deadlines={"interactive": 0.05})
+    with pytest.raises(RateLimitExceeded):
+        rl.acquire("Fixtures")
+    assert rl.stats[Priority.INTERACTIVE]["rejected"] == 1
+
+
+def test_shared_flight_runs_with_its_most_urgent_caller_priority():
+    rl = limiter()
+    flight = SingleFlight()
+
+    async def fetch():
+        await rl.aacquire("Fixtures")
+        return "ok"
+
+    async def background():
+        with upstream_priority(Priority.PREFETCH):
+            return await flight.ado("key", fetch)
+
+    async def main():
+        leader = asyncio.create_task(background())
+        await asyncio.sleep(0.01)
+        started = time.monotonic()
+        # Sans rehaussement, le préchauffage attendrait que le seau soit presque plein (~0.5s)
+        assert await flight.ado("key", fetch) == "ok"
+        assert await leader == "ok"
+        return time.monotonic() - started
+
+    assert asyncio.run(main()) < 0.3
+    assert rl.stats[Priority.INTERACTIVE]["granted"] == 1
+    assert rl.stats[Priority.PREFETCH]["granted"] == 0
+
+
+def test_promoted_call_gets_the_deadline_of_its_new_class():
+    rl = limiter(rate=1.0, deadlines={"interactive": 0.2, "prefetch": 30.0})
+    flight = SingleFlight()
+
+    async def fetch():
+        await rl.aacquire("Fixtures")
+
+    async def main():
+        with upstream_priority(Priority.PREFETCH):
+            leader = asyncio.create_task(flight.ado("key", fetch))
+        await asyncio.sleep(0.01)
+        started = time.monotonic()
+        with pytest.raises(RateLimitExceeded):
+            await flight.ado("key", fetch)
+        with pytest.raises(RateLimitExceeded):
+            await leader
+        return time.monotonic() - started
+
+    assert asyncio.run(main()) < 1.0
+
+
+def test_blocking_shared_call_is_promoted_by_interactive_follower():
+    rl = limiter()
+    flight = SingleFlight()
+    results = []
+
+    def background():
+        with upstream_priority(Priority.PREFETCH):
+            results.append(flight.do("key", lambda: rl.acquire("Fixtures")))
+
+    thread = threading.Thread(target=background)
+    thread.start()
+    time.sleep(0.02)
+    started = time.monotonic()
+    flight.do("key", lambda: rl.acquire("Fixtures"))
+    thread.join()
+    assert time.monotonic() - started < 0.3
+    assert rl.stats[Priority.INTERACTIVE]["granted"] == 1
+
+
+def test_archive_chunks_of_long_ranges_are_backfill():
+    stable = MatchStore.stable_until()
+    chunks = AllSportsClient._chunk_ranges([(stable - timedelta(days=90), date.today())], False)
+    assert len(chunks) > 1
+    priorities = [AllSportsClient._chunk_priority(chunks, end) for _, end in chunks]
+    assert priorities[0] == Priority.BACKFILL
+    assert priorities[-1] == Priority.INTERACTIVE
+    single = [(stable - timedelta(days=5), stable)]
+    assert AllSportsClient._chunk_priority(single, stable) == Priority.INTERACTIVE
+    with upstream_priority(Priority.PREFETCH):
+        assert AllSportsClient._chunk_priority(chunks, chunks[0][1]) == Priority.BACKFILL
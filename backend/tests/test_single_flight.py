@@ -0,0 +1,99 @@
+import asyncio
+import threading
+import time
+import pytest
+from app.services.single_flight import SingleFlight
+
+
+def test_concurrent_blocking_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def fn():
+        calls.append(1)
+        release.wait(1)
+        return "ok"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("key", fn))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert results == ["ok"] * 5
+    assert len(calls) == 1
+    assert flight.snapshot() == {"in_flight": 0, "leaders": 1, "deduplicated": 4}
+
+
+def test_blocking_error_is_raised_and_not_kept():
+    flight = SingleFlight()
+
+    def boom():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        flight.do("key", boom)
+    assert flight.do("key", lambda: "ok") == "ok"
+
+
+def test_concurrent_async_calls_share_one_task():
+    flight = SingleFlight()
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return len(calls)
+
+    async def main():
+        return await asyncio.gather(*(flight.ado("key", fn) for _ in range(5)))
+
+    assert asyncio.run(main()) == [1] * 5
+    assert flight.snapshot() == {"in_flight": 0, "leaders": 1, "deduplicated": 4}
+
+
+def test_different_keys_run_separately():
+    flight = SingleFlight()
+
+    async def main():
+        return await asyncio.gather(flight.ado("a", lambda: asyncio.sleep(0, "a")), flight.ado("b", lambda: asyncio.sleep(0, "b")))
+
+    assert asyncio.run(main()) == ["a", "b"]
+    assert flight.leaders == 2
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_call():
+    flight = SingleFlight()
+
+    async def fn():
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    async def main():
+        first = asyncio.create_task(flight.ado("key", fn))
+        second = asyncio.create_task(flight.ado("key", fn))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(main()) == "ok"
+
+
+def test_async_error_is_not_kept_for_later_calls():
+    flight = SingleFlight()
+
+    async def boom():
+        raise ValueError("boom")
+
+    async def ok():
+        return "ok"
+
+    async def main():
+        with pytest.raises(ValueError):
+            await flight.ado("key", boom)
+        return await flight.ado("key", ok)
+
+    assert asyncio.run(main()) == "ok"
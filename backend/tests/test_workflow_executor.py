@@ -0,0 +1,171 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+import pytest
+from app.models.workflow import Workflow, WorkflowEdge, WorkflowNode
+from app.services.node_cache import record_upstream_failure
+from app.services.tool_registry import tool_registry
+from app.services.workflow_executor import WorkflowExecutor
+from app.tools.base import AsyncBaseTool, BaseTool
+
+
+class CounterTool(AsyncBaseTool):
+    """Retourne une nouvelle valeur à chaque exécution réelle."""
+    def __init__(self, name: str, cache_ttl: Optional[float]):
+        super().__init__(name, "compteur", ["football"])
+        self.cache_ttl = cache_ttl
+        self.calls = 0
+
+    async def arun(self, input_data: Any) -> Dict[str, Any]:
+        self.calls += 1
+        return {"value": self.calls, "extra": "x"}
+
+
+class EchoTool(BaseTool):
+    """Outil synchrone: recopie l'entrée reçue des prédécesseurs."""
+    cache_ttl = 3600.0
+
+    def __init__(self, name: str):
+        super().__init__(name, "écho", ["football"])
+        self.calls = 0
+
+    def run(self, input_data: Any) -> Dict[str, Any]:
+        self.calls += 1
+        return {"seen": dict(input_data)}
+
+
+class SlowTool(AsyncBaseTool):
+    def __init__(self, name: str, log: List[str]):
+        super().__init__(name, "lent", ["football"])
+        self.log = log
+
+    async def arun(self, input_data: Any) -> Dict[str, Any]:
+        self.log.append(f"start:{input_data['tag']}")
+        await asyncio.sleep(0.05)
+        self.log.append(f"end:{input_data['tag']}")
+        return {"tag": input_data["tag"]}
+
+
+class FailingTool(AsyncBaseTool):
+    cache_ttl = 3600.0
+
+    def __init__(self, name: str, mode: str):
+        super().__init__(name, "échec", ["football"])
+        self.mode = mode
+        self.calls = 0
+
+    async def arun(self, input_data: Any) -> Dict[str, Any]:
+        self.calls += 1
+        if self.mode == "raise":
+            raise RuntimeError("boom")
+        if self.mode == "fallback":
+            record_upstream_failure(RuntimeError("upstream down"))
+            return {"value": []}
+        return {"error": "indisponible"}
+
+
+@pytest.fixture
+def tools(monkeypatch):
+    def register(*tools: BaseTool):
+        for tool in tools:
+            monkeypatch.setitem(tool_registry._tools, tool.name, tool)
+    return register
+
+
+@pytest.fixture
+def executor():
+    executor = WorkflowExecutor(max_concurrency=4)
+    yield executor
+    executor.shutdown()
+
+
+def workflow(nodes: Dict[str, Dict[str, Any]], edges: List[tuple]) -> Workflow:
+    return Workflow(
+        id="wf", sport="football", query="test",
+        nodes=[WorkflowNode(id=node_id, tool_id=spec["tool"], label=node_id, data=spec.get("data", {})) for node_id, spec in nodes.items()],
+        edges=[WorkflowEdge(id=f"{source}-{target}", source=source, target=target, mapping=mapping) for source, target, mapping in edges],
+    )
+
+
+def run(executor: WorkflowExecutor, wf: Workflow, use_cache: bool = True) -> Dict[str, Any]:
+    return asyncio.run(executor.execute(wf, use_cache=use_cache))
+
+
+def test_independent_nodes_run_in_parallel_and_dependents_wait(executor, tools):
+    log: List[str] = []
+    tools(SlowTool("slow", log))
+    wf = workflow(
+        {"a": {"tool": "slow", "data": {"tag": "a"}}, "b": {"tool": "slow", "data": {"tag": "b"}}, "c": {"tool": "slow", "data": {"tag": "c"}}},
+        [("a", "c", None), ("b", "c", None)],
+    )
+    result = run(executor, wf)
+    assert log[:2] == ["start:a", "start:b"]
+    assert log.index("start:c") > max(log.index("end:a"), log.index("end:b"))
+    assert result["results"]["c"] == {"tag": "c"}
+
+
+def test_edge_mapping_and_node_params_take_precedence(executor, tools):
+    tools(CounterTool("counter", None), EchoTool("echo"))
+    wf = workflow(
+        {"u": {"tool": "counter"}, "d": {"tool": "echo", "data": {"extra": "own"}}},
+        [("u", "d", {"value": "value", "extra": "extra"})],
+    )
+    assert run(executor, wf)["results"]["d"] == {"seen": {"value": 1, "extra": "own"}}
+
+
+def test_unknown_node_and_cycle_are_rejected(executor, tools):
+    tools(EchoTool("echo"))
+    with pytest.raises(ValueError):
+        run(executor, workflow({"a": {"tool": "echo"}}, [("a", "missing", None)]))
+    with pytest.raises(ValueError):
+        run(executor, workflow({"a": {"tool": "echo"}, "b": {"tool": "echo"}}, [("a", "b", None), ("b", "a", None)]))
+
+
+def test_failed_dependency_skips_downstream(executor, tools):
+    tools(FailingTool("boom", "raise"), EchoTool("echo"))
+    log = {entry["node_id"]: entry for entry in run(executor, workflow({"u": {"tool": "boom"}, "d": {"tool": "echo"}}, [("u", "d", None)]))["execution_log"]}
+    assert log["u"]["status"] == "error"
+    assert log["d"]["status"] == "skipped"
+
+
+def test_cached_nodes_are_reused_unless_cache_disabled(executor, tools):
+    counter, echo = CounterTool("counter", 3600.0), EchoTool("echo")
+    tools(counter, echo)
+    wf = workflow({"u": {"tool": "counter"}, "d": {"tool": "echo"}}, [("u", "d", None)])
+    first = run(executor, wf)
+    second = run(executor, wf)
+    assert [entry["cached"] for entry in second["execution_log"]] == [True, True]
+    assert second["results"] == first["results"]
+    third = run(executor, wf, use_cache=False)
+    assert (counter.calls, echo.calls) == (2, 2)
+    assert third["results"]["d"] == {"seen": {"value": 2, "extra": "x"}}
+
+
+def test_downstream_is_recomputed_when_upstream_expires(executor, tools):
+    # Amont à TTL court, aval à TTL long: l'aval ne doit pas resservir un résultat bâti sur l'ancienne sortie
+    tools(CounterTool("counter", 0.2), EchoTool("echo"))
+    wf = workflow({"u": {"tool": "counter"}, "d": {"tool": "echo"}}, [("u", "d", None)])
+    assert run(executor, wf)["results"]["d"]["seen"]["value"] == 1
+    time.sleep(0.25)
+    result = run(executor, wf)["results"]
+    assert result["u"]["value"] == 2
+    assert result["d"]["seen"]["value"] == 2
+
+
+def test_downstream_of_uncached_node_is_not_cached(executor, tools):
+    counter, echo = CounterTool("counter", None), EchoTool("echo")
+    tools(counter, echo)
+    wf = workflow({"u": {"tool": "counter"}, "d": {"tool": "echo"}}, [("u", "d", None)])
+    run(executor, wf)
+    assert run(executor, wf)["results"]["d"]["seen"]["value"] == 2
+    assert echo.calls == 2
+
+
+@pytest.mark.parametrize("mode", ["error", "fallback"])
+def test_error_and_fallback_outputs_are_not_cached(executor, tools, mode):
+    failing, echo = FailingTool("failing", mode), EchoTool("echo")
+    tools(failing, echo)
+    wf = workflow({"u": {"tool": "failing"}, "d": {"tool": "echo"}}, [("u", "d", None)])
+    run(executor, wf)
+    run(executor, wf)
+    assert (failing.calls, echo.calls) == (2, 2)
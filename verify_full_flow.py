@@ -14,6 +14,7 @@ else:
 from app.services.workflow_generator import workflow_generator
 from app.services.workflow_executor import workflow_executor
 from app.core.config import settings
+from fastapi.encoders import jsonable_encoder
 
 async def verify_full_flow():
     print("Verifying Full Flow: Query -> LLM -> Tool -> API")
@@ -26,7 +27,7 @@ async def verify_full_flow():
     # 1. GENERATION
     print("--- 1. Generating Workflow (LLM)... ---")
     try:
-        workflow = workflow_generator.generate(sport="football", query=query)
+        workflow = await workflow_generator.agenerate(sport="football", query=query)
         if not workflow.nodes:
             print("❌ Failed to generate nodes.")
             return
@@ -45,13 +46,14 @@ async def verify_full_flow():
         
         node_result = result["results"][node.id]
         print("\n--- Tool Execution Result ---")
-        print(json.dumps(node_result, indent=2, default=str))
+        print(json.dumps(jsonable_encoder(node_result), indent=2, default=str))
         print("-----------------------------\n")
         
         matches = node_result.get("matches", [])
         if matches:
             print(f"✅ SUCCESS! Found {len(matches)} matches from API.")
-            print(f"First match: {matches[0]['home_team']} {matches[0]['home_score']} - {matches[0]['away_score']} {matches[0]['away_team']}")
+            first = matches[0]
+            print(f"First match: {first.home_team} {first.home_score} - {first.away_score} {first.away_team}")
         else:
              print("⚠️ No matches found (but API call might have worked).")
              
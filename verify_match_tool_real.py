@@ -12,6 +12,7 @@ else:
     # Fallback if running inside backend or script moved
     sys.path.append(current_dir)
 
+from fastapi.encoders import jsonable_encoder
 from app.tools.match_info_tool import MatchInfoTool
 from app.core.config import settings
 
@@ -38,7 +39,7 @@ def verify_match_tool_real():
     try:
         result = tool.run(input_data)
         print("\n--- Tool Output ---")
-        print(json.dumps(result, indent=2, default=str))
+        print(json.dumps(jsonable_encoder(result), indent=2, default=str))
         print("-------------------\n")
         
         if "error" in result: